@@ -3,14 +3,32 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_mail import Mail
+from .dispatcher import MailDispatcher
+from .email_templates import EmailRenderer
+from .user_cache import UserCache
+from .companies import CompanySuggester
+from .instrumentation import QueryInstrumentation
+from .metrics import PrometheusMetrics
+from .db_pool import check_pool_capacity, configure_pool
+from .replica import ReadReplica, RoutingSession
+from .embedded_scheduler import EmbeddedScheduler
+from .log_queue import JsonFormatter, install_queue_logging
 import logging
 from logging.handlers import RotatingFileHandler
 import os
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 mail = Mail()
+mail_dispatcher = MailDispatcher()
+email_renderer = EmailRenderer()
+user_cache = UserCache()
+company_suggester = CompanySuggester()
+sql_instrumentation = QueryInstrumentation()
+metrics = PrometheusMetrics()
+read_replica = ReadReplica()
+embedded_scheduler = EmbeddedScheduler()
 
 
 def create_app(config_class='config.Config'):
@@ -18,19 +36,36 @@ def create_app(config_class='config.Config'):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
-    # Initialize extensions
+    # Initialize extensions (pool options and metrics first: the engine is
+    # created by db.init_app with whatever SQLALCHEMY_ENGINE_OPTIONS holds)
+    configure_pool(app)
+    metrics.init_app(app)
+    read_replica.init_app(app)
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     mail.init_app(app)
+    mail_dispatcher.init_app(app)
+    email_renderer.init_app(app)
+    user_cache.init_app(app)
+    company_suggester.init_app(app)
+    sql_instrumentation.init_app(app)
     
     # Configure logging
     configure_logging(app)
     
+    if app.config.get('DB_POOL_CHECK', True):
+        with app.app_context():
+            check_pool_capacity(app, db.engine)
+    
     # Import models first (needed by other modules)
     from . import models
     
+    # Reminder jobs on an in-process timer; only started by gunicorn workers
+    # (gunicorn.conf.py post_fork) when SCHEDULER_ENABLED=1
+    embedded_scheduler.init_app(app)
+    
     # Register blueprints
     from .auth import auth_bp
     from .routes import main_bp
@@ -65,14 +100,27 @@ def configure_logging(app):
     )
     file_handler.setLevel(logging.WARNING)
     
-    # Set log format
-    log_format = logging.Formatter(
-        app.config.get('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
+    # Set log format (one JSON object per line when LOG_JSON is on)
+    if app.config.get('LOG_JSON'):
+        log_format = JsonFormatter()
+    else:
+        log_format = logging.Formatter(
+            app.config.get('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
     file_handler.setFormatter(log_format)
     
-    # Add handler to app logger
-    app.logger.addHandler(file_handler)
+    # Console output (what basicConfig gives the root logger) for app records
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(log_format)
+    
+    # Both handlers run on a listener thread; request threads only put records
+    # on a bounded queue, and records are dropped (and counted) when it is
+    # full, so disk stalls, rotation and a slow stderr never block a request.
+    # No propagation: root's synchronous stderr handler would write them again
+    install_queue_logging(app.logger, [file_handler, console_handler],
+                          maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+    app.logger.propagate = False
     
     # Set app logger level based on config
     log_level = app.config.get('LOG_LEVEL', 'INFO')
@@ -1,19 +1,109 @@
-from flask import Blueprint, jsonify, request, abort, current_app
+from flask import Blueprint, jsonify, request, abort, current_app, Response, stream_with_context
+import csv
+import io
+import json
 from .models import JobApplication
-from . import db
+from . import db, company_suggester
+from .stats import get_application_stats
+from .pagination import paginate_keyset, InvalidCursor
+from .bulk import apply_bulk_operations
+from .search import search_applications
+from .conditional import applications_etag, is_not_modified, not_modified, add_validators
+from .replica import use_replica
 from flask_login import login_required, current_user
 
 api_bp = Blueprint('api', __name__)
 
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+EXPORT_FIELDS = ['id', 'company', 'position', 'status', 'date_applied', 'follow_up_date', 'notes', 'updated_at']
+
+
 @api_bp.route('/applications', methods=['GET'])
 @login_required
+@use_replica
 def api_list_applications():
-    """Get all applications for the current user."""
-    apps = JobApplication.query.filter_by(user_id=current_user.id).all()
-    return jsonify({
-        'applications': [a.to_dict() for a in apps],
-        'total': len(apps)
+    """Get one page of applications for the current user."""
+    limit = request.args.get('limit', current_app.config['API_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['API_MAX_PAGE_SIZE']))
+    total_mode = request.args.get('total', 'none')
+    if total_mode not in ('approx', 'exact', 'none'):
+        return jsonify({'error': 'total must be one of approx, exact, none'}), 400
+    
+    # Unchanged collection: answer 304 without loading any rows
+    etag, last_modified = applications_etag(current_user.id)
+    if is_not_modified(etag):
+        return not_modified(etag, last_modified)
+    
+    query = JobApplication.query.filter_by(user_id=current_user.id)
+    try:
+        page = paginate_keyset(
+            query,
+            cursor=request.args.get('cursor') or None,
+            per_page=limit,
+            total=None if total_mode == 'none' else total_mode
+        )
+    except InvalidCursor:
+        return jsonify({'error': 'invalid cursor'}), 400
+    
+    response = jsonify({
+        'applications': [a.to_dict() for a in page.items],
+        'total': page.total,
+        'total_approximate': page.total_approximate,
+        'next': page.next_cursor,
+        'prev': page.prev_cursor
     })
+    return add_validators(response, etag, last_modified)
+
+@api_bp.route('/applications/export', methods=['GET'])
+@login_required
+@use_replica
+def api_export_applications():
+    """Stream all applications for the current user as NDJSON or CSV."""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    # Server-side cursor: rows are fetched in chunks as the response is written
+    query = JobApplication.query.filter_by(user_id=current_user.id).order_by(
+        JobApplication.date_applied.desc(), JobApplication.id.asc()
+    ).yield_per(current_app.config['EXPORT_CHUNK_SIZE'])
+    
+    rows = _export_csv(query) if export_format == 'csv' else _export_ndjson(query)
+    current_app.logger.info('API: User %s exported applications as %s', current_user.email, export_format)
+    return Response(
+        stream_with_context(rows),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename=applications.{export_format}'}
+    )
+
+
+def _export_ndjson(query):
+    """Yield one JSON document per application."""
+    for app_obj in query:
+        yield json.dumps(app_obj.to_dict()) + '\n'
+
+
+def _export_csv(query):
+    """Yield a CSV header followed by one line per application."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+    
+    writer.writeheader()
+    yield flush()
+    for app_obj in query:
+        writer.writerow(app_obj.to_dict())
+        yield flush()
+
 
 @api_bp.route('/applications', methods=['POST'])
 @login_required
@@ -23,10 +113,10 @@ def api_create_application():
     
     # Validate required fields
     if 'company' not in data:
-        current_app.logger.warning(f'API: Missing company field in request from user {current_user.email}')
+        current_app.logger.warning('API: Missing company field in request from user %s', current_user.email)
         return jsonify({'error': 'company required'}), 400
     if 'position' not in data:
-        current_app.logger.warning(f'API: Missing position field in request from user {current_user.email}')
+        current_app.logger.warning('API: Missing position field in request from user %s', current_user.email)
         return jsonify({'error': 'position required'}), 400
     
     # Create application
@@ -40,5 +130,89 @@ def api_create_application():
     db.session.add(app_obj)
     db.session.commit()
     
-    current_app.logger.info(f'API: User {current_user.email} created application {app_obj.id} for {app_obj.company}')
+    current_app.logger.info('API: User %s created application %s for %s', current_user.email, app_obj.id, app_obj.company)
     return jsonify(app_obj.to_dict()), 201
+
+
+@api_bp.route('/search', methods=['GET'])
+@login_required
+@use_replica
+def api_search():
+    """Ranked full-text search over company, position and notes."""
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'q required'}), 400
+    limit = request.args.get('limit', current_app.config['SEARCH_LIMIT'], type=int)
+    limit = max(1, min(limit, current_app.config['SEARCH_MAX_LIMIT']))
+    
+    results = search_applications(current_user.id, q, limit=limit)
+    return jsonify({
+        'query': q,
+        'results': [dict(app_obj.to_dict(), score=round(score, 4)) for app_obj, score in results]
+    })
+
+
+@api_bp.route('/companies/suggest', methods=['GET'])
+@login_required
+def api_suggest_companies():
+    """Suggest the user's existing company names for a typed prefix."""
+    q = request.args.get('q', '')
+    limit = request.args.get('limit', current_app.config['SUGGEST_LIMIT'], type=int)
+    limit = max(1, min(limit, 50))
+    return jsonify({
+        'query': q,
+        'suggestions': company_suggester.suggest(current_user.id, q, limit=limit)
+    })
+
+
+@api_bp.route('/stats', methods=['GET'])
+@login_required
+@use_replica
+def api_stats():
+    """Get per-status application counts for the current user."""
+    return jsonify(get_application_stats(current_user.id))
+
+
+@api_bp.route('/applications/bulk', methods=['POST'])
+@login_required
+def api_bulk_applications():
+    """Create, update and delete many applications in one transaction."""
+    if request.mimetype == 'application/x-ndjson':
+        try:
+            items = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        except ValueError:
+            return jsonify({'error': 'invalid NDJSON body'}), 400
+    else:
+        items = request.get_json(silent=True)
+        if isinstance(items, dict):
+            items = items.get('operations')
+        if not isinstance(items, list):
+            return jsonify({'error': 'expected a JSON array of operations'}), 400
+    
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'error': f'batch exceeds {max_items} operations'}), 413
+    
+    results = apply_bulk_operations(current_user.id, items)
+    
+    summary = {status: 0 for status in ('created', 'updated', 'deleted', 'error')}
+    for result in results:
+        summary[result['status']] += 1
+    current_app.logger.info('API: User %s bulk operation: %s', current_user.email, summary)
+    return jsonify({'results': results, **summary})
+
+
+@api_bp.route('/preferences', methods=['GET', 'PUT'])
+@login_required
+def api_preferences():
+    """Get or update the current user's notification preferences."""
+    if request.method == 'PUT':
+        data = request.get_json() or {}
+        if 'reminder_digest' in data:
+            if not isinstance(data['reminder_digest'], bool):
+                return jsonify({'error': 'reminder_digest must be a boolean'}), 400
+            current_user.reminder_digest = data['reminder_digest']
+            db.session.commit()
+            current_app.logger.info('API: User %s set reminder_digest=%s', current_user.email, current_user.reminder_digest)
+    
+    return jsonify({'reminder_digest': current_user.reminder_digest})
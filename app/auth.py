@@ -2,7 +2,7 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request,
 from flask_login import login_user, logout_user, login_required, current_user
 from .forms import RegisterForm, LoginForm
 from .models import User
-from . import db, login_manager
+from . import db, login_manager, user_cache
 
 # Create auth blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -15,7 +15,7 @@ def register():
     if form.validate_on_submit():
         # Check if email already exists
         if User.query.filter_by(email=form.email.data).first():
-            current_app.logger.warning(f'Registration attempt with existing email: {form.email.data}')
+            current_app.logger.warning('Registration attempt with existing email: %s', form.email.data)
             flash('Email already registered. Please use a different email.', 'danger')
             return redirect(url_for('auth.register'))
         
@@ -25,7 +25,7 @@ def register():
         db.session.add(user)
         db.session.commit()
         
-        current_app.logger.info(f'New user registered: {user.email}')
+        current_app.logger.info('New user registered: %s', user.email)
         flash('Account created successfully! Please log in.', 'success')
         return redirect(url_for('auth.login'))
     
@@ -42,7 +42,7 @@ def login():
         # Validate credentials
         if user and user.check_password(form.password.data):
             login_user(user, remember=form.remember.data)
-            current_app.logger.info(f'User logged in: {user.email}')
+            current_app.logger.info('User logged in: %s', user.email)
             
             # Redirect to next page or dashboard
             next_page = request.args.get('next')
@@ -52,7 +52,7 @@ def login():
             flash(f'Welcome, {user.name or user.email}!', 'success')
             return redirect(next_page)
         else:
-            current_app.logger.warning(f'Failed login attempt for email: {form.email.data}')
+            current_app.logger.warning('Failed login attempt for email: %s', form.email.data)
             flash('Invalid email or password. Please try again.', 'danger')
     
     return render_template('auth/login.html', form=form)
@@ -64,7 +64,7 @@ def logout():
     """User logout route."""
     email = current_user.email if hasattr(current_user, 'email') else 'unknown'
     logout_user()
-    current_app.logger.info(f'User logged out: {email}')
+    current_app.logger.info('User logged out: %s', email)
     flash('You have been logged out.', 'info')
     return redirect(url_for('main.index'))
 
@@ -72,5 +72,5 @@ def logout():
 # Flask-Login user loader
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID for Flask-Login."""
-    return User.query.get(int(user_id))
+    """Load user by ID for Flask-Login (cached across requests)."""
+    return user_cache.load(db.session, int(user_id))
@@ -0,0 +1,188 @@
+"""Batch create/update/delete of job applications in a single transaction"""
+from datetime import date, datetime
+
+from sqlalchemy import delete, insert, select, update
+
+from . import db, company_suggester
+from .models import STATUSES, JobApplication, StatusChangeOutbox
+
+# Fields a client may set through the bulk API
+WRITABLE_FIELDS = ('company', 'position', 'status', 'date_applied', 'follow_up_date', 'notes')
+DATE_FIELDS = ('date_applied', 'follow_up_date')
+NULLABLE_FIELDS = ('notes',) + DATE_FIELDS
+
+
+class BulkValidationError(ValueError):
+    """Raised for an item that cannot be applied."""
+
+
+def _is_id(value):
+    # bool is an int subclass: true must not address application 1
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _clean_fields(item, creating):
+    """Pick writable fields out of an item, checking types, lengths and required fields, and parsing dates."""
+    values = {}
+    for field in WRITABLE_FIELDS:
+        if field not in item:
+            continue
+        value = item[field]
+        if value is None and field in NULLABLE_FIELDS:
+            values[field] = None
+            continue
+        if field in DATE_FIELDS:
+            try:
+                value = date.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise BulkValidationError(f'{field} must be an ISO date (YYYY-MM-DD)')
+        elif value is None:
+            raise BulkValidationError(f'{field} cannot be empty')
+        elif not isinstance(value, str):
+            raise BulkValidationError(f'{field} must be a string')
+        elif field == 'status' and value not in STATUSES:
+            raise BulkValidationError(f"status must be one of {', '.join(STATUSES)}")
+        else:
+            max_length = JobApplication.__table__.c[field].type.length
+            if max_length and len(value) > max_length:
+                raise BulkValidationError(f'{field} must be at most {max_length} characters')
+        values[field] = value
+
+    for field in ('company', 'position'):
+        if creating and not values.get(field):
+            raise BulkValidationError(f'{field} required')
+        if field in values and not values[field]:
+            raise BulkValidationError(f'{field} cannot be empty')
+    return values
+
+
+def apply_bulk_operations(user_id, items):
+    """
+    Validate and apply a batch of upserts and deletes for one user.
+
+    Items are dicts with an optional 'op' ('upsert', the default, or 'delete').
+    An upsert without an 'id' creates an application; with an 'id' it updates
+    that application. Deletes require an 'id'. Every referenced id is checked
+    against the user's applications in one query, then all valid items are
+    written with bulk INSERT/UPDATE/DELETE statements in one transaction.
+    Status changes made by updates are queued in the status change outbox in
+    that same transaction, as edit_application does for single edits.
+    Invalid items are reported and skipped; they do not abort the batch.
+
+    Args:
+        user_id: ID of the user that owns the applications
+        items: List of operation dicts
+
+    Returns:
+        list: One result dict per item, in input order
+    """
+    results = [None] * len(items)
+
+    # Resolve every referenced id (and its current status) with a single ownership query
+    referenced = {
+        item['id'] for item in items
+        if isinstance(item, dict) and _is_id(item.get('id'))
+    }
+    owned = {}
+    if referenced:
+        owned = dict(
+            db.session.query(JobApplication.id, JobApplication.status).filter(
+                JobApplication.user_id == user_id,
+                JobApplication.id.in_(referenced)
+            )
+        )
+
+    # Set explicitly so every row in the batch shares one change timestamp
+    now = datetime.utcnow()
+    inserts, updates, deletes = [], [], []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise BulkValidationError('item must be an object')
+            op = item.get('op', 'upsert')
+            app_id = item.get('id')
+            if op not in ('upsert', 'delete'):
+                raise BulkValidationError('op must be upsert or delete')
+            if app_id is not None:
+                if not _is_id(app_id) or app_id not in owned:
+                    raise BulkValidationError('application not found')
+                if app_id in seen_ids:
+                    raise BulkValidationError('duplicate id in batch')
+                seen_ids.add(app_id)
+
+            if op == 'delete':
+                if app_id is None:
+                    raise BulkValidationError('id required for delete')
+                deletes.append((index, app_id))
+            elif app_id is None:
+                values = _clean_fields(item, creating=True)
+                values.setdefault('status', 'Applied')
+                values['user_id'] = user_id
+                values['updated_at'] = now
+                inserts.append((index, values))
+            else:
+                values = _clean_fields(item, creating=False)
+                values['id'] = app_id
+                values['updated_at'] = now
+                updates.append((index, values))
+        except BulkValidationError as e:
+            results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+
+    try:
+        if inserts:
+            rows = [values for _, values in inserts]
+            if db.engine.dialect.insert_executemany_returning:
+                ids = db.session.scalars(
+                    insert(JobApplication).returning(JobApplication.id, sort_by_parameter_order=True),
+                    rows
+                ).all()
+            else:
+                # No RETURNING for executemany (MySQL): auto-increment ids
+                # ascend in row order, and until the updates below run only
+                # the new rows carry this batch's updated_at, so read them back
+                db.session.execute(insert(JobApplication), rows)
+                ids = db.session.scalars(
+                    select(JobApplication.id).where(
+                        JobApplication.user_id == user_id, JobApplication.updated_at == now
+                    ).order_by(JobApplication.id)
+                ).all()
+                if len(ids) != len(rows):
+                    raise RuntimeError(f'Inserted {len(rows)} applications but found {len(ids)} ids')
+            for (index, _), app_id in zip(inserts, ids):
+                results[index] = {'index': index, 'status': 'created', 'id': app_id}
+
+        if updates:
+            db.session.execute(update(JobApplication), [values for _, values in updates])
+            for index, values in updates:
+                results[index] = {'index': index, 'status': 'updated', 'id': values['id']}
+            status_changes = [
+                {'application_id': values['id'], 'old_status': owned[values['id']],
+                 'new_status': values['status'], 'created_at': now}
+                for _, values in updates
+                if 'status' in values and values['status'] != owned[values['id']]
+            ]
+            if status_changes:
+                db.session.execute(insert(StatusChangeOutbox), status_changes)
+
+        if deletes:
+            db.session.execute(
+                delete(JobApplication).where(
+                    JobApplication.user_id == user_id,
+                    JobApplication.id.in_([app_id for _, app_id in deletes])
+                ),
+                execution_options={'synchronize_session': False}
+            )
+            for index, app_id in deletes:
+                results[index] = {'index': index, 'status': 'deleted', 'id': app_id}
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Core statements skip the ORM events that keep the typeahead index current
+    if inserts or updates or deletes:
+        company_suggester.invalidate(user_id)
+
+    return results
@@ -0,0 +1,193 @@
+"""In-memory per-user prefix index of company names for typeahead"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+# Legal suffixes ignored when matching, so "Acme", "Acme Inc." and "ACME, inc" are one company
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'gmbh', 'plc'}
+
+
+def normalize_company(name):
+    """Casefold, drop punctuation and legal suffixes, collapse whitespace."""
+    words = re.findall(r'\w+', (name or '').casefold())
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+class CompanyIndex:
+    """
+    Sorted list of one user's normalized company names.
+
+    A prefix lookup is a bisect to the first key >= prefix followed by a scan
+    while keys still start with it. Each key keeps a Counter of the spellings
+    used, and suggests the most common one.
+    """
+
+    def __init__(self, counts=()):
+        self.spellings = {}
+        self.keys = []
+        for name, count in counts:
+            self.add(name, count)
+        self.built_at = time.monotonic()
+
+    def add(self, name, count=1):
+        key = normalize_company(name)
+        if not key:
+            return
+        if key not in self.spellings:
+            self.spellings[key] = Counter()
+            insort(self.keys, key)
+        self.spellings[key][name.strip()] += count
+
+    def remove(self, name, count=1):
+        key = normalize_company(name)
+        spellings = self.spellings.get(key)
+        if spellings is None:
+            return
+        spellings[name.strip()] -= count
+        if spellings[name.strip()] <= 0:
+            del spellings[name.strip()]
+        if not spellings:
+            del self.spellings[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def suggest(self, prefix, limit=10):
+        """
+        Companies whose normalized name starts with prefix, most used first.
+
+        Returns:
+            list: {'name': str, 'count': int} dicts
+        """
+        prefix = normalize_company(prefix)
+        matches = []
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            key = self.keys[i]
+            if not key.startswith(prefix):
+                break
+            spellings = self.spellings[key]
+            matches.append((spellings.most_common(1)[0][0], sum(spellings.values())))
+        top = heapq.nsmallest(limit, matches, key=lambda match: (-match[1], match[0].casefold()))
+        return [{'name': name, 'count': count} for name, count in top]
+
+
+class CompanySuggester:
+    """
+    Company typeahead backed by a CompanyIndex per user.
+
+    An index is built lazily with one GROUP BY query on the user's first
+    lookup, then kept up to date as applications are committed through the
+    ORM. Bulk Core writes call invalidate() instead. Indexes are rebuilt after
+    COMPANY_INDEX_TTL seconds so writes made by other worker processes show up,
+    and at most COMPANY_INDEX_MAX_USERS indexes are kept (LRU).
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 300
+        self.max_users = 1000
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+        self._events_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('COMPANY_INDEX_TTL', self.ttl)
+        self.max_users = app.config.get('COMPANY_INDEX_MAX_USERS', self.max_users)
+        self._indexes = OrderedDict()
+        app.extensions['company_suggester'] = self
+        self._register_events()
+
+    def _register_events(self):
+        if self._events_registered:
+            return
+        from .models import JobApplication
+
+        # active_history keeps the previous company in the attribute history
+        # even when the instance was expired, so renames can be applied
+        event.listen(JobApplication.company, 'set', lambda *args: None, active_history=True)
+        event.listen(Session, 'after_flush', self._record_changes)
+        event.listen(Session, 'after_commit', self._apply_changes)
+        event.listen(Session, 'after_soft_rollback', self._discard_changes)
+        self._events_registered = True
+
+    def _record_changes(self, session, flush_context):
+        from .models import JobApplication
+
+        changes = session.info.setdefault('company_changes', [])
+        for obj in session.new:
+            if isinstance(obj, JobApplication):
+                changes.append((obj.user_id, None, obj.company))
+        for obj in session.dirty:
+            if isinstance(obj, JobApplication):
+                history = inspect(obj).attrs.company.history
+                if history.deleted:
+                    changes.append((obj.user_id, history.deleted[0], obj.company))
+        for obj in session.deleted:
+            if isinstance(obj, JobApplication):
+                changes.append((obj.user_id, obj.company, None))
+
+    def _apply_changes(self, session):
+        changes = session.info.pop('company_changes', None)
+        if not changes:
+            return
+        with self._lock:
+            for user_id, old, new in changes:
+                index = self._indexes.get(user_id)
+                if index is None:
+                    continue
+                if old:
+                    index.remove(old)
+                if new:
+                    index.add(new)
+
+    def _discard_changes(self, session, previous_transaction):
+        session.info.pop('company_changes', None)
+
+    def invalidate(self, user_id):
+        """Drop a user's index; the next lookup rebuilds it."""
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+    def _index_for(self, user_id):
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None and time.monotonic() - index.built_at < self.ttl:
+                self._indexes.move_to_end(user_id)
+                return index
+
+        from . import db
+        from .models import JobApplication
+        counts = db.session.query(
+            JobApplication.company, func.count(JobApplication.id)
+        ).filter(JobApplication.user_id == user_id).group_by(JobApplication.company).all()
+        index = CompanyIndex(counts)
+
+        with self._lock:
+            self._indexes[user_id] = index
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def suggest(self, user_id, prefix, limit=10):
+        """
+        Suggest the user's existing company names starting with prefix.
+
+        Args:
+            user_id: ID of the user whose companies are suggested
+            prefix: Text typed so far (case, punctuation and suffixes ignored)
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: {'name': str, 'count': int} dicts, most used first
+        """
+        index = self._index_for(user_id)
+        with self._lock:
+            return index.suggest(prefix, limit)
@@ -0,0 +1,74 @@
+"""Conditional GET (ETag / If-None-Match) for a user's application collection"""
+import hashlib
+
+from flask import current_app, request, session
+from sqlalchemy import func
+
+from . import db
+from .models import JobApplication
+
+
+def applications_version(user_id):
+    """
+    Cheap change version for a user's applications.
+
+    One aggregate over the (user_id, updated_at) index: the row count catches
+    deletes, max(updated_at) catches inserts and updates.
+
+    Args:
+        user_id: ID of the user whose applications are versioned
+
+    Returns:
+        tuple: (count, last_modified) where last_modified may be None
+    """
+    return db.session.query(
+        func.count(JobApplication.id), func.max(JobApplication.updated_at)
+    ).filter(JobApplication.user_id == user_id).one()
+
+
+def applications_etag(user_id, *extra):
+    """
+    Build the ETag for a view of a user's applications.
+
+    The tag covers the collection version and the full request path, so each
+    page, cursor and filter combination has its own tag.
+
+    Args:
+        user_id: ID of the user whose applications are shown
+        *extra: Anything else the representation depends on
+
+    Returns:
+        tuple: (etag, last_modified)
+    """
+    count, last_modified = applications_version(user_id)
+    stamp = last_modified.isoformat() if last_modified else ''
+    seed = '|'.join(str(part) for part in (user_id, count, stamp, request.full_path, *extra))
+    return hashlib.sha1(seed.encode()).hexdigest(), last_modified
+
+
+def is_not_modified(etag):
+    """
+    True when the client's If-None-Match already holds this ETag.
+
+    Only If-None-Match is evaluated: Last-Modified does not move on deletes,
+    so If-Modified-Since alone is not a safe validator here. Pages with a
+    pending flash message are always rendered so the message is shown.
+    """
+    if '_flashes' in session:
+        return False
+    return request.if_none_match.contains_weak(etag)
+
+
+def add_validators(response, etag, last_modified):
+    """Attach ETag/Last-Modified and require revalidation on every use."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag, last_modified):
+    """Empty 304 response carrying the current validators."""
+    return add_validators(current_app.response_class(status=304), etag, last_modified)
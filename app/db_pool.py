@@ -0,0 +1,133 @@
+"""Database connection pool sizing and startup capacity check"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def pool_settings(config):
+    """
+    Per-worker pool size and overflow from config.
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW win when set. Otherwise, when
+    DB_CONNECTION_BUDGET is set, the budget is split evenly over
+    WEB_CONCURRENCY gunicorn workers, two thirds kept open and one third as
+    overflow.
+
+    Returns:
+        tuple: (pool_size, max_overflow)
+    """
+    pool_size = config.get('DB_POOL_SIZE')
+    max_overflow = config.get('DB_MAX_OVERFLOW')
+    budget = config.get('DB_CONNECTION_BUDGET')
+    if budget and pool_size is None:
+        per_worker = max(1, budget // max(1, config.get('WEB_CONCURRENCY', 1)))
+        pool_size = max(1, per_worker * 2 // 3)
+        if max_overflow is None:
+            max_overflow = per_worker - pool_size
+    return (5 if pool_size is None else pool_size,
+            5 if max_overflow is None else max_overflow)
+
+
+def configure_pool(app):
+    """
+    Fill SQLALCHEMY_ENGINE_OPTIONS with pool settings from DB_* config.
+
+    Keys already present in SQLALCHEMY_ENGINE_OPTIONS are left alone.
+    In-memory SQLite uses a StaticPool and gets no pool options.
+    Must run before db.init_app(), which creates the engine.
+    """
+    config = app.config
+    url = make_url(config.get('SQLALCHEMY_DATABASE_URI') or 'sqlite://')
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not _is_memory_sqlite(url):
+        pool_size, max_overflow = pool_settings(config)
+        options.setdefault('pool_size', pool_size)
+        options.setdefault('max_overflow', max_overflow)
+        options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 10))
+        options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 280))
+        options.setdefault('pool_pre_ping', config.get('DB_POOL_PRE_PING', True))
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def server_limits(connection):
+    """
+    Read max_connections (and MySQL's wait_timeout) from the server.
+
+    Returns:
+        dict: {'max_connections': int or None, 'wait_timeout': int or None}
+    """
+    dialect = connection.dialect.name
+    limits = {'max_connections': None, 'wait_timeout': None}
+    if dialect == 'mysql':
+        rows = connection.execute(text(
+            "SHOW VARIABLES WHERE Variable_name IN ('max_connections', 'wait_timeout')"
+        )).all()
+        for name, value in rows:
+            limits[name] = int(value)
+    elif dialect == 'postgresql':
+        limits['max_connections'] = int(connection.execute(text('SHOW max_connections')).scalar())
+    return limits
+
+
+def check_pool_capacity(app, engine, limits=None):
+    """
+    Compare the pool configuration with the database server's limits.
+
+    Every worker can open pool_size + max_overflow connections, plus
+    DB_RESERVED_CONNECTIONS for cron jobs, Celery and admin sessions. If the
+    total exceeds max_connections, an error is logged (or, with
+    DB_POOL_STRICT, RuntimeError is raised). A pool_recycle at or above
+    MySQL's wait_timeout is also reported, since the server would then drop
+    idle connections first.
+
+    Args:
+        app: The Flask application
+        engine: Engine whose pool is checked
+        limits: Server limits (read from the server when omitted)
+
+    Returns:
+        dict: The numbers that were compared, or None when the server could not be queried
+    """
+    config = app.config
+    if limits is None:
+        if engine.dialect.name not in ('mysql', 'postgresql'):
+            return None
+        try:
+            with engine.connect() as connection:
+                limits = server_limits(connection)
+        except Exception as e:
+            logger.warning('Could not read database connection limits: %s', e)
+            return None
+
+    options = config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    workers = max(1, config.get('WEB_CONCURRENCY', 1))
+    per_worker = options.get('pool_size', 5) + max(0, options.get('max_overflow', 5))
+    reserved = config.get('DB_RESERVED_CONNECTIONS', 5)
+    report = {
+        'workers': workers,
+        'per_worker': per_worker,
+        'reserved': reserved,
+        'required': workers * per_worker + reserved,
+        'max_connections': limits.get('max_connections'),
+    }
+
+    if report['max_connections'] and report['required'] > report['max_connections']:
+        message = (f"DB pool needs up to {report['required']} connections ({workers} workers x "
+                   f"{per_worker} + {reserved} reserved) but the server allows {report['max_connections']}")
+        if config.get('DB_POOL_STRICT'):
+            raise RuntimeError(message)
+        logger.error('%s; lower DB_POOL_SIZE/DB_MAX_OVERFLOW or set DB_CONNECTION_BUDGET', message)
+
+    wait_timeout = limits.get('wait_timeout')
+    recycle = options.get('pool_recycle', -1)
+    if wait_timeout and (recycle < 0 or recycle >= wait_timeout):
+        logger.warning('DB_POOL_RECYCLE (%s) should be below the server wait_timeout (%s)', recycle, wait_timeout)
+
+    return report
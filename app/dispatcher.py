@@ -0,0 +1,159 @@
+"""Bounded worker pool for sending email off the request thread"""
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import MAIL_QUEUE_DEPTH, MAIL_REJECTED, MAIL_SEND_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class MailDispatcher:
+    """
+    Run email jobs on a shared, bounded thread pool.
+
+    At most MAIL_WORKERS jobs run at once and at most MAIL_QUEUE_SIZE more
+    wait in the queue. When the queue is full, submit() blocks for up to
+    MAIL_QUEUE_TIMEOUT seconds (backpressure) and then rejects the job rather
+    than growing without bound. Pending jobs are drained for up to
+    MAIL_DRAIN_TIMEOUT seconds at interpreter exit.
+
+    The pool is created lazily in each process, so it is safe to initialise
+    before gunicorn forks its workers.
+    """
+
+    def __init__(self, app=None):
+        self.workers = 4
+        self.queue_size = 100
+        self.queue_timeout = 2.0
+        self.drain_timeout = 10.0
+        self._executor = None
+        self._pid = None
+        self._atexit_registered = False
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._reset_counters()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.workers = app.config.get('MAIL_WORKERS', self.workers)
+        self.queue_size = app.config.get('MAIL_QUEUE_SIZE', self.queue_size)
+        self.queue_timeout = app.config.get('MAIL_QUEUE_TIMEOUT', self.queue_timeout)
+        self.drain_timeout = app.config.get('MAIL_DRAIN_TIMEOUT', self.drain_timeout)
+        app.extensions['mail_dispatcher'] = self
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def _reset_counters(self):
+        self._slots = None
+        self.pending = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def _ensure_executor(self):
+        # A forked child inherits the parent's executor object but not its threads
+        if self._executor is None or self._pid != os.getpid():
+            self._reset_counters()
+            self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='mail')
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) for execution on the pool.
+
+        Returns:
+            bool: True if the job was queued, False if it was rejected
+        """
+        with self._lock:
+            executor = self._ensure_executor()
+            slots = self._slots
+
+        if not slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            MAIL_REJECTED.inc()
+            logger.warning("Mail queue full (%s); dropping %s", self.queue_size, getattr(fn, '__name__', fn))
+            return False
+
+        enqueued = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+            self.submitted += 1
+        MAIL_QUEUE_DEPTH.inc()
+
+        def run():
+            with self._lock:
+                self.pending -= 1
+                self.running += 1
+            MAIL_QUEUE_DEPTH.dec()
+            started = time.perf_counter()
+            ok = True
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                ok = False
+                logger.error("Mail job %s failed: %s", getattr(fn, '__name__', fn), e)
+            finally:
+                MAIL_SEND_DURATION.labels('ok' if ok else 'error').observe(time.perf_counter() - started)
+                latency = time.perf_counter() - enqueued
+                with self._lock:
+                    self.running -= 1
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self.latency_total += latency
+                    self.latency_max = max(self.latency_max, latency)
+                    if not self.pending and not self.running:
+                        self._idle.notify_all()
+                slots.release()
+
+        executor.submit(run)
+        return True
+
+    def stats(self):
+        """Snapshot of queue depth, outcomes and send latency for this process."""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'queue_depth': self.pending,
+                'running': self.running,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'latency_avg_seconds': self.latency_total / finished if finished else 0.0,
+                'latency_max_seconds': self.latency_max,
+            }
+
+    def drain(self, timeout=None):
+        """
+        Wait until every queued job has finished.
+
+        Returns:
+            bool: True if the queue drained before the timeout
+        """
+        timeout = self.drain_timeout if timeout is None else timeout
+        with self._lock:
+            return self._idle.wait_for(lambda: not self.pending and not self.running, timeout)
+
+    def shutdown(self, timeout=None):
+        """Drain pending jobs, then stop the worker threads."""
+        if self._executor is None or self._pid != os.getpid():
+            return
+        if not self.drain(timeout):
+            logger.warning("Mail dispatcher shut down with %s jobs still queued", self.pending)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
@@ -2,29 +2,85 @@
 Alternative email implementation using Mailgun API (more reliable than SMTP)
 """
 import os
+import json
+import threading
 import requests
-from threading import Thread
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
+from . import mail_dispatcher
+from markupsafe import escape
+from .email_templates import render_email, long_date
+
+# Mailgun accepts at most 1000 recipients per messages API call
+MAILGUN_MAX_RECIPIENTS = 1000
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _mailgun_settings():
+    """Read Mailgun domain, API key, sender and API base URL from the environment."""
+    mailgun_domain = os.environ.get('MAILGUN_DOMAIN', 'sandbox164383bdb1864606b4c832581a4e2b83.mailgun.org')
+    return {
+        'domain': mailgun_domain,
+        'api_key': os.environ.get('MAILGUN_API_KEY', os.environ.get('MAIL_PASSWORD')),
+        'sender': os.environ.get('MAIL_DEFAULT_SENDER', f'Job Tracker <postmaster@{mailgun_domain}>'),
+        'api_base': os.environ.get('MAILGUN_API_BASE', 'https://api.mailgun.net/v3'),
+    }
+
+
+def get_mailgun_session(refresh=False):
+    """
+    Return the shared keep-alive session for Mailgun API calls.
+
+    Connections are pooled and reused across calls. Connection failures and
+    429/503 responses are retried with exponential backoff (honouring
+    Retry-After). Other 5xx responses and read timeouts are not retried: the
+    POST may already have been accepted, and resending a batch would email up
+    to 1000 recipients twice.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if refresh or _session is None or _session_pid != os.getpid():
+            retry = Retry(
+                total=int(os.environ.get('MAILGUN_RETRIES', 3)),
+                read=0,
+                backoff_factor=float(os.environ.get('MAILGUN_BACKOFF', 0.5)),
+                status_forcelist=(429, 503),
+                allowed_methods=frozenset(['POST']),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+
+def _post_message(data):
+    """POST one message to the Mailgun messages API over the shared session."""
+    settings = _mailgun_settings()
+    return get_mailgun_session().post(
+        f"{settings['api_base']}/{settings['domain']}/messages",
+        auth=("api", settings['api_key']),
+        data={"from": settings['sender'], **data},
+        timeout=30
+    )
 
 
 def send_async_email_mailgun(subject, recipients, text_body, html_body):
     """Send email asynchronously using Mailgun API"""
     try:
-        mailgun_domain = os.environ.get('MAILGUN_DOMAIN', 'sandbox164383bdb1864606b4c832581a4e2b83.mailgun.org')
-        mailgun_api_key = os.environ.get('MAILGUN_API_KEY', os.environ.get('MAIL_PASSWORD'))
-        sender = os.environ.get('MAIL_DEFAULT_SENDER', f'Job Tracker <postmaster@{mailgun_domain}>')
-        
-        response = requests.post(
-            f"https://api.mailgun.net/v3/{mailgun_domain}/messages",
-            auth=("api", mailgun_api_key),
-            data={
-                "from": sender,
-                "to": recipients if isinstance(recipients, list) else [recipients],
-                "subject": subject,
-                "text": text_body,
-                "html": html_body
-            }
-        )
+        response = _post_message({
+            "to": recipients if isinstance(recipients, list) else [recipients],
+            "subject": subject,
+            "text": text_body,
+            "html": html_body
+        })
         
         if response.status_code == 200:
             print(f"✓ Email sent successfully via Mailgun API: {subject}")
@@ -35,6 +91,104 @@ def send_async_email_mailgun(subject, recipients, text_body, html_body):
         print(f"Error sending email: {e}")
 
 
+def send_batch_mailgun(subject, recipient_variables, text_body=None, html_body=None):
+    """
+    Send one personalised message to many recipients in as few API calls as possible.
+    
+    Recipients are packed up to MAILGUN_MAX_RECIPIENTS per call. Mailgun sends
+    each recipient an individual copy, substituting %recipient.<key>% in the
+    subject and bodies with that recipient's variables.
+    
+    Args:
+        subject: Subject line, may contain %recipient.<key>% placeholders
+        recipient_variables: Dict mapping email address to a dict of variables
+        text_body: Plain text body template
+        html_body: HTML body template; Mailgun substitutes variables as-is, so
+            placeholders here must refer to HTML-escaped values
+    
+    Returns:
+        dict: Summary with 'sent', 'failed' and 'requests' counts
+    """
+    summary = {'sent': 0, 'failed': 0, 'requests': 0}
+    emails = list(recipient_variables)
+    # Mailgun rejects calls with more than MAILGUN_MAX_RECIPIENTS recipients
+    batch_size = int(os.environ.get('MAILGUN_BATCH_SIZE', MAILGUN_MAX_RECIPIENTS))
+    batch_size = min(max(batch_size, 1), MAILGUN_MAX_RECIPIENTS)
+    
+    for start in range(0, len(emails), batch_size):
+        batch = emails[start:start + batch_size]
+        summary['requests'] += 1
+        try:
+            response = _post_message({
+                "to": batch,
+                "subject": subject,
+                "text": text_body,
+                "html": html_body,
+                "recipient-variables": json.dumps({email: recipient_variables[email] for email in batch})
+            })
+        except requests.RequestException as e:
+            print(f"Error sending Mailgun batch of {len(batch)}: {e}")
+            summary['failed'] += len(batch)
+            continue
+        
+        if response.status_code == 200:
+            summary['sent'] += len(batch)
+        else:
+            print(f"✗ Failed to send Mailgun batch: {response.status_code} - {response.text}")
+            summary['failed'] += len(batch)
+    
+    return summary
+
+
+def send_application_reminders_mailgun(reminders):
+    """
+    Send follow-up reminders for many (user, application) pairs via batched API calls.
+    
+    Each user receives one message listing all of their due applications.
+    
+    Library helper only: the scheduled reminder runs send over SMTP through
+    the reminder ledger, and this function records nothing in reminder_log.
+    
+    Args:
+        reminders: Iterable of (User, JobApplication) pairs
+    
+    Returns:
+        dict: Summary from send_batch_mailgun()
+    """
+    per_user = {}
+    for user, application in reminders:
+        if user.email:
+            per_user.setdefault(user.email, (user, []))[1].append(application)
+    
+    recipient_variables = {}
+    for email, (user, applications) in per_user.items():
+        lines = [
+            f"{a.company} - {a.position or 'N/A'} ({a.status}), follow up {long_date(a.follow_up_date, 'today')}"
+            for a in applications
+        ]
+        name = user.name or 'there'
+        recipient_variables[email] = {
+            'name': name,
+            'name_html': str(escape(name)),
+            'count': len(applications),
+            'companies': ', '.join(a.company for a in applications),
+            'items_text': '\n'.join(f'- {line}' for line in lines),
+            'items_html': ''.join(f'<li>{escape(line)}</li>' for line in lines),
+        }
+    
+    # Render once with Mailgun placeholders; Mailgun personalises each copy
+    subject = "Reminder: Follow up with %recipient.companies%"
+    text_body, _ = render_email(
+        'reminder_batch', name='%recipient.name%',
+        items_text='%recipient.items_text%', items_html=''
+    )
+    _, html_body = render_email(
+        'reminder_batch', name='%recipient.name_html%',
+        items_text='', items_html='%recipient.items_html%'
+    )
+    return send_batch_mailgun(subject, recipient_variables, text_body, html_body)
+
+
 def send_email_mailgun(subject, recipients, text_body=None, html_body=None):
     """
     Send email using Mailgun API (asynchronously).
@@ -45,54 +199,15 @@ def send_email_mailgun(subject, recipients, text_body=None, html_body=None):
         text_body: Plain text email body
         html_body: HTML email body
     """
-    # Send email asynchronously to avoid blocking
-    Thread(target=send_async_email_mailgun, args=(subject, recipients, text_body, html_body)).start()
+    # Send email on the shared worker pool to avoid blocking
+    mail_dispatcher.submit(send_async_email_mailgun, subject, recipients, text_body, html_body)
 
 
 def send_welcome_email_mailgun(user):
     """Send welcome email to new user using Mailgun API"""
     subject = "Welcome to Job Application Tracker!"
     recipient = user.email
-    text_body = f"""
-Hi {user.name or 'there'},
-
-Welcome to Job Application Tracker!
-
-We're excited to help you organize and track your job applications.
-
-Here's what you can do:
-- Add new job applications
-- Track application status
-- Set follow-up reminders
-- View your application statistics
-
-Get started by logging in and adding your first application!
-
-Best regards,
-The Job Tracker Team
-"""
-    html_body = f"""
-<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <h2 style="color: #0d6efd;">Welcome to Job Application Tracker!</h2>
-    <p>Hi {user.name or 'there'},</p>
-    <p>We're excited to help you organize and track your job applications.</p>
-    
-    <h3>Here's what you can do:</h3>
-    <ul>
-        <li>Add new job applications</li>
-        <li>Track application status</li>
-        <li>Set follow-up reminders</li>
-        <li>View your application statistics</li>
-    </ul>
-    
-    <p>Get started by logging in and adding your first application!</p>
-    
-    <p>Best regards,<br>
-    The Job Tracker Team</p>
-</body>
-</html>
-"""
+    text_body, html_body = render_email('welcome', name=user.name or 'there')
     send_email_mailgun(subject, recipient, text_body, html_body)
 
 
@@ -100,49 +215,9 @@ def send_application_reminder_mailgun(user, application):
     """Send reminder email for application follow-up using Mailgun API"""
     subject = f"Reminder: Follow up with {application.company}"
     recipient = user.email
-    text_body = f"""
-Hi {user.name or 'there'},
-
-This is a reminder to follow up on your application to {application.company}.
-
-Application Details:
-- Company: {application.company}
-- Position: {application.position or 'N/A'}
-- Status: {application.status}
-- Applied on: {application.date_applied.strftime('%B %d, %Y') if application.date_applied else 'N/A'}
-- Follow-up date: {application.follow_up_date.strftime('%B %d, %Y') if application.follow_up_date else 'N/A'}
-
-Notes: {application.notes or 'None'}
-
-Good luck with your application!
-
-Best regards,
-The Job Tracker Team
-"""
-    html_body = f"""
-<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <h2 style="color: #0d6efd;">Follow-up Reminder</h2>
-    <p>Hi {user.name or 'there'},</p>
-    <p>This is a reminder to follow up on your application to <strong>{application.company}</strong>.</p>
-    
-    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid #0d6efd; margin: 20px 0;">
-        <h3 style="margin-top: 0;">Application Details</h3>
-        <p><strong>Company:</strong> {application.company}</p>
-        <p><strong>Position:</strong> {application.position or 'N/A'}</p>
-        <p><strong>Status:</strong> <span style="padding: 3px 8px; background-color: #0dcaf0; color: white; border-radius: 3px;">{application.status}</span></p>
-        <p><strong>Applied on:</strong> {application.date_applied.strftime('%B %d, %Y') if application.date_applied else 'N/A'}</p>
-        <p><strong>Follow-up date:</strong> {application.follow_up_date.strftime('%B %d, %Y') if application.follow_up_date else 'N/A'}</p>
-        {f'<p><strong>Notes:</strong> {application.notes}</p>' if application.notes else ''}
-    </div>
-    
-    <p>Good luck with your application!</p>
-    
-    <p>Best regards,<br>
-    The Job Tracker Team</p>
-</body>
-</html>
-"""
+    text_body, html_body = render_email(
+        'application_reminder', name=user.name or 'there', application=application
+    )
     send_email_mailgun(subject, recipient, text_body, html_body)
 
 
@@ -150,51 +225,8 @@ def send_status_change_notification_mailgun(user, application, old_status, new_s
     """Send notification when application status changes using Mailgun API"""
     subject = f"Status Update: {application.company} - {new_status}"
     recipient = user.email
-    text_body = f"""
-Hi {user.name or 'there'},
-
-Your application status has been updated!
-
-Company: {application.company}
-Position: {application.position or 'N/A'}
-Old Status: {old_status}
-New Status: {new_status}
-
-Keep up the great work on your job search!
-
-Best regards,
-The Job Tracker Team
-"""
-    
-    # Status color mapping
-    status_colors = {
-        'Applied': '#0dcaf0',
-        'Interview': '#ffc107',
-        'Offer': '#198754',
-        'Accepted': '#198754',
-        'Rejected': '#dc3545',
-        'Withdrawn': '#6c757d'
-    }
-    
-    html_body = f"""
-<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <h2 style="color: #0d6efd;">Application Status Update</h2>
-    <p>Hi {user.name or 'there'},</p>
-    <p>Your application status has been updated!</p>
-    
-    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid #0d6efd; margin: 20px 0;">
-        <p><strong>Company:</strong> {application.company}</p>
-        <p><strong>Position:</strong> {application.position or 'N/A'}</p>
-        <p><strong>Old Status:</strong> <span style="padding: 3px 8px; background-color: {status_colors.get(old_status, '#6c757d')}; color: white; border-radius: 3px;">{old_status}</span></p>
-        <p><strong>New Status:</strong> <span style="padding: 3px 8px; background-color: {status_colors.get(new_status, '#6c757d')}; color: white; border-radius: 3px;">{new_status}</span></p>
-    </div>
-    
-    <p>Keep up the great work on your job search!</p>
-    
-    <p>Best regards,<br>
-    The Job Tracker Team</p>
-</body>
-</html>
-"""
+    text_body, html_body = render_email(
+        'status_change', name=user.name or 'there', application=application,
+        old_status=old_status, new_status=new_status
+    )
     send_email_mailgun(subject, recipient, text_body, html_body)
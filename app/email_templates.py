@@ -0,0 +1,86 @@
+"""Precompiled Jinja templates for email bodies"""
+from flask import current_app
+
+# Badge colors per application status, shared by every email template
+STATUS_COLORS = {
+    'Applied': '#0dcaf0',
+    'Interview': '#ffc107',
+    'Offer': '#198754',
+    'Accepted': '#198754',
+    'Rejected': '#dc3545',
+    'Withdrawn': '#6c757d'
+}
+
+# Every email under templates/email/ as a (text, html) pair
+EMAIL_TEMPLATES = (
+    'welcome',
+    'application_reminder',
+    'status_change',
+    'followup_reminder',
+    'reminder_digest',
+    'reminder_batch',
+)
+
+
+def status_color(status):
+    """Badge color for a status, grey for unknown statuses."""
+    return STATUS_COLORS.get(status, '#6c757d')
+
+
+def long_date(value, default='N/A'):
+    """Format a date as 'October 05, 2025', or default when missing."""
+    return value.strftime('%B %d, %Y') if value else default
+
+
+class EmailRenderer:
+    """
+    Compile every email template once at startup and render from the cache.
+
+    Templates are loaded through the app's Jinja environment (so the usual
+    HTML autoescaping applies) and kept as compiled Template objects.
+    Rendering calls Template.render() directly, skipping Flask's per-call
+    template lookup, context processors and signals.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        env = app.jinja_env
+        env.globals['status_color'] = status_color
+        env.filters['long_date'] = long_date
+        app.extensions['email_templates'] = {
+            name: (env.get_template(f'email/{name}.txt'), env.get_template(f'email/{name}.html'))
+            for name in EMAIL_TEMPLATES
+        }
+
+
+def render_email(template_name, /, **context):
+    """
+    Render one email from its compiled templates.
+
+    Args:
+        template_name: Template name from EMAIL_TEMPLATES
+        **context: Template variables
+
+    Returns:
+        tuple: (text_body, html_body)
+    """
+    text_template, html_template = current_app.extensions['email_templates'][template_name]
+    return text_template.render(context), html_template.render(context)
+
+
+def render_email_batch(template_name, contexts):
+    """
+    Render the same email for many contexts, e.g. a whole reminder run.
+
+    Args:
+        template_name: Template name from EMAIL_TEMPLATES
+        contexts: Iterable of context dicts
+
+    Returns:
+        list: (text_body, html_body) tuples in input order
+    """
+    text_template, html_template = current_app.extensions['email_templates'][template_name]
+    return [(text_template.render(context), html_template.render(context)) for context in contexts]
@@ -0,0 +1,213 @@
+"""In-process reminder scheduler for deployments without Celery beat or cron"""
+import atexit
+import importlib
+import logging
+import os
+import random
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from .schedules import REMINDER_SCHEDULE, CronSchedule
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(path):
+    """Import a 'module:function' reference."""
+    module_name, _, attribute = path.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class EmbeddedScheduler:
+    """
+    Run the reminder jobs of REMINDER_SCHEDULE from a background thread.
+
+    Every web worker that enables it runs the same loop: each
+    SCHEDULER_INTERVAL seconds (plus up to SCHEDULER_JITTER seconds, so
+    workers do not all hit the database at once) it works out the latest
+    scheduled time of each job and tries to claim it in the scheduler_lease
+    table. The claim is a conditional UPDATE, so exactly one worker wins each
+    run; the winner runs the job on its own thread and the loop carries on.
+
+    A run whose worker died is taken over once its SCHEDULER_LEASE expires,
+    however late that is; the reminder ledger keeps that from resending what
+    was already sent. Runs nobody claimed within SCHEDULER_MISFIRE_GRACE
+    seconds (e.g. the app was down at the time) are skipped.
+
+    init_app() only reads the settings: the loop is started explicitly with
+    start(), from gunicorn's post_fork hook (gunicorn.conf.py), so CLI
+    commands, cron scripts and Celery workers that create the app never
+    claim runs they may not live to finish.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.interval = 30.0
+        self.jitter = 10.0
+        self.lease = 3600
+        self.misfire_grace = 3600
+        self.jobs = {}
+        self._app = None
+        self._thread = None
+        self._stop = None
+        self._pid = None
+        self._claimed = {}
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('SCHEDULER_ENABLED', self.enabled)
+        self.interval = app.config.get('SCHEDULER_INTERVAL', self.interval)
+        self.jitter = app.config.get('SCHEDULER_JITTER', self.jitter)
+        self.lease = app.config.get('SCHEDULER_LEASE', self.lease)
+        self.misfire_grace = app.config.get('SCHEDULER_MISFIRE_GRACE', self.misfire_grace)
+        self.jobs = {
+            name: (CronSchedule(**entry['cron']), entry['function'])
+            for name, entry in REMINDER_SCHEDULE.items()
+        }
+        app.extensions['embedded_scheduler'] = self
+        # create_app() may run more than once per process; a running loop uses the latest app
+        self._app = app
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    @property
+    def owner(self):
+        """Lease owner recorded for runs claimed by this process."""
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def start(self):
+        """Start the scheduler loop in this process (no-op if it is running)."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        # A forked child inherits the parent's thread object but not the thread
+        self._pid = os.getpid()
+        self._claimed = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name='embedded-scheduler', daemon=True
+        )
+        self._thread.start()
+        logger.info('Embedded scheduler started (%s)', self.owner)
+
+    def stop(self, timeout=5.0):
+        """Stop the scheduler loop; jobs already running finish on their own threads."""
+        if self._stop is not None:
+            self._stop.set()
+        thread = self._thread
+        if (thread is not None and self._pid == os.getpid()
+                and thread is not threading.current_thread()):
+            thread.join(timeout)
+        self._thread = None
+
+    def _run(self, stop):
+        stop.wait(random.uniform(0, self.jitter))
+        while not stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                # Keep the loop alive through database outages
+                logger.error('Embedded scheduler tick failed: %s', e)
+            stop.wait(self.interval + random.uniform(0, self.jitter))
+
+    def run_pending(self, now=None):
+        """
+        Claim and start every job whose latest scheduled time has not run yet.
+
+        Past SCHEDULER_MISFIRE_GRACE a run is only started to take over from
+        a worker that claimed it and died, never for the first time.
+
+        Args:
+            now: Current UTC time (defaults to datetime.utcnow())
+
+        Returns:
+            dict: Job name -> thread running it, for the jobs this call started
+        """
+        now = now or datetime.utcnow()
+        started = {}
+        with self._app.app_context():
+            for name, (cron, function) in self.jobs.items():
+                slot = cron.previous(now)
+                if slot is None or self._claimed.get(name) == slot:
+                    continue
+                missed = now - slot > timedelta(seconds=self.misfire_grace)
+                if not self._claim(name, slot, now, takeover_only=missed):
+                    continue
+                self._claimed[name] = slot
+                thread = threading.Thread(
+                    target=self._execute, args=(name, function, slot),
+                    name=f'scheduled-{name}', daemon=True
+                )
+                thread.start()
+                started[name] = thread
+        return started
+
+    def _claim(self, name, slot, now, takeover_only=False):
+        """
+        Take the lease on one run of a job.
+
+        A run is free when the job's last claimed slot is older, or when this
+        slot's run never finished and its lease has expired.
+
+        Args:
+            name: Job name
+            slot: Scheduled time of the run
+            now: Current UTC time
+            takeover_only: Only take over an expired claim on this slot
+
+        Returns:
+            bool: True if this worker should run the job
+        """
+        from . import db
+        from .models import SchedulerLease
+
+        values = {'slot': slot, 'owner': self.owner,
+                  'leased_until': now + timedelta(seconds=self.lease), 'finished_at': None}
+        abandoned = and_(SchedulerLease.slot == slot,
+                         SchedulerLease.finished_at.is_(None),
+                         SchedulerLease.leased_until < now)
+        available = abandoned if takeover_only else or_(
+            SchedulerLease.slot.is_(None), SchedulerLease.slot < slot, abandoned
+        )
+        with db.engine.begin() as connection:
+            if connection.execute(
+                update(SchedulerLease).where(SchedulerLease.name == name, available).values(**values)
+            ).rowcount == 1:
+                return True
+            if takeover_only or connection.scalar(select(SchedulerLease.name).where(SchedulerLease.name == name)) is not None:
+                return False
+        # First run of this job: whoever inserts its row wins
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(SchedulerLease).values(name=name, **values))
+            return True
+        except IntegrityError:
+            return False
+
+    def _execute(self, name, function, slot):
+        from . import db
+        from .models import SchedulerLease
+
+        logger.info('Running scheduled job %s (%s)', name, slot)
+        try:
+            result = _resolve(function)()
+            logger.info('Scheduled job %s finished: %s', name, result)
+        except Exception as e:
+            # Not retried here; failed reminders are picked up by the next run
+            logger.error('Scheduled job %s failed: %s', name, e)
+        try:
+            with self._app.app_context(), db.engine.begin() as connection:
+                connection.execute(
+                    update(SchedulerLease).where(
+                        SchedulerLease.name == name, SchedulerLease.slot == slot,
+                        SchedulerLease.owner == self.owner
+                    ).values(finished_at=datetime.utcnow())
+                )
+        except Exception as e:
+            logger.error('Could not mark scheduled job %s finished: %s', name, e)
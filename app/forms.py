@@ -1,6 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SubmitField, PasswordField, BooleanField, DateField, SelectField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, Optional
+from .models import STATUSES
 
 
 class RegisterForm(FlaskForm):
@@ -24,14 +25,7 @@ class ApplicationForm(FlaskForm):
     """Job application form matching the JobApplication model."""
     company = StringField('Company', validators=[DataRequired()])
     position = StringField('Position/Role', validators=[DataRequired()])
-    status = SelectField('Status', choices=[
-        ('Applied', 'Applied'),
-        ('Interview', 'Interview'),
-        ('Offer', 'Offer'),
-        ('Rejected', 'Rejected'),
-        ('Accepted', 'Accepted'),
-        ('Withdrawn', 'Withdrawn')
-    ], default='Applied')
+    status = SelectField('Status', choices=[(s, s) for s in STATUSES], default='Applied')
     date_applied = DateField('Date Applied', validators=[Optional()], format='%Y-%m-%d')
     follow_up_date = DateField('Follow-up Date', validators=[Optional()], format='%Y-%m-%d')
     notes = TextAreaField('Notes')
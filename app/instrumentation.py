@@ -0,0 +1,124 @@
+"""Per-request SQL statement counts and timings from SQLAlchemy engine events"""
+import logging
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """SQL statements issued while serving one request."""
+
+    def __init__(self, keep_slowest=3):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_time = 0.0
+        self.slowest = []
+        self.keep_slowest = keep_slowest
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.db_time += elapsed
+        if len(self.slowest) < self.keep_slowest or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, ' '.join(statement.split())[:200]))
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+    def as_dict(self):
+        return {
+            'queries': self.count,
+            'db_ms': round(self.db_time * 1000, 2),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'slowest': [
+                {'ms': round(elapsed * 1000, 2), 'sql': statement}
+                for elapsed, statement in self.slowest
+            ],
+        }
+
+
+class QueryInstrumentation:
+    """
+    Count and time the SQL each request issues.
+
+    Engine-level cursor events record every statement executed while a
+    request is active. After the request, the totals are sent as a
+    Server-Timing header (so they show up in browser dev tools) and logged as
+    one key=value line with the numbers also attached as the ``sql`` log
+    record attribute. Requests issuing more than SQL_QUERY_BUDGET statements
+    log a warning with the slowest ones, which is how N+1 patterns show up.
+
+    Statements run outside a request (scheduler, mail workers) are ignored.
+    """
+
+    def __init__(self, app=None):
+        self._events_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['sql_instrumentation'] = self
+        if not app.config.get('SQL_INSTRUMENTATION', True):
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        self._register_events()
+
+    def _register_events(self):
+        if self._events_registered:
+            return
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(Engine, 'handle_error', self._handle_error)
+        self._events_registered = True
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'sql_stats' in g:
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        if not starts or not has_request_context() or 'sql_stats' not in g:
+            return
+        g.sql_stats.record(statement, time.perf_counter() - starts.pop())
+
+    @staticmethod
+    def _handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_start'):
+            connection.info['query_start'].pop()
+
+    @staticmethod
+    def _before_request():
+        g.sql_stats = RequestStats(current_app.config.get('SQL_SLOWEST_QUERIES', 3))
+
+    @staticmethod
+    def _after_request(response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+
+        summary = stats.as_dict()
+        config = current_app.config
+        if config.get('SQL_SERVER_TIMING', True):
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries"'
+            )
+            response.headers.add('Server-Timing', f'app;dur={summary["total_ms"]}')
+
+        line = 'sql method=%s path=%s status=%s queries=%s db_ms=%s total_ms=%s'
+        args = (request.method, request.path, response.status_code,
+                summary['queries'], summary['db_ms'], summary['total_ms'])
+        budget = config.get('SQL_QUERY_BUDGET', 20)
+        if budget and summary['queries'] > budget:
+            slowest = '; '.join(f'{entry["ms"]}ms {entry["sql"]}' for entry in summary['slowest'])
+            logger.warning(line + ' budget=%s exceeded; slowest: %s', *args, budget, slowest, extra={'sql': summary})
+        else:
+            logger.info(line, *args, extra={'sql': summary})
+        return response
@@ -0,0 +1,129 @@
+"""Non-blocking logging: request threads enqueue records, a listener thread writes them"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from .metrics import LOG_RECORDS_DROPPED
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any extra= fields (e.g. 'sql')."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that drops records instead of blocking.
+
+    prepare() only merges the %-style args into the message (and renders any
+    traceback) so the record is safe to hand to another thread; timestamps,
+    layout and JSON encoding are done by the listener's formatters.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Copy: the same record still propagates to other handlers unchanged
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _Listener(QueueListener):
+    def stop(self):
+        # The queue may be full: wait for the listener to make room, but give
+        # up if it is not draining (e.g. the thread did not survive a fork)
+        try:
+            self.queue.put(self._sentinel, timeout=5)
+        except queue.Full:
+            return
+        self._thread.join()
+        self._thread = None
+
+
+class QueueLogging:
+    """A DroppingQueueHandler and the listener thread that drains it."""
+
+    def __init__(self, handlers, maxsize=10000):
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=maxsize))
+        # Records below every target handler's level are never enqueued
+        self.handler.setLevel(min(handler.level for handler in handlers))
+        self.listener = _Listener(self.handler.queue, *handlers, respect_handler_level=True)
+        self._stopped = False
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+_installed = {}
+
+
+def install_queue_logging(logger, handlers, maxsize=10000):
+    """
+    Route a logger's output to handlers through a bounded queue.
+
+    Calling it again for the same logger (e.g. once per create_app() call)
+    replaces the previous queue and listener instead of adding another.
+
+    Returns:
+        QueueLogging: The installed handler and listener
+    """
+    previous = _installed.pop(logger.name, None)
+    if previous is not None:
+        logger.removeHandler(previous.handler)
+        previous.stop()
+
+    installed = QueueLogging(handlers, maxsize)
+    logger.addHandler(installed.handler)
+    _installed[logger.name] = installed
+    return installed
@@ -0,0 +1,157 @@
+"""Batch email delivery over a persistent SMTP connection"""
+import smtplib
+import logging
+import threading
+import time
+from flask import current_app
+from . import mail
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection is unusable; the message can be retried on a new one
+CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    smtplib.SMTPHeloError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class TokenBucket:
+    """
+    Allow `rate` events per second on average, in bursts of at most `burst`.
+
+    acquire() blocks until a token is free, so a loop that calls it before
+    every message never goes over the rate.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class SMTPBatchSender:
+    """
+    Send many messages over one authenticated SMTP connection.
+
+    The connection (connect, STARTTLS, AUTH) is opened lazily on the first
+    message and reused for the rest. It is recycled after
+    MAIL_CONNECTION_MAX_MESSAGES messages, and re-opened when the server drops
+    it, retrying the failed message up to MAIL_SEND_RETRIES times. With
+    rate_limit (messages per minute), send() waits as needed to stay under it.
+
+    Must be used inside an application context:
+
+        with SMTPBatchSender() as sender:
+            for msg in messages:
+                sender.send(msg)
+    """
+
+    def __init__(self, max_messages=None, retries=None, rate_limit=None):
+        config = current_app.config
+        self.max_messages = max_messages if max_messages is not None else config.get('MAIL_CONNECTION_MAX_MESSAGES', 100)
+        self.retries = retries if retries is not None else config.get('MAIL_SEND_RETRIES', 1)
+        self.throttle = TokenBucket(rate_limit / 60.0) if rate_limit else None
+        self.connection = None
+        self.connections_opened = 0
+        self.sent = 0
+        self.failed = 0
+        self._on_connection = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def _connect(self):
+        if self.connection is None:
+            self.connection = mail.connect().__enter__()
+            self.connections_opened += 1
+            self._on_connection = 0
+        return self.connection
+
+    def close(self, broken=False):
+        """Close the current connection, politely unless it is already broken."""
+        if self.connection is None:
+            return
+        host = self.connection.host
+        self.connection = None
+        if host is None:
+            return
+        try:
+            if broken:
+                host.close()
+            else:
+                host.quit()
+        except (smtplib.SMTPException, OSError):
+            host.close()
+
+    def send(self, msg):
+        """
+        Send one message, reconnecting on connection failures.
+
+        Returns:
+            bool: True if the message was accepted by the server
+        """
+        if self.throttle is not None:
+            self.throttle.acquire()
+        for attempt in range(self.retries + 1):
+            try:
+                self._connect().send(msg)
+            except CONNECTION_ERRORS as e:
+                self.close(broken=True)
+                if attempt < self.retries:
+                    logger.warning("SMTP connection lost (%s); reconnecting", e)
+                    continue
+                logger.error("Failed to send '%s' after %s attempts: %s", msg.subject, attempt + 1, e)
+                self.failed += 1
+                return False
+            except Exception as e:
+                logger.error("Failed to send '%s': %s", msg.subject, e)
+                self.failed += 1
+                return False
+
+            self.sent += 1
+            self._on_connection += 1
+            if self.max_messages and self._on_connection >= self.max_messages:
+                self.close()
+            return True
+
+
+def send_messages(messages):
+    """
+    Send an iterable of messages over a shared connection.
+
+    Returns:
+        dict: Counts of sent and failed messages and connections opened
+    """
+    with SMTPBatchSender() as sender:
+        for msg in messages:
+            sender.send(msg)
+    return {
+        'sent': sender.sent,
+        'failed': sender.failed,
+        'connections': sender.connections_opened
+    }
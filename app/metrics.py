@@ -0,0 +1,174 @@
+"""Prometheus metrics for requests, the DB pool, mail delivery and reminder runs"""
+import hmac
+import os
+import time
+
+from flask import Response, abort, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+REQUEST_LATENCY = Histogram(
+    'jobtracker_http_request_duration_seconds', 'HTTP request latency by endpoint',
+    ['method', 'endpoint', 'status']
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'jobtracker_db_pool_checkout_wait_seconds', 'Time spent getting a connection from the DB pool',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    'jobtracker_db_pool_checkout_timeouts_total', 'Pool checkouts that gave up waiting for a connection'
+)
+MAIL_QUEUE_DEPTH = Gauge(
+    'jobtracker_mail_queue_depth', 'Email jobs waiting for a worker thread', multiprocess_mode='livesum'
+)
+MAIL_SEND_DURATION = Histogram(
+    'jobtracker_mail_send_duration_seconds', 'Time to run one email job', ['outcome']
+)
+MAIL_REJECTED = Counter(
+    'jobtracker_mail_rejected_total', 'Email jobs dropped because the queue was full'
+)
+REMINDER_RUNS = Counter(
+    'jobtracker_reminder_runs_total', 'Reminder runs', ['kind']
+)
+REMINDERS = Counter(
+    'jobtracker_reminders_total',
+    'Reminder outcomes per application (sent, failed, skipped as already sent) and emails sent',
+    ['kind', 'result']
+)
+REMINDER_RUN_DURATION = Histogram(
+    'jobtracker_reminder_run_duration_seconds', 'Duration of one reminder run', ['kind'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+REMINDER_LAST_RUN = Gauge(
+    'jobtracker_reminder_last_run_timestamp_seconds', 'Unix time the last reminder run finished',
+    ['kind'], multiprocess_mode='mostrecent'
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'jobtracker_db_pool_checked_out', 'DB connections currently checked out of the pool',
+    multiprocess_mode='livesum'
+)
+DB_POOL_INVALIDATED = Counter(
+    'jobtracker_db_pool_invalidated_total', 'DB connections discarded as stale or broken (including failed pre-pings)'
+)
+LOG_RECORDS_DROPPED = Counter(
+    'jobtracker_log_records_dropped_total', 'Log records dropped because the logging queue was full'
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits (including connect)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def record_reminder_run(kind, summary, duration):
+    """
+    Record a reminder run summary (as returned by send_daily_reminders).
+
+    Args:
+        kind: Run type, e.g. 'daily' or 'upcoming'
+        summary: Summary dict with sent, failed, skipped and emails counts
+        duration: Run time in seconds
+    """
+    REMINDER_RUNS.labels(kind).inc()
+    for result in ('sent', 'failed', 'skipped', 'emails'):
+        REMINDERS.labels(kind, result).inc(summary.get(result, 0))
+    REMINDER_RUN_DURATION.labels(kind).observe(duration)
+    REMINDER_LAST_RUN.labels(kind).set_to_current_time()
+
+
+class PrometheusMetrics:
+    """
+    Serve Prometheus metrics at /metrics.
+
+    Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does) so
+    every worker writes its samples to files in that directory and /metrics
+    merges them, whichever worker answers the scrape. Without it, metrics
+    are those of the answering process only.
+
+    Must be initialised before db.init_app() so the engine is created with
+    TimedQueuePool. Set METRICS_TOKEN to require a bearer token.
+    """
+
+    def __init__(self, app=None):
+        self._events_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['metrics'] = self
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+
+        # Time pool checkouts, unless another pool class was chosen explicitly
+        # or the database is in-memory SQLite (which needs a StaticPool)
+        url = make_url(app.config.get('SQLALCHEMY_DATABASE_URI') or 'sqlite://')
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        if not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+            options.setdefault('poolclass', TimedQueuePool)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+        self._register_events()
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def _register_events(self):
+        if self._events_registered:
+            return
+        event.listen(Pool, 'checkout', self._on_checkout)
+        event.listen(Pool, 'checkin', self._on_checkin)
+        event.listen(Pool, 'invalidate', self._on_invalidate)
+        self._events_registered = True
+
+    @staticmethod
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @staticmethod
+    def _on_checkin(dbapi_connection, connection_record):
+        # checkin also fires for connections invalidated while checked out
+        DB_POOL_CHECKED_OUT.dec()
+
+    @staticmethod
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATED.inc()
+
+    @staticmethod
+    def _before_request():
+        g.metrics_started = time.perf_counter()
+
+    @staticmethod
+    def _after_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            REQUEST_LATENCY.labels(
+                request.method, request.endpoint or 'unmatched', response.status_code
+            ).observe(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def metrics_view():
+        token = current_app.config.get('METRICS_TOKEN')
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(401)
+
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
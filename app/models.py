@@ -1,13 +1,19 @@
 from . import db
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# Application statuses in display order (used by forms, stats and templates)
+STATUSES = ['Applied', 'Interview', 'Offer', 'Rejected', 'Accepted', 'Withdrawn']
+
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
     name = db.Column(db.String(120))
     password_hash = db.Column(db.String(256))  # Increased from 128 to 256 for scrypt hashes
+    reminder_digest = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())  # One email per day instead of one per application
     applications = db.relationship('JobApplication', backref='user', lazy=True, cascade='all, delete-orphan')
 
     def set_password(self, password):
@@ -28,6 +34,18 @@ class JobApplication(db.Model):
     follow_up_date = db.Column(db.Date, nullable=True)
     notes = db.Column(db.Text)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # Microsecond precision on MySQL so back-to-back edits change the ETag
+    updated_at = db.Column(db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql'),
+                           nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Composite indexes for the hot query shapes: per-user lists sorted by
+    # date, per-user status counts, and the scheduler's follow-up scan
+    __table_args__ = (
+        db.Index('ix_job_application_user_date_applied', user_id, date_applied.desc()),
+        db.Index('ix_job_application_user_status', user_id, status),
+        db.Index('ix_job_application_follow_up_status', follow_up_date, status),
+        db.Index('ix_job_application_user_updated_at', user_id, updated_at),
+    )
 
     # Alias for compatibility
     @property
@@ -47,9 +65,61 @@ class JobApplication(db.Model):
             'date_applied': self.date_applied.isoformat() if self.date_applied else None,
             'follow_up_date': self.follow_up_date.isoformat() if self.follow_up_date else None,
             'notes': self.notes,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
 
 
+class ReminderLog(db.Model):
+    """
+    One row per reminder a run has claimed, so retried or concurrent runs
+    never send the same reminder twice (see app/reminder_log.py).
+    """
+    __tablename__ = 'reminder_log'
+
+    application_id = db.Column(db.Integer, db.ForeignKey('job_application.id', ondelete='CASCADE'), primary_key=True)
+    reminder_date = db.Column(db.Date, primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)  # daily, upcoming
+    status = db.Column(db.String(10), nullable=False, default='claimed')  # claimed, sent, failed
+    run_id = db.Column(db.String(32), nullable=False)
+    claimed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_reminder_log_reminder_date', reminder_date),
+    )
+
+
+class StatusChangeOutbox(db.Model):
+    """
+    Status changes waiting for their notification email, written in the same
+    transaction as the application update (see app/outbox.py).
+    """
+    __tablename__ = 'status_change_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('job_application.id', ondelete='CASCADE'), nullable=False)
+    old_status = db.Column(db.String(50))
+    new_status = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    claimed_by = db.Column(db.String(32))
+    claimed_until = db.Column(db.DateTime)
+
+
+
+class SchedulerLease(db.Model):
+    """
+    One row per embedded scheduler job; the worker that moves `slot` to the
+    current run time is the one that runs it (see app/embedded_scheduler.py).
+    """
+    __tablename__ = 'scheduler_lease'
+
+    name = db.Column(db.String(64), primary_key=True)
+    slot = db.Column(db.DateTime)  # Scheduled time of the latest claimed run
+    owner = db.Column(db.String(64))
+    leased_until = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
 # Helper functions for backwards compatibility with routes
 # Alias JobApplication as Application for existing code
 Application = JobApplication
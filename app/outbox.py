@@ -0,0 +1,148 @@
+"""Transactional outbox for status change notifications"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from sqlalchemy import and_, delete, or_, select, update
+
+from . import db
+from .mailer import SMTPBatchSender
+from .models import JobApplication, StatusChangeOutbox, User
+
+logger = logging.getLogger(__name__)
+
+
+def record_status_change(application, old_status):
+    """
+    Queue a status change notification in the current transaction.
+
+    Adds an outbox row to db.session without committing: the row is saved by
+    the same commit as the application, or not at all. Nothing is sent here.
+
+    Args:
+        application: JobApplication whose status changed
+        old_status: Status before the change
+    """
+    db.session.add(StatusChangeOutbox(
+        application_id=application.id,
+        old_status=old_status,
+        new_status=application.status,
+    ))
+
+
+def _claim(batch_size, lease, max_attempts):
+    """Lease up to batch_size rows to this worker; expired leases are taken over."""
+    worker = uuid.uuid4().hex
+    now = datetime.utcnow()
+    available = and_(
+        StatusChangeOutbox.attempts < max_attempts,
+        or_(StatusChangeOutbox.claimed_until.is_(None), StatusChangeOutbox.claimed_until < now),
+    )
+    ids = db.session.scalars(
+        select(StatusChangeOutbox.id).where(available).order_by(StatusChangeOutbox.id).limit(batch_size)
+    ).all()
+    if not ids:
+        return worker, 0, []
+
+    # Conditional update: of two workers that picked the same rows, only one gets each
+    claimed = db.session.execute(
+        update(StatusChangeOutbox).where(StatusChangeOutbox.id.in_(ids), available)
+        .values(claimed_by=worker, claimed_until=now + timedelta(seconds=lease))
+    ).rowcount
+    db.session.commit()
+    rows = db.session.query(StatusChangeOutbox, JobApplication, User).join(
+        JobApplication, JobApplication.id == StatusChangeOutbox.application_id
+    ).join(User, User.id == JobApplication.user_id).filter(
+        StatusChangeOutbox.claimed_by == worker
+    ).order_by(StatusChangeOutbox.application_id, StatusChangeOutbox.id).all()
+    return worker, claimed, rows
+
+
+def drain_outbox(batch_size=100, lease=300, max_attempts=5):
+    """
+    Send notifications for one batch of outbox rows.
+
+    Rows are leased for `lease` seconds before sending, so a worker that dies
+    mid-batch only delays its rows until the lease runs out. Several changes
+    to one application are combined into a single email (first old status to
+    last new status), or none if they cancel out. All emails of the batch
+    share one SMTP connection. Delivered rows are deleted. Failed rows are
+    retried once another lease period has passed, until they have failed
+    max_attempts times. A crash between sending and deleting means a
+    notification can be sent twice, never that it is lost.
+
+    Must be called inside an application context.
+
+    Args:
+        batch_size: Outbox rows claimed per call
+        lease: Seconds a claimed row stays reserved for this worker
+        max_attempts: Failed deliveries after which a row is left alone
+
+    Returns:
+        dict: Counts of rows claimed, emails sent, rows failed and changes skipped
+    """
+    # app.email needs the module-level app, which does not exist yet while
+    # create_app() imports the routes that use record_status_change
+    from .email import status_change_message
+
+    worker, claimed, rows = _claim(batch_size, lease, max_attempts)
+    summary = {'claimed': claimed, 'sent': 0, 'failed': 0, 'skipped': 0}
+    if not claimed:
+        return summary
+
+    failed = []
+    with SMTPBatchSender() as sender:
+        for _, group in groupby(rows, key=lambda row: row[0].application_id):
+            group = list(group)
+            ids = [entry.id for entry, _, _ in group]
+            _, application, user = group[0]
+            old_status, new_status = group[0][0].old_status, group[-1][0].new_status
+            if old_status == new_status:
+                summary['skipped'] += len(ids)
+                continue
+            try:
+                delivered = bool(user.email) and sender.send(
+                    status_change_message(user, application, old_status, new_status)
+                )
+            except Exception as e:
+                # e.g. a template error: count an attempt so the row gives up eventually
+                logger.error("Status change notification for application %s failed: %s", application.id, e)
+                delivered = False
+            if delivered:
+                summary['sent'] += 1
+            else:
+                failed.extend(ids)
+
+    summary['failed'] = len(failed)
+    if failed:
+        db.session.execute(
+            update(StatusChangeOutbox).where(StatusChangeOutbox.id.in_(failed)).values(
+                attempts=StatusChangeOutbox.attempts + 1,
+                claimed_by=None,
+                claimed_until=datetime.utcnow() + timedelta(seconds=lease),
+            )
+        )
+        logger.warning("%s status change notifications failed; they will be retried", len(failed))
+    # Everything else this worker still holds was delivered, skipped, or
+    # belongs to an application that has been deleted
+    db.session.execute(delete(StatusChangeOutbox).where(StatusChangeOutbox.claimed_by == worker))
+    db.session.commit()
+    logger.info("Outbox drained: %s", summary)
+    return summary
+
+
+def drain_all(batch_size=100, lease=300, max_attempts=5):
+    """
+    Drain batches until the outbox has nothing left to claim.
+
+    Returns:
+        dict: Counts summed over all batches
+    """
+    totals = {'claimed': 0, 'sent': 0, 'failed': 0, 'skipped': 0}
+    while True:
+        summary = drain_outbox(batch_size, lease, max_attempts)
+        for key in totals:
+            totals[key] += summary[key]
+        if summary['claimed'] < batch_size:
+            return totals
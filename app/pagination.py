@@ -0,0 +1,178 @@
+"""Keyset (cursor) pagination for job application queries"""
+import base64
+import binascii
+import json
+from datetime import date
+
+from sqlalchemy import and_, or_, text
+
+from . import db
+from .models import JobApplication
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(app_obj, direction):
+    """
+    Build an opaque cursor pointing at an application row.
+
+    Args:
+        app_obj: JobApplication the cursor is anchored on
+        direction: 'next' (rows after app_obj) or 'prev' (rows before it)
+    """
+    payload = {
+        'd': app_obj.date_applied.isoformat() if app_obj.date_applied else None,
+        'i': app_obj.id,
+        'dir': direction,
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Returns:
+        tuple: (date_applied or None, id, direction)
+
+    Raises:
+        InvalidCursor: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        date_applied = date.fromisoformat(payload['d']) if payload['d'] else None
+        direction = payload['dir']
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return date_applied, int(payload['i']), direction
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {token!r}') from e
+
+
+class KeysetPage:
+    """One page of results plus the cursors needed to move around it."""
+
+    def __init__(self, items, has_next, has_prev, total=None, total_approximate=False):
+        self.items = items
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.total = total
+        self.total_approximate = total_approximate
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.items[-1], 'next') if self.has_next and self.items else None
+
+    @property
+    def prev_cursor(self):
+        return encode_cursor(self.items[0], 'prev') if self.has_prev and self.items else None
+
+
+def _after(date_applied, app_id):
+    """Rows that sort after (date_applied, id) in list order."""
+    col = JobApplication.date_applied
+    if date_applied is None:
+        return and_(col.is_(None), JobApplication.id > app_id)
+    return or_(
+        col < date_applied,
+        and_(col == date_applied, JobApplication.id > app_id),
+        col.is_(None),
+    )
+
+
+def _before(date_applied, app_id):
+    """Rows that sort before (date_applied, id) in list order."""
+    col = JobApplication.date_applied
+    if date_applied is None:
+        return or_(col.isnot(None), and_(col.is_(None), JobApplication.id < app_id))
+    return or_(
+        col > date_applied,
+        and_(col == date_applied, JobApplication.id < app_id),
+    )
+
+
+def paginate_keyset(query, cursor=None, per_page=10, total=None):
+    """
+    Paginate an application query on (date_applied DESC, id ASC).
+
+    This matches the (user_id, date_applied DESC) index order, so each page is
+    an index range scan regardless of how deep the user pages. NULL dates sort
+    last, as they do by default on SQLite and MySQL.
+
+    Args:
+        query: JobApplication query, already filtered (not ordered)
+        cursor: Opaque token from a previous page, or None for the first page
+        per_page: Number of rows per page
+        total: None for no total, 'approx' for an estimate, 'exact' for COUNT(*).
+            Where no estimate is available, 'approx' counts exactly on the
+            first page only and leaves later pages without a total.
+
+    Returns:
+        KeysetPage
+
+    Raises:
+        InvalidCursor: If cursor is malformed
+    """
+    filtered = query
+    direction = 'next'
+    if cursor:
+        date_applied, app_id, direction = decode_cursor(cursor)
+        if direction == 'next':
+            query = query.filter(_after(date_applied, app_id))
+        else:
+            query = query.filter(_before(date_applied, app_id))
+
+    if direction == 'next':
+        query = query.order_by(JobApplication.date_applied.desc(), JobApplication.id.asc())
+    else:
+        query = query.order_by(JobApplication.date_applied.asc(), JobApplication.id.desc())
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+
+    if direction == 'next':
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        items.reverse()
+        has_next, has_prev = True, has_more
+
+    page_total, approximate = None, False
+    if total:
+        if not has_next and not has_prev:
+            # The whole result set fits on this page
+            page_total = len(items)
+        elif total == 'exact':
+            page_total = filtered.order_by(None).count()
+        else:
+            page_total = estimate_count(filtered)
+            approximate = page_total is not None
+            if page_total is None and cursor is None:
+                page_total = filtered.order_by(None).count()
+
+    return KeysetPage(items, has_next, has_prev, page_total, approximate)
+
+
+def estimate_count(query):
+    """
+    Estimate the number of rows a query returns without a full COUNT(*).
+
+    MySQL exposes the optimizer's row estimate through EXPLAIN, which is read
+    from index statistics in constant time. Other dialects have no cheap
+    estimate.
+
+    Returns:
+        int or None: The estimate, or None if the dialect cannot provide one
+    """
+    if db.engine.dialect.name != 'mysql':
+        return None
+    stmt = query.order_by(None).statement
+    compiled = stmt.compile(db.engine, compile_kwargs={'literal_binds': True})
+    plan = db.session.execute(text(f'EXPLAIN {compiled}')).mappings().all()
+    if plan and plan[0].get('rows') is not None:
+        return int(plan[0]['rows'])
+    return None
@@ -0,0 +1,115 @@
+"""Reminder ledger: each (application, date, kind) is claimed by one run before sending"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from . import db
+from .models import ReminderLog
+
+# Claims not marked sent/failed after this long belong to a run that died
+DEFAULT_CLAIM_TIMEOUT = 900  # Seconds
+
+
+def _insert_or_skip(dialect_name):
+    """INSERT that silently skips rows whose key is already in the ledger."""
+    table = ReminderLog.__table__
+    if dialect_name == 'mysql':
+        stmt = mysql.insert(table)
+        # No-op assignment: unlike INSERT IGNORE, other errors still raise
+        return stmt.on_duplicate_key_update(kind=table.c.kind)
+    if dialect_name == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return sqlite.insert(table).on_conflict_do_nothing()
+
+
+def _keys(application_ids, reminder_date, kind):
+    return and_(
+        ReminderLog.application_id.in_(application_ids),
+        ReminderLog.reminder_date == reminder_date,
+        ReminderLog.kind == kind,
+    )
+
+
+def claim_reminders(application_ids, reminder_date, kind, run_id, claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+    """
+    Claim reminders for this run; reminders another run already has are skipped.
+
+    Three statements per call however many IDs are passed: a bulk
+    insert-or-skip, an UPDATE taking over failed sends and claims abandoned
+    for claim_timeout seconds, and a SELECT of what this run now holds. They
+    run on their own connection and commit at once, so other runs see the
+    claims immediately.
+
+    Args:
+        application_ids: Applications about to be reminded
+        reminder_date: Date of the run
+        kind: Run type, e.g. 'daily' or 'upcoming'
+        run_id: Unique ID of this run
+        claim_timeout: Seconds after which an unfinished claim may be taken over
+
+    Returns:
+        set: IDs of the applications this run should send reminders for
+    """
+    if not application_ids:
+        return set()
+    now = datetime.utcnow()
+    rows = [
+        {'application_id': application_id, 'reminder_date': reminder_date, 'kind': kind,
+         'status': 'claimed', 'run_id': run_id, 'claimed_at': now}
+        for application_id in application_ids
+    ]
+    keys = _keys(application_ids, reminder_date, kind)
+    with db.engine.begin() as connection:
+        connection.execute(_insert_or_skip(connection.dialect.name), rows)
+        connection.execute(
+            update(ReminderLog).where(
+                keys,
+                ReminderLog.run_id != run_id,
+                or_(
+                    ReminderLog.status == 'failed',
+                    and_(ReminderLog.status == 'claimed',
+                         ReminderLog.claimed_at < now - timedelta(seconds=claim_timeout)),
+                )
+            ).values(status='claimed', run_id=run_id, claimed_at=now)
+        )
+        claimed = connection.scalars(
+            select(ReminderLog.application_id).where(
+                keys, ReminderLog.run_id == run_id, ReminderLog.status == 'claimed'
+            )
+        )
+        return set(claimed)
+
+
+def record_results(sent_ids, failed_ids, reminder_date, kind, run_id):
+    """
+    Mark this run's claims as sent or failed (failed ones are retried by the next run).
+
+    Args:
+        sent_ids: Applications whose reminder was sent
+        failed_ids: Applications whose reminder could not be sent
+        reminder_date: Date of the run
+        kind: Run type, e.g. 'daily' or 'upcoming'
+        run_id: Unique ID of this run
+    """
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        for application_ids, values in ((sent_ids, {'status': 'sent', 'sent_at': now}),
+                                        (failed_ids, {'status': 'failed'})):
+            if application_ids:
+                connection.execute(
+                    update(ReminderLog).where(
+                        _keys(application_ids, reminder_date, kind), ReminderLog.run_id == run_id
+                    ).values(**values)
+                )
+
+
+def prune_reminder_log(before):
+    """
+    Delete ledger rows for reminder dates before a date.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    with db.engine.begin() as connection:
+        return connection.execute(delete(ReminderLog).where(ReminderLog.reminder_date < before)).rowcount
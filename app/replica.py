@@ -0,0 +1,125 @@
+"""Route reads of selected GET views to a read replica"""
+import os
+import time
+import weakref
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+
+
+class RoutingSession(Session):
+    """
+    db.session class that binds reads to the replica engine when the current
+    request asked for it (see use_replica). Flushes and INSERT/UPDATE/DELETE
+    statements always go to the primary, and are remembered so the commit
+    can make the user sticky to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info['wrote_primary'] = True
+            elif has_request_context() and g.get('use_replica'):
+                replica = current_app.extensions['read_replica'].engine
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_replica(view):
+    """
+    Let a GET view read from the replica.
+
+    Requests other than GET/HEAD, and requests from a user who committed a
+    write less than REPLICA_STICKY_SECONDS ago, still read from the primary
+    so users always see their own changes. Apply below @login_required so the
+    user is loaded from the primary.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if request.method in ('GET', 'HEAD') and not _sticky_to_primary():
+            g.use_replica = True
+        return view(*args, **kwargs)
+    return wrapped
+
+
+def _sticky_to_primary():
+    return session.get('_primary_until', 0) > time.time()
+
+
+class ReadReplica:
+    """
+    Optional read replica, configured with REPLICA_DATABASE_URI.
+
+    The replica engine gets the same pool options as the primary; views
+    decorated with use_replica read from it through RoutingSession. It is not
+    an SQLALCHEMY_BINDS entry, since no model is bound to it and a bind key
+    without models would break db.create_all().
+
+    After a request commits a write, the user's session cookie pins them to
+    the primary for REPLICA_STICKY_SECONDS, long enough for replication to
+    catch up. Without REPLICA_DATABASE_URI everything reads from the primary.
+
+    Initialise after configure_pool() so the pool options are known.
+    """
+
+    def __init__(self, app=None):
+        self.sticky_seconds = 10
+        self._app_engines = weakref.WeakKeyDictionary()
+        self._events_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['read_replica'] = self
+        previous = self._app_engines.pop(app, None)
+        if previous is not None:
+            previous.dispose()
+        url = app.config.get('REPLICA_DATABASE_URI')
+        if not url:
+            return
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', self.sticky_seconds)
+
+        url = make_url(url)
+        options = {}
+        if url.get_backend_name() == 'sqlite':
+            if url.database not in (None, '', ':memory:') and not os.path.isabs(url.database):
+                # Relative SQLite paths are in the instance folder, as for the primary
+                os.makedirs(app.instance_path, exist_ok=True)
+                url = url.set(database=os.path.join(app.instance_path, url.database))
+        else:
+            options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        self._app_engines[app] = create_engine(url, **options)
+
+        app.after_request(self._after_request)
+        self._register_events()
+
+    @property
+    def engine(self):
+        """The current app's replica engine, or None without a replica."""
+        return self._app_engines.get(current_app._get_current_object())
+
+    def _register_events(self):
+        if self._events_registered:
+            return
+        event.listen(RoutingSession, 'after_commit', self._after_commit)
+        event.listen(RoutingSession, 'after_soft_rollback', self._after_rollback)
+        self._events_registered = True
+
+    @staticmethod
+    def _after_commit(db_session):
+        if db_session.info.pop('wrote_primary', False) and has_request_context():
+            g.wrote_primary = True
+
+    @staticmethod
+    def _after_rollback(db_session, previous_transaction):
+        db_session.info.pop('wrote_primary', None)
+
+    def _after_request(self, response):
+        if g.pop('wrote_primary', False):
+            session['_primary_until'] = time.time() + self.sticky_seconds
+        return response
@@ -1,8 +1,14 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, make_response
 from flask_login import login_required, current_user
 from . import db
 from .models import JobApplication, User
 from .forms import ApplicationForm
+from .stats import get_application_stats
+from .pagination import paginate_keyset, InvalidCursor
+from .search import apply_search
+from .conditional import applications_etag, is_not_modified, not_modified, add_validators
+from .replica import use_replica
+from .outbox import record_status_change
 
 # Create main blueprint
 main_bp = Blueprint('main', __name__)
@@ -16,6 +22,7 @@ def index():
 
 @main_bp.route('/dashboard')
 @login_required
+@use_replica
 def dashboard():
     """Protected dashboard showing user's applications."""
     # Get applications for current user
@@ -23,51 +30,59 @@ def dashboard():
         JobApplication.date_applied.desc()
     ).limit(5).all()
     
-    # Calculate stats
-    total_apps = JobApplication.query.filter_by(user_id=current_user.id).count()
-    pending_apps = JobApplication.query.filter_by(user_id=current_user.id, status='Applied').count()
-    interview_apps = JobApplication.query.filter_by(user_id=current_user.id, status='Interview').count()
+    # Calculate stats (single GROUP BY query)
+    stats = get_application_stats(current_user.id)
     
     return render_template('dashboard.html', 
                          applications=applications,
-                         total_apps=total_apps,
-                         pending_apps=pending_apps,
-                         interview_apps=interview_apps)
+                         stats=stats,
+                         total_apps=stats['total'],
+                         pending_apps=stats['by_status']['Applied'],
+                         interview_apps=stats['by_status']['Interview'])
 
 
 @main_bp.route('/applications')
 @login_required
+@use_replica
 def applications_list():
-    """List all applications for current user with pagination and search."""
-    # Get page number from query string (default to 1)
-    page = request.args.get('page', 1, type=int)
+    """List all applications for current user with cursor pagination and search."""
+    # Get cursor from query string (absent on the first page)
+    cursor = request.args.get('cursor') or None
     
     # Get search parameters
     q_company = request.args.get('company', '').strip()
     q_status = request.args.get('status', '').strip()
     
+    # Unchanged collection: answer 304 without loading any rows. The page
+    # header shows the user's name, so it is part of the tag too.
+    etag, last_modified = applications_etag(current_user.id, current_user.name)
+    if is_not_modified(etag):
+        return not_modified(etag, last_modified)
+    
     # Base query filtered by current user
     query = JobApplication.query.filter_by(user_id=current_user.id)
     
-    # Apply company search filter if provided
+    # Full-text search over company, position and notes (the parameter keeps
+    # its old name so existing links still work)
     if q_company:
-        query = query.filter(JobApplication.company.ilike(f'%{q_company}%'))
+        query = apply_search(query, q_company, current_user.id)
     
     # Apply status filter if provided
     if q_status:
         query = query.filter(JobApplication.status == q_status)
     
     # Paginate results (10 per page) ordered by date applied descending
-    pagination = query.order_by(JobApplication.date_applied.desc()).paginate(
-        page=page, 
-        per_page=10, 
-        error_out=False
-    )
+    try:
+        pagination = paginate_keyset(query, cursor=cursor, per_page=10, total='approx')
+    except InvalidCursor:
+        current_app.logger.warning('Invalid pagination cursor from user %s', current_user.email)
+        return redirect(url_for('main.applications_list', company=q_company, status=q_status))
     
-    return render_template('applications/list.html', 
-                         pagination=pagination, 
-                         q_company=q_company,
-                         q_status=q_status)
+    response = make_response(render_template('applications/list.html', 
+                                             pagination=pagination, 
+                                             q_company=q_company,
+                                             q_status=q_status))
+    return add_validators(response, etag, last_modified)
 
 
 @main_bp.route('/applications/new', methods=['GET', 'POST'])
@@ -88,7 +103,7 @@ def new_application():
         db.session.add(app_obj)
         db.session.commit()
         
-        current_app.logger.info(f'User {current_user.email} created application for {app_obj.company}')
+        current_app.logger.info('User %s created application for %s', current_user.email, app_obj.company)
         flash('Application added successfully!', 'success')
         return redirect(url_for('main.applications_list'))
     return render_template('applications/edit.html', form=form, application=None)
@@ -104,11 +119,14 @@ def edit_application(app_id):
     if form.validate_on_submit():
         old_status = app_obj.status
         form.populate_obj(app_obj)
+        if old_status != app_obj.status:
+            # Committed with the update; the outbox drainer sends the email
+            record_status_change(app_obj, old_status)
         db.session.commit()
         
-        current_app.logger.info(f'User {current_user.email} updated application {app_id} for {app_obj.company}')
+        current_app.logger.info('User %s updated application %s for %s', current_user.email, app_id, app_obj.company)
         if old_status != app_obj.status:
-            current_app.logger.info(f'Application {app_id} status changed: {old_status} -> {app_obj.status}')
+            current_app.logger.info('Application %s status changed: %s -> %s', app_id, old_status, app_obj.status)
         
         flash('Application updated successfully!', 'success')
         return redirect(url_for('main.applications_list'))
@@ -125,6 +143,6 @@ def delete_application(app_id):
     db.session.delete(app_obj)
     db.session.commit()
     
-    current_app.logger.info(f'User {current_user.email} deleted application {app_id} for {company_name}')
+    current_app.logger.info('User %s deleted application %s for %s', current_user.email, app_id, company_name)
     flash('Application deleted successfully!', 'success')
     return redirect(url_for('main.applications_list'))
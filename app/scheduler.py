@@ -1,122 +1,414 @@
 """Background scheduler for sending follow-up reminders"""
 from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 from flask_mail import Message
 from . import mail, app, db
 from .models import JobApplication, User
+from .mailer import SMTPBatchSender
+from .email_templates import render_email
+from .metrics import record_reminder_run
+from .reminder_log import DEFAULT_CLAIM_TIMEOUT, claim_reminders, prune_reminder_log, record_results
 import logging
+import multiprocessing
+import time
+import uuid
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def send_followup_reminder(user, appn):
+def _deliver(msg, sender=None):
+    """Send a message over the batch sender's connection, or a new one."""
+    if sender is None:
+        mail.send(msg)
+    elif not sender.send(msg):
+        raise RuntimeError(f"SMTP delivery failed for '{msg.subject}'")
+
+
+def send_followup_reminder(user, appn, sender=None):
     """
     Send follow-up reminder email to user for a specific application.
     
     Args:
         user: User object
         appn: JobApplication object
+        sender: Optional SMTPBatchSender to reuse an open connection
     """
     try:
         msg = Message(
             subject=f"Follow-up reminder: {appn.company}",
             recipients=[user.email]
         )
+        msg.body, msg.html = render_email(
+            'followup_reminder', name=user.name or user.email, application=appn
+        )
         
-        # Plain text body
-        msg.body = f"""Hi {user.name or user.email},
-
-This is a reminder to follow up with {appn.company} about the {appn.position or 'position'} you applied for.
-
-Follow-up Date: {appn.follow_up_date.strftime('%B %d, %Y') if appn.follow_up_date else 'Today'}
-Application Status: {appn.status}
-Date Applied: {appn.date_applied.strftime('%B %d, %Y') if appn.date_applied else 'N/A'}
-
-{f'Notes: {appn.notes}' if appn.notes else ''}
+        _deliver(msg, sender)
+        logger.info("Sent follow-up reminder to %s for %s", user.email, appn.company)
+        return True
+        
+    except Exception as e:
+        logger.error("Failed to send reminder to %s: %s", user.email, e)
+        return False
 
-Good luck with your follow-up!
 
-Best regards,
-Job Application Tracker
-"""
-        
-        # HTML body
-        msg.html = f"""
-<html>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <h2 style="color: #0d6efd;">Follow-up Reminder</h2>
-    <p>Hi {user.name or user.email},</p>
-    <p>This is a reminder to follow up with <strong>{appn.company}</strong> about the <strong>{appn.position or 'position'}</strong> you applied for.</p>
-    
-    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid #0d6efd; margin: 20px 0;">
-        <p><strong>Follow-up Date:</strong> {appn.follow_up_date.strftime('%B %d, %Y') if appn.follow_up_date else 'Today'}</p>
-        <p><strong>Application Status:</strong> <span style="padding: 3px 8px; background-color: #0dcaf0; color: white; border-radius: 3px;">{appn.status}</span></p>
-        <p><strong>Date Applied:</strong> {appn.date_applied.strftime('%B %d, %Y') if appn.date_applied else 'N/A'}</p>
-        {f'<p><strong>Notes:</strong> {appn.notes}</p>' if appn.notes else ''}
-    </div>
-    
-    <p>Good luck with your follow-up!</p>
-    
-    <p>Best regards,<br>
-    Job Application Tracker</p>
-</body>
-</html>
-"""
+def send_reminder_digest(user, applications, sender=None):
+    """
+    Send one email listing every follow-up due for a user.
+    
+    Args:
+        user: User object
+        applications: List of JobApplication objects due for follow-up
+        sender: Optional SMTPBatchSender to reuse an open connection
+    """
+    try:
+        msg = Message(
+            subject=f"Follow-up reminders: {len(applications)} applications",
+            recipients=[user.email]
+        )
+        msg.body, msg.html = render_email(
+            'reminder_digest', name=user.name or user.email, applications=applications
+        )
         
-        mail.send(msg)
-        logger.info(f"Sent follow-up reminder to {user.email} for {appn.company}")
+        _deliver(msg, sender)
+        logger.info("Sent reminder digest to %s for %s applications", user.email, len(applications))
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send reminder to {user.email}: {str(e)}")
+        logger.error("Failed to send reminder digest to %s: %s", user.email, e)
         return False
 
 
-def send_daily_reminders():
+# Statuses that still warrant a follow-up
+REMINDER_STATUSES = ['Applied', 'Interview']
+
+
+# Counted fields of a reminder summary, added up when shards are merged
+SUMMARY_COUNTS = ('total_applications', 'sent', 'failed', 'emails', 'skipped')
+
+
+def parse_shard(value):
+    """
+    Parse a 1-based "N/M" shard spec (e.g. "2/4").
+
+    Returns:
+        tuple: (index, count) with a 0-based index
+    """
+    try:
+        number, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like N/M, got '{value}'") from None
+    if count < 1 or not 1 <= number <= count:
+        raise ValueError(f"shard N/M needs 1 <= N <= M, got '{value}'")
+    return number - 1, count
+
+
+def _due_filter(start, end=None):
+    """Open applications with a follow-up date in [start, end]."""
+    if end is None or end == start:
+        date_filter = JobApplication.follow_up_date == start
+    else:
+        date_filter = JobApplication.follow_up_date.between(start, end)
+    return date_filter & JobApplication.status.in_(REMINDER_STATUSES)
+
+
+def due_user_ids(start, end=None, page_size=1000):
+    """
+    Yield IDs of users with reminders due in [start, end], in ascending order.
+
+    Keyset-paginated over the follow-up index, page_size IDs per query.
+    """
+    query = db.session.query(JobApplication.user_id).filter(_due_filter(start, end)).distinct()
+    after = None
+    while True:
+        page_query = query if after is None else query.filter(JobApplication.user_id > after)
+        page = [user_id for user_id, in page_query.order_by(JobApplication.user_id).limit(page_size)]
+        yield from page
+        if len(page) < page_size:
+            return
+        after = page[-1]
+
+
+def due_reminders(start, end=None, batch_size=500, shard=None, user_ids=None):
+    """
+    Stream (user, application) pairs with a follow-up date in [start, end].
+
+    Users and applications are loaded together with a single joined query
+    per page, so there is no per-application user lookup and memory stays
+    bounded however many reminders are due. Pages are keyset-paginated on
+    user ID and end on a user boundary, and no cursor stays open between
+    them, so the caller can write to the database while iterating.
+    
+    Args:
+        start: First follow-up date to include
+        end: Last follow-up date to include (defaults to start)
+        batch_size: Rows fetched per round trip
+        shard: Optional (index, count); only users with user_id % count == index
+        user_ids: Optional list of the only users to include
+    
+    Yields:
+        tuple: (User, JobApplication)
+    """
+    query = db.session.query(User, JobApplication).join(
+        JobApplication, JobApplication.user_id == User.id
+    ).filter(_due_filter(start, end))
+    if user_ids is not None:
+        query = query.filter(User.id.in_(user_ids))
+    if shard is not None and shard[1] > 1:
+        # Sharding by user keeps each user's reminders (and digest) in one shard
+        query = query.filter(User.id % shard[1] == shard[0])
+
+    after_user = None
+    while True:
+        page_query = query if after_user is None else query.filter(User.id > after_user)
+        page = page_query.order_by(User.id, JobApplication.id).limit(batch_size).all()
+        if len(page) < batch_size:
+            yield from page
+            return
+
+        # The last user may continue on the next page: hold their rows back
+        last_user = page[-1][0].id
+        complete = [pair for pair in page if pair[0].id != last_user]
+        if complete:
+            yield from complete
+            after_user = complete[-1][0].id
+            continue
+
+        # One user fills the whole page: page through their applications
+        yield from page
+        while len(page) == batch_size:
+            page = query.filter(
+                User.id == last_user, JobApplication.id > page[-1][1].id
+            ).order_by(JobApplication.id).limit(batch_size).all()
+            yield from page
+        after_user = last_user
+
+
+def _user_batches(pairs, batch_size):
+    """Group user-ordered pairs into lists of (user, applications) of about batch_size applications."""
+    batch, size = [], 0
+    for _, group in groupby(pairs, key=lambda pair: pair[0].id):
+        group = list(group)
+        batch.append((group[0][0], [appn for _, appn in group]))
+        size += len(group)
+        if size >= batch_size:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def _send_reminders(pairs, kind, reminder_date, batch_size=500, run_id=None, rate_limit=None):
+    """
+    Send reminders for (user, application) pairs and count the outcomes.
+    
+    Pairs must be ordered by user. Users who opted into digests get one email
+    covering all their due applications; others get one email per application.
+    
+    Every batch of applications is first claimed in the reminder ledger, and
+    only reminders this run claimed are sent, so a retried run (or one running
+    at the same time) skips what was already sent. Reminders that failed are
+    retried by the next run. Passing the run_id of an earlier attempt that
+    crashed picks up the reminders it claimed but never sent.
+    
+    Args:
+        pairs: (user, application) pairs ordered by user
+        kind: Run type, e.g. 'daily' or 'upcoming'
+        reminder_date: Date recorded in the ledger
+        batch_size: Applications claimed per ledger round trip
+        run_id: Ledger run ID (a new one by default)
+        rate_limit: Maximum emails per minute, or None
+    
+    Returns:
+        tuple: (applications, reminders sent, reminders failed, emails sent, skipped)
+    """
+    total_count = 0
+    sent_count = 0
+    failed_count = 0
+    email_count = 0
+    skipped_count = 0
+    run_id = run_id or uuid.uuid4().hex
+    claim_timeout = app.config.get('REMINDER_CLAIM_TIMEOUT', DEFAULT_CLAIM_TIMEOUT)
+    
+    # One SMTP connection (recycled periodically) for the whole run
+    with SMTPBatchSender(rate_limit=rate_limit) as sender:
+        for batch in _user_batches(pairs, batch_size):
+            claimed = claim_reminders([appn.id for _, applications in batch for appn in applications],
+                                      reminder_date, kind, run_id, claim_timeout)
+            sent_ids, failed_ids = [], []
+            
+            for user, applications in batch:
+                due_count = len(applications)
+                applications = [appn for appn in applications if appn.id in claimed]
+                skipped_count += due_count - len(applications)
+                if not applications:
+                    continue
+                total_count += len(applications)
+                
+                if not user.email:
+                    logger.warning("No email for user %s (%s applications)", user.id, len(applications))
+                    failed_ids.extend(appn.id for appn in applications)
+                elif user.reminder_digest and len(applications) > 1:
+                    if send_reminder_digest(user, applications, sender=sender):
+                        sent_ids.extend(appn.id for appn in applications)
+                        email_count += 1
+                    else:
+                        failed_ids.extend(appn.id for appn in applications)
+                else:
+                    for appn in applications:
+                        if send_followup_reminder(user, appn, sender=sender):
+                            sent_ids.append(appn.id)
+                            email_count += 1
+                        else:
+                            failed_ids.append(appn.id)
+            
+            record_results(sent_ids, failed_ids, reminder_date, kind, run_id)
+            sent_count += len(sent_ids)
+            failed_count += len(failed_ids)
+    
+    return total_count, sent_count, failed_count, email_count, skipped_count
+
+
+def _summary(counts, start, end=None):
+    """Summary dict for the counts returned by _send_reminders."""
+    if end is None:
+        summary = {'date': start.strftime('%Y-%m-%d')}
+    else:
+        summary = {'date_range': f"{start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}"}
+    summary.update(zip(SUMMARY_COUNTS, counts))
+    return summary
+
+
+def prune_expired_reminder_log(today):
+    """
+    Delete ledger rows older than REMINDER_LOG_RETENTION_DAYS (0 keeps them).
+
+    Ledger rows are only needed while a run for that date can be retried.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    retention = app.config.get('REMINDER_LOG_RETENTION_DAYS', 30)
+    if not retention:
+        return 0
+    return prune_reminder_log(today - timedelta(days=retention))
+
+
+def send_reminders_for_users(user_ids, kind, start, end=None, run_id=None, rate_limit=None):
+    """
+    Send the reminders due in [start, end] for some users (one fan-out chunk).
+
+    Claims go through the reminder ledger like a full run, so a chunk that is
+    retried or delivered twice skips what it already sent. Retries must pass
+    the same run_id to take back the claims of the attempt that failed.
+    Metrics are left to whoever merges the chunk summaries.
+    
+    Args:
+        user_ids: Users to cover
+        kind: Run type, e.g. 'daily' or 'upcoming'
+        start: First follow-up date to include (also the ledger date)
+        end: Last follow-up date to include (defaults to start)
+        run_id: Ledger run ID, stable across retries of the chunk
+        rate_limit: Maximum emails per minute for this chunk, or None
+    
+    Returns:
+        dict: Summary in the shape of send_daily_reminders' (or
+        send_upcoming_reminders' when end is given)
+    """
+    with app.app_context():
+        counts = _send_reminders(due_reminders(start, end, user_ids=user_ids), kind, start,
+                                 run_id=run_id, rate_limit=rate_limit)
+        return _summary(counts, start, end)
+
+
+def send_daily_reminders(shard=None):
     """
     Check for applications with follow-up dates today and send reminders.
     This function should be called daily by a scheduler.
     
+    Args:
+        shard: Optional (index, count) to only cover that share of the users
+    
     Returns:
         dict: Summary of reminders sent
     """
     with app.app_context():
+        started = time.perf_counter()
         today = date.today()
         
         # Find applications with follow-up date = today
         # Only send for Applied and Interview statuses
-        applications = JobApplication.query.filter(
-            JobApplication.follow_up_date == today,
-            JobApplication.status.in_(['Applied', 'Interview'])
-        ).all()
-        
-        sent_count = 0
-        failed_count = 0
-        
-        logger.info(f"Found {len(applications)} applications needing follow-up reminders")
-        
-        for appn in applications:
-            user = User.query.get(appn.user_id)
-            if user and user.email:
-                if send_followup_reminder(user, appn):
-                    sent_count += 1
-                else:
-                    failed_count += 1
-            else:
-                logger.warning(f"No user found for application {appn.id}")
-                failed_count += 1
+        summary = _summary(_send_reminders(due_reminders(today, shard=shard), 'daily', today), today)
         
-        summary = {
-            'date': today.strftime('%Y-%m-%d'),
-            'total_applications': len(applications),
-            'sent': sent_count,
-            'failed': failed_count
-        }
+        prune_expired_reminder_log(today)
         
-        logger.info(f"Reminder summary: {summary}")
+        if shard is not None:
+            logger.info("Reminder summary for shard %s/%s: %s", shard[0] + 1, shard[1], summary)
+        else:
+            logger.info("Reminder summary: %s", summary)
+        record_reminder_run('daily', summary, time.perf_counter() - started)
         return summary
 
 
+def merge_summaries(summaries):
+    """
+    Add up reminder summaries from several shards.
+    
+    Returns:
+        dict: One summary in the shape of a single run's
+    """
+    merged = dict(summaries[0])
+    for key in SUMMARY_COUNTS:
+        merged[key] = sum(summary[key] for summary in summaries)
+    return merged
+
+
+def send_daily_reminders_sharded(shard=(0, 1), processes=1):
+    """
+    Send today's reminders for one shard, split over a pool of processes.
+    
+    Shard (index, count) with P processes runs sub-shards index + count * k
+    of count * P for k in range(P): together they cover exactly the users
+    with user_id % count == index. Each process streams its own users and
+    uses its own SMTP connection.
+    
+    Args:
+        shard: (index, count) share of the users this run covers
+        processes: Worker processes to fan out to
+    
+    Returns:
+        dict: Merged summary of every sub-shard
+    
+    Raises:
+        RuntimeError: If any sub-shard failed (after the others finished)
+    """
+    index, count = shard
+    if processes <= 1:
+        return send_daily_reminders(shard=shard if count > 1 else None)
+
+    sub_shards = [(index + count * k, count * processes) for k in range(processes)]
+    # Spawned workers create their own app and engine instead of sharing the
+    # parent's pooled connections
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = [pool.submit(send_daily_reminders, sub_shard) for sub_shard in sub_shards]
+
+    summaries, errors = [], []
+    for sub_shard, future in zip(sub_shards, futures):
+        try:
+            summaries.append(future.result())
+        except Exception as e:
+            logger.error("Reminder shard %s/%s failed: %s", sub_shard[0] + 1, sub_shard[1], e)
+            errors.append(e)
+
+    if errors:
+        if summaries:
+            logger.info("Partial reminder summary: %s", merge_summaries(summaries))
+        raise RuntimeError(f"{len(errors)} of {processes} reminder shards failed") from errors[0]
+    return merge_summaries(summaries)
+
+
 def send_upcoming_reminders(days_ahead=3):
     """
     Send reminders for applications with follow-up dates in the next N days.
@@ -128,39 +420,15 @@ def send_upcoming_reminders(days_ahead=3):
         dict: Summary of reminders sent
     """
     with app.app_context():
+        started = time.perf_counter()
         today = date.today()
         future_date = today + timedelta(days=days_ahead)
         
         # Find applications with follow-up dates in the next N days
-        applications = JobApplication.query.filter(
-            JobApplication.follow_up_date >= today,
-            JobApplication.follow_up_date <= future_date,
-            JobApplication.status.in_(['Applied', 'Interview'])
-        ).all()
-        
-        sent_count = 0
-        failed_count = 0
-        
-        logger.info(f"Found {len(applications)} applications with upcoming follow-ups")
-        
-        for appn in applications:
-            user = User.query.get(appn.user_id)
-            if user and user.email:
-                if send_followup_reminder(user, appn):
-                    sent_count += 1
-                else:
-                    failed_count += 1
-            else:
-                failed_count += 1
-        
-        summary = {
-            'date_range': f"{today.strftime('%Y-%m-%d')} to {future_date.strftime('%Y-%m-%d')}",
-            'total_applications': len(applications),
-            'sent': sent_count,
-            'failed': failed_count
-        }
+        summary = _summary(_send_reminders(due_reminders(today, future_date), 'upcoming', today), today, future_date)
         
-        logger.info(f"Upcoming reminder summary: {summary}")
+        logger.info("Upcoming reminder summary: %s", summary)
+        record_reminder_run('upcoming', summary, time.perf_counter() - started)
         return summary
 
 
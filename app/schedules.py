@@ -0,0 +1,83 @@
+"""Reminder job schedule shared by Celery beat and the embedded scheduler"""
+import calendar
+from datetime import datetime, timedelta
+
+# Cron fields use Celery's crontab() keywords, times are UTC
+REMINDER_SCHEDULE = {
+    'send-daily-reminders': {
+        'task': 'celery_tasks.send_daily_reminders_task',
+        'function': 'app.scheduler:send_daily_reminders',
+        'cron': {'hour': 9, 'minute': 0},  # Daily at 9:00 AM
+    },
+    'send-upcoming-reminders': {
+        'task': 'celery_tasks.send_upcoming_reminders_task',
+        'function': 'app.scheduler:send_upcoming_reminders',
+        'cron': {'hour': 8, 'minute': 0, 'day_of_week': 'monday'},  # Monday at 8:00 AM
+    },
+}
+
+_DAY_NAMES = {name.lower(): (index + 1) % 7 for index, name in enumerate(calendar.day_name)}
+_DAY_NAMES.update({name[:3]: number for name, number in _DAY_NAMES.items()})
+
+
+def _parse_field(value, low, high, names=None):
+    """Expand one crontab field ('*', '*/15', '1-5', 'mon,fri', 9) into a set of values."""
+    values = set()
+    for part in str(value).lower().split(','):
+        part, _, step = part.strip().partition('/')
+        if part == '*':
+            first, last = low, high
+        elif '-' in part:
+            first, last = (_parse_value(bound, names) for bound in part.split('-', 1))
+        else:
+            first = last = _parse_value(part, names)
+        if not low <= first <= last <= high:
+            raise ValueError(f"crontab value '{value}' outside {low}-{high}")
+        values.update(range(first, last + 1, int(step) if step else 1))
+    return values
+
+
+def _parse_value(value, names):
+    if names and value in names:
+        return names[value]
+    return int(value)
+
+
+class CronSchedule:
+    """
+    A Celery-style crontab (same keywords and defaults) evaluated in-process.
+
+    As in Celery, when both day_of_week and day_of_month are restricted a day
+    must match both.
+    """
+
+    def __init__(self, minute='*', hour='*', day_of_week='*', day_of_month='*', month_of_year='*'):
+        self.minutes = sorted(_parse_field(minute, 0, 59))
+        self.hours = sorted(_parse_field(hour, 0, 23))
+        self.days_of_week = _parse_field(day_of_week, 0, 6, _DAY_NAMES)
+        self.days_of_month = _parse_field(day_of_month, 1, 31)
+        self.months = _parse_field(month_of_year, 1, 12)
+
+    def _day_matches(self, day):
+        return (day.month in self.months
+                and day.day in self.days_of_month
+                and (day.weekday() + 1) % 7 in self.days_of_week)
+
+    def previous(self, moment, max_days=366):
+        """
+        Latest scheduled minute at or before moment.
+
+        Returns:
+            datetime: The scheduled time, or None if nothing matched within max_days
+        """
+        moment = moment.replace(second=0, microsecond=0)
+        day = datetime(moment.year, moment.month, moment.day)
+        for _ in range(max_days + 1):
+            if self._day_matches(day):
+                for hour in reversed(self.hours):
+                    for minute in reversed(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate <= moment:
+                            return candidate
+            day -= timedelta(days=1)
+        return None
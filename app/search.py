@@ -0,0 +1,217 @@
+"""Full-text search over application company, position and notes"""
+import re
+
+from sqlalchemy import DDL, event, literal_column, select, or_, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.sql import column, table
+
+from . import db
+from .models import JobApplication
+
+# Column weights for ranking: a company hit outranks a position hit, which
+# outranks a mention in the notes
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+FTS_TABLE = 'job_application_fts'
+
+# InnoDB's default innodb_ft_min_token_size: shorter words are never in a
+# FULLTEXT index, so MATCH cannot find them ("HP", "GE", "EY")
+MYSQL_MIN_TOKEN_SIZE = 3
+
+# Token identifying a row's owner in the MySQL FULLTEXT index; at least
+# MYSQL_MIN_TOKEN_SIZE characters even for single-digit ids
+MYSQL_OWNER_PREFIX = 'uid'
+
+# SQLite: an external-content FTS5 table over job_application, kept in sync
+# by triggers, so ORM writes, bulk Core writes and cascade deletes are all
+# covered. user_id is indexed too, so a query for one user's matches is an
+# intersection of two doclists instead of every user's matches filtered
+# afterwards. Alembic batch migrations on SQLite rebuild job_application and
+# drop these triggers; run rebuild_search_index() after such a migration.
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "company, position, notes, user_id, content='job_application', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, company, position, notes, user_id) "
+    "VALUES (new.id, new.company, new.position, new.notes, new.user_id); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes, user_id) "
+    "VALUES ('delete', old.id, old.company, old.position, old.notes, old.user_id); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF company, position, notes, user_id "
+    "ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes, user_id) "
+    "VALUES ('delete', old.id, old.company, old.position, old.notes, old.user_id); "
+    f"INSERT INTO {FTS_TABLE}(rowid, company, position, notes, user_id) "
+    "VALUES (new.id, new.company, new.position, new.notes, new.user_id); END",
+)
+
+# MySQL: InnoDB maintains FULLTEXT indexes itself on every write. FULLTEXT
+# cannot index an integer, so the owner is a stored generated column holding
+# 'uid<user_id>', indexed alongside the text. Neither is in the model; they
+# are left out of autogenerate in migrations/env.py.
+MYSQL_DDL = (
+    "ALTER TABLE job_application ADD COLUMN search_owner VARCHAR(32) "
+    f"AS (CONCAT('{MYSQL_OWNER_PREFIX}', user_id)) STORED",
+    "ALTER TABLE job_application ADD FULLTEXT INDEX ix_job_application_fulltext "
+    "(company, position, notes, search_owner)",
+)
+
+for statement in SQLITE_DDL:
+    event.listen(JobApplication.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in MYSQL_DDL:
+    event.listen(JobApplication.__table__, 'after_create', DDL(statement).execute_if(dialect='mysql'))
+event.listen(JobApplication.__table__, 'before_drop',
+             DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite'))
+
+_fts = table(FTS_TABLE, column('rowid'))
+
+
+def search_terms(q):
+    """Split free text into search words, dropping query-syntax characters."""
+    return re.findall(r'\w+', q or '')
+
+
+def _backend():
+    return db.engine.dialect.name
+
+
+def _fts5_query(terms, user_id):
+    # Every word must match, each one as a prefix ("eng" finds "engineer"),
+    # in the text columns of the user's own rows
+    words = ' AND '.join(f'"{term}"*' for term in terms)
+    return f'user_id:"{int(user_id)}" AND {{company position notes}}:({words})'
+
+
+def _like_any_column(term):
+    pattern = f'%{term}%'
+    return or_(
+        JobApplication.company.ilike(pattern),
+        JobApplication.position.ilike(pattern),
+        JobApplication.notes.ilike(pattern)
+    )
+
+
+def _mysql_owner(user_id):
+    return f'{MYSQL_OWNER_PREFIX}{int(user_id)}'
+
+
+def _mysql_split(terms, user_id):
+    """
+    Split terms into those the FULLTEXT index can match and those it cannot.
+
+    Words shorter than the minimum token size are not in the index. A word
+    that prefixes the owner token ("uid", "uid1") would match every one of
+    the user's rows through search_owner, so it is left to ILIKE as well.
+    """
+    owner = _mysql_owner(user_id)
+    indexed, short = [], []
+    for term in terms:
+        if len(term) < MYSQL_MIN_TOKEN_SIZE or owner.startswith(term.lower()):
+            short.append(term)
+        else:
+            indexed.append(term)
+    return indexed, short
+
+
+def _mysql_match(terms, user_id):
+    against = ' '.join([f'+{_mysql_owner(user_id)}'] + [f'+{term}*' for term in terms])
+    return match(JobApplication.company, JobApplication.position, JobApplication.notes,
+                 column('search_owner'), against=against).in_boolean_mode()
+
+
+def apply_search(query, q, user_id):
+    """
+    Restrict an application query to one user's rows matching q, keeping its ordering.
+
+    Used by the HTML list, which stays in date order so keyset pagination
+    keeps working. Dialects without a full-text index fall back to ILIKE
+    across the three columns, as do words MySQL's index is too short to hold.
+
+    Args:
+        query: JobApplication query to filter, already filtered to user_id
+        q: Free-text search string
+        user_id: ID of the user whose applications are searched
+
+    Returns:
+        Query: The filtered query (unchanged when q has no words)
+    """
+    terms = search_terms(q)
+    if not terms:
+        return query
+
+    backend = _backend()
+    if backend == 'sqlite':
+        matches = select(_fts.c.rowid).where(text(f'{FTS_TABLE} MATCH :terms'))
+        return query.filter(JobApplication.id.in_(matches)).params(terms=_fts5_query(terms, user_id))
+    if backend == 'mysql':
+        terms, short = _mysql_split(terms, user_id)
+        if terms:
+            query = query.filter(_mysql_match(terms, user_id))
+        for term in short:
+            query = query.filter(_like_any_column(term))
+        return query
+
+    for term in terms:
+        query = query.filter(_like_any_column(term))
+    return query
+
+
+def search_applications(user_id, q, limit=20):
+    """
+    Ranked full-text search over one user's applications.
+
+    SQLite ranks with bm25() weighted by SEARCH_WEIGHTS; MySQL uses the
+    natural MATCH ... AGAINST relevance (words shorter than the index's
+    minimum token size only filter, with ILIKE). Other dialects return ILIKE
+    matches newest first with a score of 0.
+
+    Args:
+        user_id: ID of the user whose applications are searched
+        q: Free-text search string
+        limit: Maximum number of results
+
+    Returns:
+        list: (JobApplication, score) tuples, best match first
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+
+    backend = _backend()
+    if backend == 'sqlite':
+        # bm25() is lower-is-better; negate it so higher scores rank first.
+        # The user_id column only scopes the match and does not score.
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS + (0.0,))
+        score = -literal_column(f'bm25({FTS_TABLE}, {weights})')
+        rows = db.session.query(JobApplication, score).join(
+            _fts, _fts.c.rowid == JobApplication.id
+        ).filter(
+            text(f'{FTS_TABLE} MATCH :terms'),
+            JobApplication.user_id == user_id
+        ).order_by(score.desc()).limit(limit).params(terms=_fts5_query(terms, user_id))
+        return [(app_obj, float(rank)) for app_obj, rank in rows]
+
+    if backend == 'mysql' and _mysql_split(terms, user_id)[0]:
+        indexed, short = _mysql_split(terms, user_id)
+        score = _mysql_match(indexed, user_id)
+        rows = db.session.query(JobApplication, score).filter(
+            score,
+            JobApplication.user_id == user_id,
+            *[_like_any_column(term) for term in short]
+        ).order_by(score.desc()).limit(limit)
+        return [(app_obj, float(rank)) for app_obj, rank in rows]
+
+    query = apply_search(JobApplication.query.filter_by(user_id=user_id), q, user_id)
+    rows = query.order_by(JobApplication.date_applied.desc(), JobApplication.id.asc()).limit(limit)
+    return [(app_obj, 0.0) for app_obj in rows]
+
+
+def rebuild_search_index():
+    """Repopulate the SQLite FTS table from job_application (no-op elsewhere)."""
+    if _backend() != 'sqlite':
+        return
+    with db.engine.begin() as connection:
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
@@ -0,0 +1,33 @@
+"""Aggregated application statistics for the dashboard and API"""
+from sqlalchemy import func
+from . import db
+from .models import JobApplication, STATUSES
+
+
+def get_application_stats(user_id):
+    """
+    Count a user's applications per status with a single GROUP BY query.
+
+    Every known status is present in the result (zero if unused); statuses
+    outside STATUSES are kept as-is so nothing is silently dropped.
+
+    Args:
+        user_id: ID of the user whose applications are counted
+
+    Returns:
+        dict: {'total': int, 'by_status': {status: count}}
+    """
+    rows = db.session.query(
+        JobApplication.status, func.count(JobApplication.id)
+    ).filter(
+        JobApplication.user_id == user_id
+    ).group_by(JobApplication.status).all()
+
+    by_status = {status: 0 for status in STATUSES}
+    for status, count in rows:
+        by_status[status or 'Unknown'] = by_status.get(status or 'Unknown', 0) + count
+
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status
+    }
@@ -0,0 +1,153 @@
+"""Cross-request cache for the Flask-Login user loader"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+logger = logging.getLogger(__name__)
+
+# Columns kept in the cache; password_hash is left out and loads on demand
+CACHED_COLUMNS = ('id', 'email', 'name', 'reminder_digest')
+
+
+class MemoryUserCache:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisUserCache:
+    """Cache shared by every worker through Redis (or any Redis-compatible server)."""
+
+    def __init__(self, url, prefix='user-cache:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(f'{self.prefix}{key}')
+        return json.loads(raw) if raw else None
+
+    def set(self, key, value, ttl):
+        self.client.set(f'{self.prefix}{key}', json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(f'{self.prefix}{key}')
+
+
+class UserCache:
+    """
+    Cache User rows behind the Flask-Login user loader.
+
+    Flask-Login already keeps the loaded user for the rest of a request; this
+    adds a cross-request layer so authenticated requests skip the user query.
+    Entries expire after USER_CACHE_TTL seconds and are evicted LRU beyond
+    USER_CACHE_MAX_SIZE. Updating or deleting a User invalidates its entry.
+
+    The backend is in-process by default. When USER_CACHE_REDIS_URL is set
+    (it defaults to a redis:// CELERY_BROKER_URL) entries are shared through
+    Redis, so invalidations reach every gunicorn worker.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryUserCache()
+        self.ttl = 60
+        self.enabled = True
+        self._events_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('USER_CACHE_ENABLED', True)
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        self.backend = MemoryUserCache(app.config.get('USER_CACHE_MAX_SIZE', 1024))
+
+        redis_url = app.config.get('USER_CACHE_REDIS_URL')
+        if redis_url and redis_url.startswith(('redis://', 'rediss://', 'unix://')):
+            try:
+                self.backend = RedisUserCache(redis_url)
+            except ImportError:
+                logger.warning("USER_CACHE_REDIS_URL is set but redis is not installed; using in-process cache")
+
+        app.extensions['user_cache'] = self
+        self._register_events()
+
+    def _register_events(self):
+        if self._events_registered:
+            return
+        from .models import User
+
+        def invalidate(mapper, connection, target):
+            self.invalidate(target.id)
+
+        event.listen(User, 'after_update', invalidate)
+        event.listen(User, 'after_delete', invalidate)
+        self._events_registered = True
+
+    def invalidate(self, user_id):
+        try:
+            self.backend.delete(str(user_id))
+        except Exception as e:
+            logger.warning("User cache invalidation failed for %s: %s", user_id, e)
+
+    def load(self, session, user_id):
+        """
+        Return the User for user_id, from the cache when possible.
+
+        Cached users are attached to the session with merge(load=False), which
+        emits no SQL; they behave like normally loaded instances.
+        """
+        from .models import User
+
+        if not self.enabled:
+            return session.get(User, user_id)
+
+        key = str(user_id)
+        try:
+            data = self.backend.get(key)
+        except Exception as e:
+            logger.warning("User cache read failed: %s", e)
+            data = None
+
+        if data is not None:
+            user = User(**data)
+            make_transient_to_detached(user)
+            return session.merge(user, load=False)
+
+        user = session.get(User, user_id)
+        if user is not None:
+            try:
+                self.backend.set(key, {column: getattr(user, column) for column in CACHED_COLUMNS}, self.ttl)
+            except Exception as e:
+                logger.warning("User cache write failed: %s", e)
+        return user
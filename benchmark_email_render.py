@@ -0,0 +1,73 @@
+"""
+Benchmark follow-up reminder rendering throughput.
+
+Compares Flask's render_template() per message with the precompiled
+templates in app.email_templates, rendered one at a time and through the
+batch API. Prints renders per second (text + HTML body per render).
+
+Usage:
+    python benchmark_email_render.py
+    python benchmark_email_render.py --renders 20000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import render_template  # noqa: E402
+
+from app import app  # noqa: E402
+from app.email_templates import render_email, render_email_batch  # noqa: E402
+from app.models import JobApplication, STATUSES  # noqa: E402
+
+
+def build_contexts(count):
+    today = date.today()
+    return [
+        {
+            'name': f'User {i}',
+            'application': JobApplication(
+                company=f'Company {i}',
+                position='Software Engineer',
+                status=STATUSES[i % len(STATUSES)],
+                date_applied=today - timedelta(days=14),
+                follow_up_date=today,
+                notes='Spoke with the recruiter' if i % 2 else None,
+            ),
+        }
+        for i in range(count)
+    ]
+
+
+def report(label, count, elapsed):
+    print(f"{label:<28} {count / elapsed:>12,.0f} renders/s ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--renders', type=int, default=10000)
+    args = parser.parse_args()
+
+    contexts = build_contexts(args.renders)
+    with app.test_request_context():
+        start = time.perf_counter()
+        for context in contexts:
+            render_template('email/followup_reminder.txt', **context)
+            render_template('email/followup_reminder.html', **context)
+        report('render_template per message', args.renders, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for context in contexts:
+            render_email('followup_reminder', **context)
+        report('precompiled, one at a time', args.renders, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        render_email_batch('followup_reminder', contexts)
+        report('precompiled, batch', args.renders, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark the job_application composite indexes on SQLite.
+
+Seeds a throwaway SQLite database with ~1M applications, then runs the hot
+query shapes (dashboard list, status counts, scheduler follow-up scan)
+without indexes and again after creating the indexes declared on
+JobApplication. Prints EXPLAIN QUERY PLAN output and timings for both runs.
+
+Usage:
+    python benchmark_indexes.py
+    python benchmark_indexes.py --rows 200000 --users 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app import db
+from app.models import JobApplication, STATUSES
+
+QUERIES = {
+    'dashboard list': (
+        "SELECT * FROM job_application WHERE user_id = :user_id "
+        "ORDER BY date_applied DESC LIMIT 10"
+    ),
+    'status counts': (
+        "SELECT status, COUNT(id) FROM job_application WHERE user_id = :user_id "
+        "GROUP BY status"
+    ),
+    'follow-up scan': (
+        "SELECT id, user_id FROM job_application WHERE follow_up_date = :today "
+        "AND status IN ('Applied', 'Interview')"
+    ),
+}
+
+
+def seed(engine, rows, users):
+    """Insert users and applications in large executemany batches."""
+    rng = random.Random(42)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO user (id, email, name) VALUES (:id, :email, :name)"),
+            [{'id': i, 'email': f'user{i}@example.com', 'name': f'User {i}'}
+             for i in range(1, users + 1)]
+        )
+        batch = []
+        for i in range(rows):
+            batch.append({
+                'company': f'Company {rng.randrange(5000)}',
+                'position': 'Engineer',
+                'status': rng.choice(STATUSES),
+                'date_applied': today - timedelta(days=rng.randrange(1500)),
+                'follow_up_date': today + timedelta(days=rng.randrange(-30, 30)),
+                'user_id': rng.randrange(1, users + 1),
+            })
+            if len(batch) == 50000:
+                conn.execute(JobApplication.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(JobApplication.__table__.insert(), batch)
+
+
+def run_queries(engine, label, user_id, repeat):
+    """Print the query plan and mean time for each benchmark query."""
+    params = {'user_id': user_id, 'today': date.today()}
+    print(f"\n--- {label} ---")
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            print(f"{name:<16} {elapsed:>10.3f} ms")
+            for row in plan:
+                print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        engine = create_engine(f'sqlite:///{path}')
+        table = JobApplication.__table__
+        indexes = list(table.indexes)
+
+        # Create tables without the declared indexes for the baseline run
+        table.indexes.clear()
+        db.metadata.create_all(engine)
+        table.indexes.update(indexes)
+
+        print(f"Seeding {args.rows:,} applications for {args.users:,} users...")
+        start = time.perf_counter()
+        seed(engine, args.rows, args.users)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+        user_id = args.users // 2
+        run_queries(engine, 'WITHOUT indexes', user_id, args.repeat)
+
+        start = time.perf_counter()
+        for index in indexes:
+            index.create(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"\nCreated {len(indexes)} indexes in {time.perf_counter() - start:.1f}s")
+
+        run_queries(engine, 'WITH indexes', user_id, args.repeat)
+        engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
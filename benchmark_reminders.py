@@ -0,0 +1,109 @@
+"""
+Benchmark reminder selection: per-application user lookup vs joined query.
+
+Seeds a throwaway SQLite database with due follow-ups, then runs the legacy
+selection loop (load applications, then User.query.get() per application)
+and the streaming joined query used by app.scheduler. Email sending is
+replaced with a no-op so only database work is measured. Prints the number
+of SQL statements and wall time for each.
+
+Usage:
+    python benchmark_reminders.py
+    python benchmark_reminders.py --reminders 20000 --users 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Point the app at a temporary database before it is imported
+fd, DB_PATH = tempfile.mkstemp(suffix='.db')
+os.close(fd)
+os.environ['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app import app, db  # noqa: E402
+from app.models import JobApplication, User  # noqa: E402
+from app.scheduler import REMINDER_STATUSES, due_reminders  # noqa: E402
+
+
+def seed(reminders, users):
+    """Insert users and due applications in large batches."""
+    rng = random.Random(42)
+    today = date.today()
+    db.session.execute(
+        text("INSERT INTO user (id, email, name) VALUES (:id, :email, :name)"),
+        [{'id': i, 'email': f'user{i}@example.com', 'name': f'User {i}'}
+         for i in range(1, users + 1)]
+    )
+    db.session.execute(JobApplication.__table__.insert(), [
+        {
+            'company': f'Company {i}',
+            'position': 'Engineer',
+            'status': rng.choice(REMINDER_STATUSES),
+            'date_applied': today,
+            'follow_up_date': today,
+            'user_id': rng.randrange(1, users + 1),
+        }
+        for i in range(reminders)
+    ])
+    db.session.commit()
+
+
+def legacy_selection(today):
+    """The original loop: load every application, then look up its user."""
+    applications = JobApplication.query.filter(
+        JobApplication.follow_up_date == today,
+        JobApplication.status.in_(REMINDER_STATUSES)
+    ).all()
+    for appn in applications:
+        user = db.session.get(User, appn.user_id)
+        yield user, appn
+
+
+def measure(label, pairs_factory):
+    """Consume the pairs, counting SQL statements and elapsed time."""
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    db.session.expunge_all()
+    event.listen(db.engine, 'before_cursor_execute', count)
+    start = time.perf_counter()
+    pairs = sum(1 for user, appn in pairs_factory() if user.email)
+    elapsed = time.perf_counter() - start
+    event.remove(db.engine, 'before_cursor_execute', count)
+    print(f"{label:<28} {pairs:>8,} pairs {statements:>8,} queries {elapsed:>8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reminders', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=20000)
+    args = parser.parse_args()
+
+    try:
+        with app.app_context():
+            db.create_all()
+            print(f"Seeding {args.reminders:,} due reminders for {args.users:,} users...")
+            seed(args.reminders, args.users)
+
+            today = date.today()
+            print()
+            measure('per-application user lookup', lambda: legacy_selection(today))
+            measure('joined streaming query', lambda: due_reminders(today))
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark application search on SQLite: leading-wildcard LIKE vs FTS5.
+
+Seeds a throwaway SQLite database (FTS table and sync triggers are created
+with the schema), gives one user a large account, then times the old
+company LIKE '%q%' filter, a LIKE across company/position/notes, the
+ranked FTS5 query used by /api/search and the date-ordered FTS5 filter used
+by the applications list. Both FTS5 queries are scoped to the user inside the
+index. The default query is a word most rows contain, which is the worst
+case for the index.
+
+Usage:
+    python benchmark_search.py
+    python benchmark_search.py --rows 1000000 --account 50000 --query "senior eng"
+    python benchmark_search.py --query Acme        # a rare word
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from app import db
+from app.models import JobApplication
+from app.search import FTS_TABLE, SEARCH_WEIGHTS, _fts5_query, search_terms
+
+POSITIONS = ['Engineer', 'Designer', 'Analyst', 'Manager', 'Developer', 'Scientist', 'Architect']
+
+
+def vocabulary(rng, size=20000):
+    """Random made-up words, so term frequencies look like real free text."""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randrange(4, 10))) for _ in range(size)]
+
+
+def seed(engine, rows, users, account):
+    """Insert users, then applications with one user owning `account` rows."""
+    rng = random.Random(42)
+    words = vocabulary(rng)
+    companies = words[:3000]
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO user (id, email, name) VALUES (:id, :email, :name)"),
+            [{'id': i, 'email': f'user{i}@example.com', 'name': f'User {i}'}
+             for i in range(1, users + 1)]
+        )
+        batch = []
+        for i in range(rows):
+            batch.append({
+                'company': f"{rng.choice(companies).title()} {rng.choice(['Inc', 'Labs', 'Corp'])}",
+                'position': f"{rng.choice(['Senior', 'Junior', 'Staff'])} {rng.choice(POSITIONS)}",
+                'notes': ' '.join(rng.choice(words) for _ in range(20)),
+                'status': 'Applied',
+                'user_id': 1 if i < account else rng.randrange(2, users + 1),
+            })
+            if len(batch) == 50000:
+                conn.execute(JobApplication.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(JobApplication.__table__.insert(), batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--account', type=int, default=20000, help='applications owned by the searched user')
+    parser.add_argument('--query', default='engineer', help='search text (default: a common position word)')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    query = args.query
+    terms = search_terms(query)
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS + (0.0,))
+    like_all = ' AND '.join(
+        f"(company LIKE :p{i} OR position LIKE :p{i} OR notes LIKE :p{i})" for i in range(len(terms))
+    )
+    queries = {
+        'company LIKE': (
+            "SELECT * FROM job_application WHERE user_id = 1 AND company LIKE :p0 "
+            "ORDER BY date_applied DESC LIMIT 20"
+        ),
+        'LIKE all columns': (
+            f"SELECT * FROM job_application WHERE user_id = 1 AND {like_all} "
+            "ORDER BY date_applied DESC LIMIT 20"
+        ),
+        'FTS5 ranked': (
+            f"SELECT job_application.*, bm25({FTS_TABLE}, {weights}) AS rank FROM job_application "
+            f"JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = job_application.id "
+            f"WHERE {FTS_TABLE} MATCH :match AND job_application.user_id = 1 ORDER BY rank LIMIT 20"
+        ),
+        'FTS5 date order': (
+            f"SELECT * FROM job_application WHERE user_id = 1 AND id IN "
+            f"(SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match) "
+            "ORDER BY date_applied DESC LIMIT 20"
+        ),
+    }
+    params = {f'p{i}': f'%{term}%' for i, term in enumerate(terms)}
+    params['match'] = _fts5_query(terms, 1)
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        engine = create_engine(f'sqlite:///{path}')
+        db.metadata.create_all(engine)
+
+        print(f"Seeding {args.rows:,} applications ({args.account:,} for the searched user)...")
+        start = time.perf_counter()
+        seed(engine, args.rows, args.users, args.account)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"Seeded in {time.perf_counter() - start:.1f}s\n\nQuery: {query!r}")
+
+        with engine.connect() as conn:
+            for name, sql in queries.items():
+                found = len(conn.execute(text(sql), params).fetchall())
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    conn.execute(text(sql), params).fetchall()
+                elapsed = (time.perf_counter() - start) / args.repeat * 1000
+                print(f"{name:<18} {elapsed:>10.3f} ms  ({found} rows)")
+        engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
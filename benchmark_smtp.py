@@ -0,0 +1,116 @@
+"""
+Benchmark SMTP delivery: one connection per message vs a reused connection.
+
+Starts a local stand-in SMTP server (stdlib socketserver; no aiosmtpd or
+smtpd needed) that accepts and discards mail. The server waits --handshake-ms
+before its greeting to model the TCP + STARTTLS + AUTH cost of a real
+provider. Sends --messages messages with mail.send() per message (the old
+path) and with SMTPBatchSender, then prints messages per second for each.
+
+Usage:
+    python benchmark_smtp.py
+    python benchmark_smtp.py --messages 1000 --handshake-ms 50
+"""
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask_mail import Message  # noqa: E402
+
+from app import create_app, mail  # noqa: E402
+from app.mailer import SMTPBatchSender  # noqa: E402
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages from smtplib."""
+
+    handshake_delay = 0.0
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        time.sleep(self.handshake_delay)
+        self.reply('220 localhost stand-in ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 end data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                # MAIL FROM, RCPT TO, RSET, NOOP
+                self.reply('250 ok')
+
+
+class ThreadedSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def build_messages(count):
+    return [
+        Message(f'Reminder {i}', recipients=[f'user{i}@example.com'],
+                body='Time to follow up!', html='<p>Time to follow up!</p>')
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--handshake-ms', type=float, default=30.0)
+    args = parser.parse_args()
+
+    SMTPStandInHandler.handshake_delay = args.handshake_ms / 1000
+    server = ThreadedSMTPServer(('127.0.0.1', 0), SMTPStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    app = create_app()
+    app.config.update({
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': server.server_address[1],
+        'MAIL_USE_TLS': False,
+        'MAIL_USERNAME': None,
+        'MAIL_PASSWORD': None,
+        'MAIL_DEFAULT_SENDER': 'tracker@example.com',
+        'MAIL_SUPPRESS_SEND': False,
+        'MAIL_DEBUG': False,
+    })
+    mail.init_app(app)
+
+    print(f"Sending {args.messages} messages, {args.handshake_ms:.0f} ms simulated handshake\n")
+    with app.app_context():
+        start = time.perf_counter()
+        for msg in build_messages(args.messages):
+            mail.send(msg)
+        per_message = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with SMTPBatchSender() as sender:
+            for msg in build_messages(args.messages):
+                sender.send(msg)
+        batched = time.perf_counter() - start
+
+    print(f"{'connection per message':<24} {args.messages / per_message:>10.1f} msg/s ({per_message:.2f}s)")
+    print(f"{'batched connection':<24} {args.messages / batched:>10.1f} msg/s ({batched:.2f}s, "
+          f"{sender.connections_opened} connections)")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
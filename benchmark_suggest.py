@@ -0,0 +1,57 @@
+"""
+Benchmark company typeahead lookups on the in-memory prefix index.
+
+Builds a CompanyIndex for one large account (no database needed) and times
+prefix lookups of 1-4 characters, plus incremental add/remove.
+
+Usage:
+    python benchmark_suggest.py
+    python benchmark_suggest.py --companies 50000 --repeat 2000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.companies import CompanyIndex  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--companies', type=int, default=20000, help='distinct company names in the account')
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    counts = [
+        (''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(4, 12))).title()
+         + rng.choice(['', ' Inc.', ' LLC', ' Labs']), rng.randrange(1, 5))
+        for _ in range(args.companies)
+    ]
+
+    start = time.perf_counter()
+    index = CompanyIndex(counts)
+    print(f"Built index of {len(index.keys):,} companies in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    for length in (1, 2, 3, 4):
+        prefixes = [''.join(rng.choice(string.ascii_lowercase) for _ in range(length)) for _ in range(args.repeat)]
+        start = time.perf_counter()
+        for prefix in prefixes:
+            index.suggest(prefix, 10)
+        elapsed = (time.perf_counter() - start) / args.repeat * 1000
+        print(f"{length}-char prefix {elapsed:>10.4f} ms per lookup")
+
+    start = time.perf_counter()
+    for name, _ in counts[:args.repeat]:
+        index.add(name + ' Holdings')
+        index.remove(name + ' Holdings')
+    elapsed = (time.perf_counter() - start) / args.repeat * 1000
+    print(f"{'add + remove':<14} {elapsed:>10.4f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -28,6 +28,8 @@ from celery import Celery
 from celery.schedules import crontab
 import os
 
+from app.schedules import REMINDER_SCHEDULE
+
 # Create Celery instance
 celery_app = Celery(
     'job_tracker',
@@ -42,17 +44,25 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    # Reminder chunks are acked late and throttled per email, so they can run
+    # for a while: prefetch one task at a time so idle workers get the rest
+    worker_prefetch_multiplier=1,
+    # CELERY_TASK_ALWAYS_EAGER=1 runs tasks (and chords) inline, e.g. for tests
+    # with CELERY_BROKER_URL=memory:// and CELERY_RESULT_BACKEND=cache+memory://
+    task_always_eager=os.environ.get('CELERY_TASK_ALWAYS_EAGER', '0') == '1',
+    task_eager_propagates=True,
 )
 
-# Periodic task schedule
+# Periodic task schedule (reminder times live in app/schedules.py, shared with
+# the embedded scheduler)
 celery_app.conf.beat_schedule = {
-    'send-daily-reminders': {
-        'task': 'celery_tasks.send_daily_reminders_task',
-        'schedule': crontab(hour=9, minute=0),  # Run daily at 9:00 AM
+    **{
+        name: {'task': entry['task'], 'schedule': crontab(**entry['cron'])}
+        for name, entry in REMINDER_SCHEDULE.items()
     },
-    'send-upcoming-reminders': {
-        'task': 'celery_tasks.send_upcoming_reminders_task',
-        'schedule': crontab(hour=8, minute=0, day_of_week='monday'),  # Monday at 8:00 AM
+    'drain-status-outbox': {
+        'task': 'celery_tasks.drain_status_outbox_task',
+        'schedule': float(os.environ.get('OUTBOX_POLL_INTERVAL', 5.0)),  # Seconds
     },
 }
 
@@ -2,25 +2,136 @@
 Celery tasks for background job processing.
 
 Tasks:
-    - send_daily_reminders_task: Send reminders for applications due today
-    - send_upcoming_reminders_task: Send reminders for upcoming follow-ups
+    - send_daily_reminders_task: Fan today's reminders out over chunk tasks
+    - send_upcoming_reminders_task: Fan upcoming follow-up reminders out over chunk tasks
+    - send_reminder_chunk_task: Send the reminders of one chunk of users (throttled per email)
+    - aggregate_reminder_summaries_task: Merge the chunk summaries of a run and prune the ledger
     - send_welcome_email_task: Send welcome email asynchronously
+    - drain_status_outbox_task: Send queued status change notifications
 """
 
+import time
+from datetime import date, timedelta
+
+from celery import chord
 from celery_app import celery_app
-from app.scheduler import send_daily_reminders, send_upcoming_reminders
+from app.scheduler import due_user_ids, merge_summaries, prune_expired_reminder_log, send_reminders_for_users
 from app.email import send_welcome_email
+from app.metrics import record_reminder_run
+from app.outbox import drain_all
 from app.models import User
 from app import app
 
 
+def reminder_email_rate_limit(config):
+    """
+    Emails per minute one worker process may send to keep within the provider quota.
+    
+    Chunks are throttled per email rather than per task: a user without
+    digests gets one email per due application, so the number of emails in
+    a chunk is not known up front. The MAIL_RATE_LIMIT budget is split over
+    the CELERY_WORKERS processes sending at the same time.
+    
+    Returns:
+        float: Emails per minute, or None without a quota
+    """
+    quota = config.get('MAIL_RATE_LIMIT')
+    if not quota:
+        return None
+    return quota / max(1, config.get('CELERY_WORKERS', 1))
+
+
+def fan_out_reminders(kind, start, end=None):
+    """
+    Dispatch reminder chunks of REMINDER_CHUNK_SIZE users as a chord.
+    
+    Due user IDs are paged from the database; each chunk becomes one
+    send_reminder_chunk_task and aggregate_reminder_summaries_task merges
+    their summaries once all chunks are done.
+    
+    Args:
+        kind: Run type, 'daily' or 'upcoming'
+        start: First follow-up date to include
+        end: Last follow-up date to include (defaults to start)
+    
+    Returns:
+        tuple: (chunks dispatched, AsyncResult of the aggregate, or None)
+    """
+    chunk_size = app.config.get('REMINDER_CHUNK_SIZE', 50)
+    with app.app_context():
+        user_ids = list(due_user_ids(start, end))
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+    if not chunks:
+        return 0, None
+    
+    start_iso = start.isoformat()
+    end_iso = end.isoformat() if end is not None else None
+    header = [send_reminder_chunk_task.s(chunk, kind, start_iso, end_iso) for chunk in chunks]
+    result = chord(header)(aggregate_reminder_summaries_task.s(kind, time.time()))
+    return len(chunks), result
+
+
+@celery_app.task(
+    name='celery_tasks.send_reminder_chunk_task',
+    bind=True,
+    acks_late=True,  # A worker crash redelivers the chunk; the reminder ledger skips what was sent
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def send_reminder_chunk_task(self, user_ids, kind, start, end=None):
+    """
+    Celery task to send the reminders due for one chunk of users.
+    
+    The task ID is the ledger run ID: it is the same for every retry and
+    redelivery of the chunk, so a retry takes back the reminders an attempt
+    that raised had claimed instead of skipping them as another run's.
+    Emails are throttled to this worker's share of MAIL_RATE_LIMIT.
+    
+    Args:
+        user_ids: Users in this chunk
+        kind: Run type, 'daily' or 'upcoming'
+        start: First follow-up date (ISO format)
+        end: Last follow-up date (ISO format), or None for a single day
+    """
+    return send_reminders_for_users(
+        user_ids, kind, date.fromisoformat(start), date.fromisoformat(end) if end else None,
+        run_id=self.request.id.replace('-', ''),
+        rate_limit=reminder_email_rate_limit(app.config),
+    )
+
+
+@celery_app.task(name='celery_tasks.aggregate_reminder_summaries_task')
+def aggregate_reminder_summaries_task(summaries, kind, started_at):
+    """
+    Celery task (chord callback) merging the chunk summaries of one run.
+    Also prunes reminder ledger rows past REMINDER_LOG_RETENTION_DAYS.
+    
+    Args:
+        summaries: Summaries returned by the chunk tasks
+        kind: Run type, 'daily' or 'upcoming'
+        started_at: Unix time the run was dispatched
+    """
+    summary = merge_summaries(summaries)
+    app.logger.info('Reminder summary (%s, %s chunks): %s', kind, len(summaries), summary)
+    record_reminder_run(kind, summary, time.time() - started_at)
+    with app.app_context():
+        prune_expired_reminder_log(date.today())
+    return summary
+
+
 @celery_app.task(name='celery_tasks.send_daily_reminders_task')
 def send_daily_reminders_task():
     """
     Celery task to send daily follow-up reminders.
     Scheduled to run daily at 9:00 AM.
+    
+    Coordinator only: the reminders are sent by chunk tasks spread over the
+    workers, and the merged summary is logged by the chord callback.
     """
-    return send_daily_reminders()
+    today = date.today()
+    chunks, _ = fan_out_reminders('daily', today)
+    return {'date': today.isoformat(), 'chunks': chunks}
 
 
 @celery_app.task(name='celery_tasks.send_upcoming_reminders_task')
@@ -32,7 +143,10 @@ def send_upcoming_reminders_task(days_ahead=3):
     Args:
         days_ahead: Number of days to look ahead (default: 3)
     """
-    return send_upcoming_reminders(days_ahead)
+    today = date.today()
+    future_date = today + timedelta(days=days_ahead)
+    chunks, _ = fan_out_reminders('upcoming', today, future_date)
+    return {'date_range': f'{today.isoformat()} to {future_date.isoformat()}', 'chunks': chunks}
 
 
 @celery_app.task(name='celery_tasks.send_welcome_email_task')
@@ -51,9 +165,23 @@ def send_welcome_email_task(user_id):
         return f"User {user_id} not found"
 
 
+@celery_app.task(name='celery_tasks.drain_status_outbox_task', ignore_result=True)
+def drain_status_outbox_task():
+    """
+    Celery task to send queued status change notifications.
+    Scheduled every few seconds; overlapping runs claim different rows.
+    """
+    with app.app_context():
+        return drain_all(
+            batch_size=app.config['OUTBOX_BATCH_SIZE'],
+            lease=app.config['OUTBOX_LEASE'],
+            max_attempts=app.config['OUTBOX_MAX_ATTEMPTS'],
+        )
+
+
 # Example: Trigger tasks manually
 if __name__ == '__main__':
-    # Send daily reminders now
+    # Send daily reminders now (the coordinator returns once chunks are dispatched)
     result = send_daily_reminders_task.delay()
     print(f"Task submitted: {result.id}")
     
@@ -35,6 +35,51 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Optional read replica for read-only views (see app/replica.py)
+    REPLICA_DATABASE_URI = os.environ.get('REPLICA_DATABASE_URI')
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))  # Read from primary after a write
+    
+    # Connection pool (per worker process; see app/db_pool.py)
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))  # Gunicorn workers sharing the database
+    DB_POOL_SIZE = int(os.environ['DB_POOL_SIZE']) if os.environ.get('DB_POOL_SIZE') else None
+    DB_MAX_OVERFLOW = int(os.environ['DB_MAX_OVERFLOW']) if os.environ.get('DB_MAX_OVERFLOW') else None
+    DB_CONNECTION_BUDGET = int(os.environ.get('DB_CONNECTION_BUDGET', 0))  # Split over workers when pool size is unset
+    DB_RESERVED_CONNECTIONS = int(os.environ.get('DB_RESERVED_CONNECTIONS', 5))  # Cron, Celery and admin sessions
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))  # Seconds; keep below MySQL wait_timeout
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+    DB_POOL_CHECK = os.environ.get('DB_POOL_CHECK', '1') == '1'  # Compare with max_connections at startup
+    DB_POOL_STRICT = os.environ.get('DB_POOL_STRICT', '0') == '1'  # Refuse to start when over max_connections
+    
+    # User loader cache (in-process unless a Redis URL is available)
+    USER_CACHE_ENABLED = os.environ.get('USER_CACHE_ENABLED', '1') == '1'
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # Seconds
+    USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 1024))
+    USER_CACHE_REDIS_URL = os.environ.get('USER_CACHE_REDIS_URL', os.environ.get('CELERY_BROKER_URL'))
+    
+    # SQL instrumentation (per-request query counts and timings)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '1') == '1'
+    SQL_SERVER_TIMING = os.environ.get('SQL_SERVER_TIMING', '1') == '1'  # Server-Timing response header
+    SQL_QUERY_BUDGET = int(os.environ.get('SQL_QUERY_BUDGET', 20))  # Warn above this many statements; 0 disables
+    SQL_SLOWEST_QUERIES = int(os.environ.get('SQL_SLOWEST_QUERIES', 3))
+    
+    # Prometheus metrics at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Require "Authorization: Bearer <token>" when set
+    
+    # API Pagination
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 50))
+    API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 500))
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 1000))
+    SEARCH_LIMIT = int(os.environ.get('SEARCH_LIMIT', 20))
+    SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', 100))
+    
+    # Company typeahead (in-memory prefix index per user)
+    COMPANY_INDEX_TTL = int(os.environ.get('COMPANY_INDEX_TTL', 300))  # Seconds
+    COMPANY_INDEX_MAX_USERS = int(os.environ.get('COMPANY_INDEX_MAX_USERS', 1000))
+    SUGGEST_LIMIT = int(os.environ.get('SUGGEST_LIMIT', 10))
+    
     # Flask-Mail Configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -42,8 +87,41 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    MAIL_CONNECTION_MAX_MESSAGES = int(os.environ.get('MAIL_CONNECTION_MAX_MESSAGES', 100))  # Recycle batch SMTP connections
+    MAIL_SEND_RETRIES = int(os.environ.get('MAIL_SEND_RETRIES', 1))  # Reconnect attempts per message
+    
+    # Reminder ledger (reminder_log table)
+    REMINDER_CLAIM_TIMEOUT = int(os.environ.get('REMINDER_CLAIM_TIMEOUT', 900))  # Seconds before a crashed run's claims are retried
+    REMINDER_LOG_RETENTION_DAYS = int(os.environ.get('REMINDER_LOG_RETENTION_DAYS', 30))  # 0 keeps rows forever
+    
+    # Celery reminder fan-out (celery_tasks.py)
+    REMINDER_CHUNK_SIZE = int(os.environ.get('REMINDER_CHUNK_SIZE', 50))  # Users per chunk task
+    MAIL_RATE_LIMIT = int(os.environ.get('MAIL_RATE_LIMIT', 0))  # Mail provider quota in emails per minute; 0 = no limit
+    CELERY_WORKERS = int(os.environ.get('CELERY_WORKERS', 1))  # Worker processes sharing MAIL_RATE_LIMIT
+    
+    # Embedded reminder scheduler (app/embedded_scheduler.py), started in
+    # gunicorn workers only; leave off when Celery beat or cron runs the reminders
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', '0') == '1'
+    SCHEDULER_INTERVAL = float(os.environ.get('SCHEDULER_INTERVAL', 30.0))  # Seconds between schedule checks
+    SCHEDULER_JITTER = float(os.environ.get('SCHEDULER_JITTER', 10.0))  # Random extra seconds per check
+    SCHEDULER_LEASE = int(os.environ.get('SCHEDULER_LEASE', 3600))  # Seconds before a dead worker's run is taken over
+    SCHEDULER_MISFIRE_GRACE = int(os.environ.get('SCHEDULER_MISFIRE_GRACE', 3600))  # Unclaimed runs later than this are skipped
+    
+    # Status change notification outbox (drained by drain_outbox.py or Celery)
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_LEASE = int(os.environ.get('OUTBOX_LEASE', 300))  # Seconds a drainer holds a batch; also the retry delay
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 5.0))  # Seconds between drains in --loop mode
+    
+    # Background email worker pool
+    MAIL_WORKERS = int(os.environ.get('MAIL_WORKERS', 4))
+    MAIL_QUEUE_SIZE = int(os.environ.get('MAIL_QUEUE_SIZE', 100))
+    MAIL_QUEUE_TIMEOUT = float(os.environ.get('MAIL_QUEUE_TIMEOUT', 2.0))  # Seconds to wait for a free slot
+    MAIL_DRAIN_TIMEOUT = float(os.environ.get('MAIL_DRAIN_TIMEOUT', 10.0))  # Seconds to flush on shutdown
     
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = os.environ.get('LOG_FILE', 'app.log')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    LOG_JSON = os.environ.get('LOG_JSON', '0') == '1'  # One JSON object per line in the log file
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))  # Records buffered before new ones are dropped
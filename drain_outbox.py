@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Send queued status change notifications from the outbox.
+
+Editing an application's status only writes a status_change_outbox row (in
+the same transaction as the edit); this worker turns those rows into emails.
+
+Usage:
+    python drain_outbox.py            # Drain everything queued, then exit
+    python drain_outbox.py --loop     # Keep draining every OUTBOX_POLL_INTERVAL seconds
+
+Run several --loop workers if needed: each claims its own batches, and a
+batch held by a worker that dies is picked up again after OUTBOX_LEASE
+seconds. With Celery, the drain_status_outbox_task beat entry does the same.
+"""
+
+import argparse
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add the project directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from app.outbox import drain_all
+
+
+def _drain():
+    with app.app_context():
+        return drain_all(
+            batch_size=app.config['OUTBOX_BATCH_SIZE'],
+            lease=app.config['OUTBOX_LEASE'],
+            max_attempts=app.config['OUTBOX_MAX_ATTEMPTS'],
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Send queued status change notifications')
+    parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting')
+    args = parser.parse_args()
+
+    if not args.loop:
+        result = _drain()
+        print(f"Outbox drained at {datetime.now()}: {result['sent']} sent, "
+              f"{result['failed']} failed, {result['skipped']} skipped")
+        sys.exit(1 if result['failed'] and not result['sent'] else 0)
+
+    print(f"Draining the outbox every {app.config['OUTBOX_POLL_INTERVAL']}s (Ctrl+C to stop)")
+    try:
+        while True:
+            try:
+                _drain()
+            except Exception as e:
+                # Keep the worker alive through database or SMTP outages
+                app.logger.error('Outbox drain failed: %s', e)
+            time.sleep(app.config['OUTBOX_POLL_INTERVAL'])
+    except KeyboardInterrupt:
+        pass
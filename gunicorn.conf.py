@@ -0,0 +1,34 @@
+"""
+Gunicorn settings (loaded automatically by `gunicorn wsgi:app`).
+
+Prometheus metrics from every worker are merged through files in
+PROMETHEUS_MULTIPROC_DIR; the directory is reset when the master starts and
+a worker's live gauges are dropped when it exits.
+
+With SCHEDULER_ENABLED=1 each worker runs the embedded reminder scheduler;
+only web workers start it, never CLI commands or background jobs.
+"""
+import os
+import shutil
+import tempfile
+
+# Must be set before the workers import prometheus_client
+multiproc_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'jobtracker-metrics')
+)
+
+
+def on_starting(server):
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    from app import embedded_scheduler
+    if embedded_scheduler.enabled:
+        embedded_scheduler.start()
@@ -90,9 +90,23 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # the full-text indexes (SQLite's job_application_fts and its shadow
+    # tables, MySQL's FULLTEXT index and its search_owner column) are managed
+    # by hand-written migrations, not by autogenerate
+    def include_name(name, type_, parent_names):
+        if type_ == 'table':
+            return not name.startswith('job_application_fts')
+        if type_ == 'column':
+            return name != 'search_owner'
+        if type_ == 'index':
+            return name != 'ix_job_application_fulltext'
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_name") is None:
+        conf_args["include_name"] = include_name
 
     connectable = get_engine()
 
@@ -0,0 +1,31 @@
+"""Add composite indexes to job_application
+
+Revision ID: 3b8f2c1d9a4e
+Revises: 07c910f34e72
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2c1d9a4e'
+down_revision = '07c910f34e72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_job_application_user_date_applied', 'job_application',
+                    ['user_id', sa.text('date_applied DESC')], unique=False)
+    op.create_index('ix_job_application_user_status', 'job_application',
+                    ['user_id', 'status'], unique=False)
+    op.create_index('ix_job_application_follow_up_status', 'job_application',
+                    ['follow_up_date', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_application_follow_up_status', table_name='job_application')
+    op.drop_index('ix_job_application_user_status', table_name='job_application')
+    op.drop_index('ix_job_application_user_date_applied', table_name='job_application')
@@ -0,0 +1,26 @@
+"""Add reminder_digest preference to user
+
+Revision ID: 5c1e7a2b4d6f
+Revises: 3b8f2c1d9a4e
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a2b4d6f'
+down_revision = '3b8f2c1d9a4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reminder_digest', sa.Boolean(), server_default=sa.true(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('reminder_digest')
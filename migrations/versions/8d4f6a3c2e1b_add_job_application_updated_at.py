@@ -0,0 +1,51 @@
+"""Add updated_at to job_application
+
+Revision ID: 8d4f6a3c2e1b
+Revises: 5c1e7a2b4d6f
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4f6a3c2e1b'
+down_revision = '5c1e7a2b4d6f'
+branch_labels = None
+depends_on = None
+
+UPDATED_AT = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def _restore_date_applied_index():
+    # The SQLite batch rebuild recreates indexes from reflection, which drops
+    # the DESC on date_applied; put back the index the model and the keyset
+    # ORDER BY expect
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.drop_index('ix_job_application_user_date_applied', table_name='job_application')
+    op.create_index('ix_job_application_user_date_applied', 'job_application',
+                    ['user_id', sa.text('date_applied DESC')], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('job_application', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', UPDATED_AT, nullable=True))
+
+    op.execute('UPDATE job_application SET updated_at = CURRENT_TIMESTAMP')
+
+    with op.batch_alter_table('job_application', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=UPDATED_AT, nullable=False)
+        batch_op.create_index('ix_job_application_user_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    _restore_date_applied_index()
+
+
+def downgrade():
+    with op.batch_alter_table('job_application', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_application_user_updated_at')
+        batch_op.drop_column('updated_at')
+
+    _restore_date_applied_index()
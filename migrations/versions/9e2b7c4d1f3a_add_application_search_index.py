@@ -0,0 +1,57 @@
+"""Add full-text search index over job_application
+
+Revision ID: 9e2b7c4d1f3a
+Revises: 8d4f6a3c2e1b
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e2b7c4d1f3a'
+down_revision = '8d4f6a3c2e1b'
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = 'job_application_fts'
+
+# Kept in step with app/search.py
+SQLITE_UPGRADE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "company, position, notes, content='job_application', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, company, position, notes) "
+    "VALUES (new.id, new.company, new.position, new.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes) "
+    "VALUES ('delete', old.id, old.company, old.position, old.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF company, position, notes "
+    "ON job_application BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes) "
+    "VALUES ('delete', old.id, old.company, old.position, old.notes); "
+    f"INSERT INTO {FTS_TABLE}(rowid, company, position, notes) "
+    "VALUES (new.id, new.company, new.position, new.notes); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == 'mysql':
+        op.execute('ALTER TABLE job_application ADD FULLTEXT INDEX ix_job_application_fulltext '
+                   '(company, position, notes)')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif dialect == 'mysql':
+        op.drop_index('ix_job_application_fulltext', table_name='job_application')
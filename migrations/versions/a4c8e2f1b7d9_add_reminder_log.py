@@ -0,0 +1,40 @@
+"""Add reminder_log ledger
+
+Revision ID: a4c8e2f1b7d9
+Revises: 9e2b7c4d1f3a
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f1b7d9'
+down_revision = '9e2b7c4d1f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'reminder_log',
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('reminder_date', sa.Date(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('run_id', sa.String(length=32), nullable=False),
+        sa.Column('claimed_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['job_application.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('application_id', 'reminder_date', 'kind')
+    )
+    with op.batch_alter_table('reminder_log', schema=None) as batch_op:
+        batch_op.create_index('ix_reminder_log_reminder_date', ['reminder_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reminder_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_reminder_log_reminder_date')
+
+    op.drop_table('reminder_log')
@@ -0,0 +1,36 @@
+"""Add status_change_outbox
+
+Revision ID: b7d3f9a2c5e8
+Revises: a4c8e2f1b7d9
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f9a2c5e8'
+down_revision = 'a4c8e2f1b7d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'status_change_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('old_status', sa.String(length=50), nullable=True),
+        sa.Column('new_status', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('claimed_by', sa.String(length=32), nullable=True),
+        sa.Column('claimed_until', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['job_application.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('status_change_outbox')
@@ -0,0 +1,32 @@
+"""Add scheduler_lease
+
+Revision ID: c2e9a7f4d1b6
+Revises: b7d3f9a2c5e8
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e9a7f4d1b6'
+down_revision = 'b7d3f9a2c5e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scheduler_lease',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('slot', sa.DateTime(), nullable=True),
+        sa.Column('owner', sa.String(length=64), nullable=True),
+        sa.Column('leased_until', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_lease')
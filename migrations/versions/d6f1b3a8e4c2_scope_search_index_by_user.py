@@ -0,0 +1,73 @@
+"""Scope the full-text search index by user
+
+Revision ID: d6f1b3a8e4c2
+Revises: c2e9a7f4d1b6
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6f1b3a8e4c2'
+down_revision = 'c2e9a7f4d1b6'
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = 'job_application_fts'
+
+
+def _sqlite_ddl(columns, update_of):
+    """FTS5 table and sync triggers over the given job_application columns."""
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{name}' for name in columns)
+    old = ', '.join(f'old.{name}' for name in columns)
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{names}, content='job_application', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON job_application BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON job_application BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {update_of} "
+        "ON job_application BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    )
+
+
+def _sqlite_drop():
+    for suffix in ('ai', 'ad', 'au'):
+        op.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    op.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Kept in step with app/search.py
+        _sqlite_drop()
+        for statement in _sqlite_ddl(('company', 'position', 'notes', 'user_id'),
+                                     'company, position, notes, user_id'):
+            op.execute(statement)
+    elif dialect == 'mysql':
+        op.drop_index('ix_job_application_fulltext', table_name='job_application')
+        op.execute("ALTER TABLE job_application ADD COLUMN search_owner VARCHAR(32) "
+                   "AS (CONCAT('uid', user_id)) STORED")
+        op.execute('ALTER TABLE job_application ADD FULLTEXT INDEX ix_job_application_fulltext '
+                   '(company, position, notes, search_owner)')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_drop()
+        for statement in _sqlite_ddl(('company', 'position', 'notes'), 'company, position, notes'):
+            op.execute(statement)
+    elif dialect == 'mysql':
+        op.drop_index('ix_job_application_fulltext', table_name='job_application')
+        op.drop_column('job_application', 'search_owner')
+        op.execute('ALTER TABLE job_application ADD FULLTEXT INDEX ix_job_application_fulltext '
+                   '(company, position, notes)')
@@ -3,7 +3,16 @@
 Cron job script for sending daily follow-up reminders.
 
 Usage:
-    python send_reminders_cron.py
+    python send_reminders_cron.py [--shard N/M] [--processes P]
+
+    --shard N/M     Only send reminders for users with user_id % M == N - 1,
+                    so M machines (or CI jobs) can split the run
+    --processes P   Split this run (or shard) over P worker processes
+
+    The summary printed at the end is merged over all processes.
+
+    Safe to re-run: reminders already sent today are recorded in the
+    reminder_log table and skipped; failed ones are retried.
 
 Schedule with cron (Linux/Mac):
     # Run daily at 9 AM
@@ -29,6 +38,7 @@ Schedule with GitHub Actions:
     See .github/workflows/daily-reminders.yml
 """
 
+import argparse
 import sys
 import os
 from datetime import datetime
@@ -36,14 +46,31 @@ from datetime import datetime
 # Add the project directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.scheduler import send_daily_reminders
+from app.scheduler import parse_shard, send_daily_reminders_sharded
+
+
+def _shard(value):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Send daily follow-up reminders')
+    parser.add_argument('--shard', type=_shard, default=(0, 1),
+                        help='Share of users to cover, as N/M (default: 1/1, everyone)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes to split the run over (default: 1)')
+    args = parser.parse_args()
+    
     print(f"Starting daily reminders at {datetime.now()}")
+    if args.shard[1] > 1 or args.processes > 1:
+        print(f"Shard {args.shard[0] + 1}/{args.shard[1]}, {args.processes} process(es)")
     print("-" * 60)
     
     try:
-        result = send_daily_reminders()
+        result = send_daily_reminders_sharded(args.shard, processes=args.processes)
         
         print("\n" + "=" * 60)
         print("REMINDER SUMMARY")
@@ -52,6 +79,8 @@ if __name__ == '__main__':
         print(f"Total applications checked: {result['total_applications']}")
         print(f"Reminders sent: {result['sent']}")
         print(f"Failed: {result['failed']}")
+        print(f"Emails sent: {result['emails']}")
+        print(f"Skipped (already sent by an earlier run): {result['skipped']}")
         print("=" * 60)
         
         # Exit with error code if all failed
@@ -17,7 +17,7 @@ def test_api_get_applications_unauthorized(client):
 def test_api_get_applications_empty(client, auth, user):
     """Test API GET with no applications."""
     auth.login()
-    response = client.get('/api/applications')
+    response = client.get('/api/applications?total=exact')
     
     assert response.status_code == 200
     data = json.loads(response.data)
@@ -28,7 +28,7 @@ def test_api_get_applications_empty(client, auth, user):
 def test_api_get_applications(client, auth, user, application):
     """Test API GET with applications."""
     auth.login()
-    response = client.get('/api/applications')
+    response = client.get('/api/applications?total=exact')
     
     assert response.status_code == 200
     data = json.loads(response.data)
@@ -123,7 +123,7 @@ def test_api_user_isolation(client, auth, app):
     # Login as user1
     auth.login('user1@test.com', 'password')
     
-    response = client.get('/api/applications')
+    response = client.get('/api/applications?total=exact')
     assert response.status_code == 200
     
     data = json.loads(response.data)
@@ -144,9 +144,321 @@ def test_api_json_format(client, auth, user, application):
     assert 'total' in data
     assert isinstance(data['applications'], list)
     
-    if data['total'] > 0:
+    if data['applications']:
         app_data = data['applications'][0]
         assert 'id' in app_data
         assert 'company' in app_data
         assert 'position' in app_data
         assert 'status' in app_data
+
+
+def test_api_stats(client, auth, user, app):
+    """Test API stats returns per-status counts for the current user."""
+    with app.app_context():
+        db.session.add_all([
+            JobApplication(company='A', position='Dev', status='Applied', user_id=user.id),
+            JobApplication(company='B', position='Dev', status='Applied', user_id=user.id),
+            JobApplication(company='C', position='Dev', status='Interview', user_id=user.id),
+        ])
+        db.session.commit()
+    
+    auth.login()
+    response = client.get('/api/stats')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['total'] == 3
+    assert data['by_status']['Applied'] == 2
+    assert data['by_status']['Interview'] == 1
+    assert data['by_status']['Offer'] == 0
+
+
+def test_api_stats_unauthorized(client):
+    """Test API stats without authentication."""
+    response = client.get('/api/stats')
+    assert response.status_code == 302
+
+
+def test_api_cursor_pagination(client, auth, user, app):
+    """Test API pages forward and back with opaque cursors."""
+    from datetime import date, timedelta
+    with app.app_context():
+        base = date(2025, 1, 1)
+        for i in range(7):
+            db.session.add(JobApplication(
+                company=f'Company {i}',
+                position='Dev',
+                date_applied=base + timedelta(days=i // 2),
+                user_id=user.id
+            ))
+        # Applications without a date sort last
+        undated = JobApplication(company='Undated', position='Dev', user_id=user.id)
+        db.session.add(undated)
+        db.session.commit()
+        undated.date_applied = None
+        db.session.commit()
+    
+    auth.login()
+    seen = []
+    cursor = None
+    pages = []
+    while True:
+        url = '/api/applications?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        data = json.loads(client.get(url).data)
+        pages.append(data)
+        seen.extend(a['company'] for a in data['applications'])
+        cursor = data['next']
+        if not cursor:
+            break
+    
+    assert len(seen) == 8 and len(set(seen)) == 8
+    assert seen[-1] == 'Undated'
+    assert pages[0]['prev'] is None
+    assert all(page['total'] is None for page in pages)
+    
+    # Step back from the last page to the middle one
+    data = json.loads(client.get(f"/api/applications?limit=3&cursor={pages[-1]['prev']}").data)
+    assert [a['company'] for a in data['applications']] == [a['company'] for a in pages[1]['applications']]
+
+
+def test_api_approx_total_without_estimate(client, auth, user, app):
+    """Test total=approx counts the first page exactly where no estimate exists."""
+    with app.app_context():
+        db.session.add_all([
+            JobApplication(company=f'Company {i}', position='Dev', user_id=user.id)
+            for i in range(5)
+        ])
+        db.session.commit()
+    
+    auth.login()
+    first = json.loads(client.get('/api/applications?limit=2&total=approx').data)
+    assert first['total'] == 5
+    assert first['total_approximate'] is False
+    
+    second = json.loads(client.get(f"/api/applications?limit=2&total=approx&cursor={first['next']}").data)
+    assert second['total'] is None
+
+
+def test_api_invalid_cursor(client, auth, user):
+    """Test API rejects malformed cursors."""
+    auth.login()
+    response = client.get('/api/applications?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_api_export_ndjson(client, auth, user, application):
+    """Test NDJSON export streams one document per application."""
+    auth.login()
+    response = client.get('/api/applications/export?format=ndjson')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['company'] == 'Test Company'
+
+
+def test_api_export_csv(client, auth, user, application):
+    """Test CSV export includes a header row and the user's applications."""
+    import csv
+    import io
+    auth.login()
+    response = client.get('/api/applications/export?format=csv')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'applications.csv' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 1
+    assert rows[0]['company'] == 'Test Company'
+    assert rows[0]['position'] == 'Software Engineer'
+
+
+def test_api_export_invalid_format(client, auth, user):
+    """Test export rejects unknown formats."""
+    auth.login()
+    response = client.get('/api/applications/export?format=xml')
+    assert response.status_code == 400
+
+
+def test_api_bulk_operations(client, auth, user, application, app):
+    """Test bulk endpoint creates, updates and deletes in one call."""
+    auth.login()
+    with app.app_context():
+        other = JobApplication(company='Delete Me', position='Dev', user_id=user.id)
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+    
+    operations = [
+        {'company': 'Bulk Co', 'position': 'Dev', 'date_applied': '2025-09-01'},
+        {'id': application.id, 'status': 'Interview'},
+        {'op': 'delete', 'id': other_id},
+        {'company': 'Missing Position'},
+        {'id': 99999, 'status': 'Offer'},
+    ]
+    response = client.post('/api/applications/bulk', json=operations)
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    statuses = [r['status'] for r in data['results']]
+    assert statuses == ['created', 'updated', 'deleted', 'error', 'error']
+    assert data['created'] == 1 and data['error'] == 2
+    
+    with app.app_context():
+        created = JobApplication.query.filter_by(company='Bulk Co').one()
+        assert created.user_id == user.id
+        assert created.status == 'Applied'
+        assert created.date_applied.isoformat() == '2025-09-01'
+        assert db.session.get(JobApplication, application.id).status == 'Interview'
+        assert db.session.get(JobApplication, other_id) is None
+
+
+def test_api_bulk_ndjson(client, auth, user, app):
+    """Test bulk endpoint accepts NDJSON bodies."""
+    auth.login()
+    body = '\n'.join(json.dumps({'company': f'Co {i}', 'position': 'Dev'}) for i in range(3))
+    response = client.post('/api/applications/bulk', data=body, content_type='application/x-ndjson')
+    
+    assert response.status_code == 200
+    assert json.loads(response.data)['created'] == 3
+
+
+def test_api_bulk_user_isolation(client, auth, app):
+    """Test bulk endpoint cannot touch another user's applications."""
+    with app.app_context():
+        from app.models import User
+        owner = User(name='Owner', email='owner@test.com')
+        owner.set_password('password')
+        intruder = User(name='Intruder', email='intruder@test.com')
+        intruder.set_password('password')
+        db.session.add_all([owner, intruder])
+        db.session.commit()
+        target = JobApplication(company='Owner Co', position='Dev', user_id=owner.id)
+        db.session.add(target)
+        db.session.commit()
+        target_id = target.id
+    
+    auth.login('intruder@test.com', 'password')
+    response = client.post('/api/applications/bulk', json=[{'op': 'delete', 'id': target_id}])
+    
+    assert json.loads(response.data)['results'][0]['status'] == 'error'
+    with app.app_context():
+        assert db.session.get(JobApplication, target_id) is not None
+
+
+def test_api_bulk_batch_limit(client, auth, user, app):
+    """Test bulk endpoint enforces the maximum batch size."""
+    app.config['BULK_MAX_ITEMS'] = 2
+    auth.login()
+    response = client.post('/api/applications/bulk', json=[{'company': 'A', 'position': 'B'}] * 3)
+    assert response.status_code == 413
+
+
+def test_api_preferences(client, auth, user, app):
+    """Test reading and updating the reminder digest preference."""
+    auth.login()
+    assert json.loads(client.get('/api/preferences').data) == {'reminder_digest': True}
+    
+    response = client.put('/api/preferences', json={'reminder_digest': False})
+    assert json.loads(response.data) == {'reminder_digest': False}
+    
+    response = client.put('/api/preferences', json={'reminder_digest': 'no'})
+    assert response.status_code == 400
+
+
+def test_api_etag_not_modified(client, auth, user, application, app):
+    """Test an unchanged collection answers 304 and a change busts the ETag."""
+    auth.login()
+    response = client.get('/api/applications')
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+    
+    response = client.get('/api/applications', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    
+    client.post('/api/applications/bulk', json=[{'id': application.id, 'status': 'Offer'}])
+    response = client.get('/api/applications', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    etag = response.headers['ETag']
+    
+    client.post('/api/applications/bulk', json=[{'op': 'delete', 'id': application.id}])
+    response = client.get('/api/applications', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.data)['applications'] == []
+
+
+def test_api_etag_varies_by_page(client, auth, user, application):
+    """Test different query strings get different ETags."""
+    auth.login()
+    first = client.get('/api/applications').headers['ETag']
+    limited = client.get('/api/applications?limit=1').headers['ETag']
+    assert first != limited
+
+
+def test_api_search(client, auth, user, application):
+    """Test ranked search endpoint."""
+    auth.login()
+    response = client.get('/api/search?q=test')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [r['company'] for r in data['results']] == ['Test Company']
+    assert 'score' in data['results'][0]
+    
+    assert client.get('/api/search').status_code == 400
+
+
+def test_api_suggest_companies(client, auth, user, application):
+    """Test company typeahead endpoint."""
+    auth.login()
+    response = client.get('/api/companies/suggest?q=test')
+    
+    assert response.status_code == 200
+    assert json.loads(response.data)['suggestions'] == [{'name': 'Test Company', 'count': 1}]
+
+
+def test_api_bulk_create_ids_without_returning(client, auth, user, application, app, monkeypatch):
+    """Test created items get their ids on databases without multi-row RETURNING (MySQL)."""
+    auth.login()
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning', False)
+    
+    response = client.post('/api/applications/bulk', json=[
+        {'company': 'First', 'position': 'Dev'},
+        {'id': application.id, 'status': 'Interview'},
+        {'company': 'Second', 'position': 'QA', 'notes': 'Referral'},
+    ])
+    
+    results = json.loads(response.data)['results']
+    with app.app_context():
+        assert db.session.get(JobApplication, results[0]['id']).company == 'First'
+        assert db.session.get(JobApplication, results[2]['id']).company == 'Second'
+    assert results[1]['id'] == application.id
+
+
+def test_api_bulk_rejects_bad_types_per_item(client, auth, user, application, app):
+    """Test wrongly typed, overlong or unknown values are per-item errors, not a failed batch."""
+    auth.login()
+    
+    response = client.post('/api/applications/bulk', json=[
+        {'company': 'A', 'position': 'B', 'notes': {'a': 1}},
+        {'company': ['A'], 'position': 'B'},
+        {'company': 'A' * 256, 'position': 'B'},
+        {'company': 'A', 'position': 'B', 'status': 'Ghosted'},
+        {'op': 'delete', 'id': True},
+        {'company': 'Valid', 'position': 'Dev', 'notes': None},
+    ])
+    
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert [r['status'] for r in results] == ['error'] * 5 + ['created']
+    assert results[0]['error'] == 'notes must be a string'
+    assert results[2]['error'] == 'company must be at most 255 characters'
+    assert results[3]['error'].startswith('status must be one of')
+    assert results[4]['error'] == 'application not found'
+    with app.app_context():
+        assert db.session.get(JobApplication, application.id) is not None
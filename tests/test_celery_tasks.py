@@ -0,0 +1,141 @@
+"""
+Celery reminder fan-out tests (eager mode, in-memory broker)
+"""
+import pytest
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+pytest.importorskip('celery')
+
+import celery_tasks
+from celery_app import celery_app
+from app import db, scheduler
+from app.mailer import SMTPBatchSender, TokenBucket
+from app.models import JobApplication, ReminderLog, User
+
+
+@pytest.fixture
+def eager_celery():
+    """Run tasks and chords inline with an in-memory broker and result backend."""
+    previous = {key: celery_app.conf[key] for key in ('task_always_eager', 'broker_url', 'result_backend')}
+    celery_app.conf.update(task_always_eager=True, broker_url='memory://', result_backend='cache+memory://')
+    yield celery_app
+    celery_app.conf.update(previous)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Capture reminders instead of sending email."""
+    calls = []
+    monkeypatch.setattr(scheduler, 'send_followup_reminder',
+                        lambda user, appn, **kwargs: calls.append(appn.company) or True)
+    monkeypatch.setattr(scheduler, 'send_reminder_digest',
+                        lambda user, apps, **kwargs: calls.extend(a.company for a in apps) or True)
+    return calls
+
+
+def _add_due_users(count):
+    for i in range(count):
+        user = User(name=f'User {i}', email=f'user{i}@example.com')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(JobApplication(company=f'Due {i}', position='Dev', status='Applied',
+                                      follow_up_date=date.today(), user_id=user.id))
+    db.session.commit()
+
+
+def test_email_rate_limit_matches_quota():
+    """Test each worker process gets its share of the mail quota."""
+    config = {'MAIL_RATE_LIMIT': 300, 'REMINDER_CHUNK_SIZE': 50, 'CELERY_WORKERS': 2}
+    assert celery_tasks.reminder_email_rate_limit(config) == 150
+    assert celery_tasks.reminder_email_rate_limit({'MAIL_RATE_LIMIT': 0}) is None
+
+
+def test_chunk_throttles_each_email(app, eager_celery, monkeypatch):
+    """Test chunks are throttled per email, not per user."""
+    monkeypatch.setitem(celery_tasks.app.config, 'MAIL_RATE_LIMIT', 600)
+    throttled = []
+    monkeypatch.setattr(TokenBucket, 'acquire', lambda self: throttled.append(self.rate) or 0.0)
+    monkeypatch.setattr(SMTPBatchSender, '_connect', lambda self: SimpleNamespace(send=lambda msg: None))
+    user = User(name='No digest', email='nodigest@example.com', reminder_digest=False)
+    db.session.add(user)
+    db.session.flush()
+    for i in range(3):
+        db.session.add(JobApplication(company=f'Due {i}', position='Dev', status='Applied',
+                                      follow_up_date=date.today(), user_id=user.id))
+    db.session.commit()
+
+    summary = celery_tasks.send_reminder_chunk_task.delay([user.id], 'daily', date.today().isoformat()).get()
+
+    assert summary['emails'] == 3
+    assert throttled == [10.0] * 3
+
+
+def test_fan_out_chunks_and_aggregates(app, eager_celery, sent, monkeypatch):
+    """Test due users are split into chunks whose summaries are merged."""
+    monkeypatch.setitem(celery_tasks.app.config, 'REMINDER_CHUNK_SIZE', 2)
+    _add_due_users(5)
+    
+    chunks, result = celery_tasks.fan_out_reminders('daily', date.today())
+    summary = result.get()
+    
+    assert chunks == 3
+    assert summary['date'] == date.today().strftime('%Y-%m-%d')
+    assert summary['total_applications'] == 5
+    assert summary['sent'] == 5
+    assert sorted(sent) == [f'Due {i}' for i in range(5)]
+
+
+def test_coordinator_task(app, eager_celery, sent):
+    """Test the daily coordinator dispatches chunks and reminders are sent once."""
+    _add_due_users(3)
+    
+    first = celery_tasks.send_daily_reminders_task.delay().get()
+    celery_tasks.send_daily_reminders_task.delay().get()
+    
+    assert first == {'date': date.today().isoformat(), 'chunks': 1}
+    assert len(sent) == 3
+
+
+def test_nothing_due(app, eager_celery):
+    """Test no chord is dispatched when no reminders are due."""
+    assert celery_tasks.fan_out_reminders('daily', date.today()) == (0, None)
+
+
+def test_retried_chunk_resends_its_own_claims(app, eager_celery, monkeypatch):
+    """Test a chunk that raised mid-batch sends the reminders it had claimed when retried."""
+    _add_due_users(3)
+    calls = []
+
+    def flaky(user, appn, **kwargs):
+        calls.append(appn.company)
+        if len(calls) == 2:
+            raise ConnectionError('database went away')
+        return True
+
+    monkeypatch.setattr(scheduler, 'send_followup_reminder', flaky)
+    user_ids = [user.id for user in User.query.order_by(User.id)]
+
+    # throw=False: eager retries only re-run when failures are not propagated
+    result = celery_tasks.send_reminder_chunk_task.apply((user_ids, 'daily', date.today().isoformat()), throw=False)
+    summary = result.get()
+
+    # The batch's results were never recorded, so the retry sends all of it again
+    assert calls == ['Due 0', 'Due 1', 'Due 0', 'Due 1', 'Due 2']
+    assert summary['skipped'] == 0
+    assert summary['sent'] == 3
+    assert ReminderLog.query.filter_by(status='sent').count() == 3
+
+
+def test_aggregate_prunes_ledger(app, eager_celery, sent, monkeypatch):
+    """Test the chord callback applies REMINDER_LOG_RETENTION_DAYS."""
+    monkeypatch.setitem(celery_tasks.app.config, 'REMINDER_LOG_RETENTION_DAYS', 30)
+    _add_due_users(1)
+    db.session.add(ReminderLog(application_id=JobApplication.query.first().id,
+                               reminder_date=date.today() - timedelta(days=31),
+                               kind='daily', status='sent', run_id='old'))
+    db.session.commit()
+
+    celery_tasks.fan_out_reminders('daily', date.today())[1].get()
+
+    assert [row.reminder_date for row in ReminderLog.query] == [date.today()]
@@ -0,0 +1,63 @@
+"""
+Company typeahead tests
+"""
+from app import db, company_suggester
+from app.bulk import apply_bulk_operations
+from app.companies import CompanyIndex, normalize_company
+from app.models import JobApplication
+
+
+def _names(user_id, prefix):
+    return [s['name'] for s in company_suggester.suggest(user_id, prefix)]
+
+
+def test_normalize_company():
+    """Test spellings of one company normalize to one key."""
+    assert normalize_company('ACME, Inc.') == 'acme'
+    assert normalize_company('  Acme   Corp ') == 'acme'
+    assert normalize_company('Co') == 'co'
+
+
+def test_company_index_prefix_and_ranking():
+    """Test prefix lookups merge spellings and rank by use."""
+    index = CompanyIndex([('Acme Inc.', 2), ('acme', 1), ('Accenture', 1), ('Globex', 5)])
+    
+    assert index.suggest('ac') == [{'name': 'Acme Inc.', 'count': 3}, {'name': 'Accenture', 'count': 1}]
+    assert index.suggest('ACME,') == [{'name': 'Acme Inc.', 'count': 3}]
+    assert index.suggest('x') == []
+    
+    index.remove('Accenture')
+    assert [s['name'] for s in index.suggest('ac')] == ['Acme Inc.']
+
+
+def test_suggester_follows_orm_commits(app, user):
+    """Test a built index is updated incrementally on commit and rollback."""
+    db.session.add(JobApplication(company='Stark Industries', position='Dev', user_id=user.id))
+    db.session.commit()
+    assert _names(user.id, 'st') == ['Stark Industries']
+    
+    app_obj = JobApplication(company='Starbucks', position='Barista', user_id=user.id)
+    db.session.add(app_obj)
+    db.session.commit()
+    assert sorted(_names(user.id, 'sta')) == ['Starbucks', 'Stark Industries']
+    
+    app_obj.company = 'Wayne Enterprises'
+    db.session.commit()
+    assert _names(user.id, 'sta') == ['Stark Industries']
+    assert _names(user.id, 'way') == ['Wayne Enterprises']
+    
+    db.session.add(JobApplication(company='Rolled Back', position='Dev', user_id=user.id))
+    db.session.flush()
+    db.session.rollback()
+    assert _names(user.id, 'rol') == []
+    
+    db.session.delete(db.session.get(JobApplication, app_obj.id))
+    db.session.commit()
+    assert _names(user.id, 'way') == []
+
+
+def test_suggester_sees_bulk_writes(app, user):
+    """Test bulk writes invalidate the user's index."""
+    assert _names(user.id, 'umb') == []
+    apply_bulk_operations(user.id, [{'company': 'Umbrella', 'position': 'Dev'}])
+    assert _names(user.id, 'umb') == ['Umbrella']
@@ -0,0 +1,87 @@
+"""
+Connection pool configuration tests
+"""
+import pytest
+from flask import Flask
+
+from app import db
+from app.db_pool import check_pool_capacity, configure_pool, pool_settings
+from prometheus_client import REGISTRY
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    return app
+
+
+def test_configure_pool_defaults():
+    """Test file databases get sized, pre-pinged and recycled pools."""
+    app = _app(SQLALCHEMY_DATABASE_URI='mysql+mysqlconnector://u:p@db/jobs', DB_POOL_SIZE=8)
+    configure_pool(app)
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+
+    assert options['pool_size'] == 8
+    assert options['max_overflow'] == 5
+    assert options['pool_timeout'] == 10
+    assert options['pool_recycle'] == 280
+    assert options['pool_pre_ping'] is True
+
+
+def test_configure_pool_keeps_explicit_options():
+    """Test SQLALCHEMY_ENGINE_OPTIONS set by hand are not overridden."""
+    app = _app(SQLALCHEMY_DATABASE_URI='sqlite:///app.db', DB_POOL_SIZE=8,
+               SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 2})
+    configure_pool(app)
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 2
+
+
+def test_configure_pool_skips_memory_sqlite():
+    """Test in-memory SQLite (a StaticPool) gets no pool options."""
+    app = _app(SQLALCHEMY_DATABASE_URI='sqlite:///:memory:')
+    configure_pool(app)
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == {}
+
+
+def test_pool_settings_from_budget():
+    """Test a connection budget is split over the gunicorn workers."""
+    assert pool_settings({'DB_CONNECTION_BUDGET': 40, 'WEB_CONCURRENCY': 4}) == (6, 4)
+    assert pool_settings({'DB_CONNECTION_BUDGET': 40, 'WEB_CONCURRENCY': 4, 'DB_MAX_OVERFLOW': 0}) == (6, 0)
+    assert pool_settings({'DB_CONNECTION_BUDGET': 40, 'DB_POOL_SIZE': 3}) == (3, 5)
+
+
+def test_check_pool_capacity(caplog):
+    """Test pools that could exceed max_connections are reported."""
+    app = _app(WEB_CONCURRENCY=4, DB_RESERVED_CONNECTIONS=5,
+               SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 10, 'max_overflow': 10, 'pool_recycle': 280})
+
+    report = check_pool_capacity(app, None, {'max_connections': 151, 'wait_timeout': 28800})
+    assert report['required'] == 85
+    assert not caplog.records
+
+    report = check_pool_capacity(app, None, {'max_connections': 50, 'wait_timeout': 200})
+    assert report['required'] == 85
+    messages = [record.getMessage() for record in caplog.records]
+    assert any('server allows 50' in message for message in messages)
+    assert any('wait_timeout (200)' in message for message in messages)
+
+
+def test_check_pool_capacity_strict():
+    """Test DB_POOL_STRICT refuses to start when over max_connections."""
+    app = _app(WEB_CONCURRENCY=4, DB_POOL_STRICT=True,
+               SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 10, 'max_overflow': 10})
+    with pytest.raises(RuntimeError):
+        check_pool_capacity(app, None, {'max_connections': 50})
+
+
+def test_check_pool_capacity_skips_sqlite(app):
+    """Test SQLite has no server limits to compare with."""
+    assert check_pool_capacity(app, db.engine) is None
+
+
+def test_checked_out_gauge(app):
+    """Test checked-out connections are tracked by pool events."""
+    before = REGISTRY.get_sample_value('jobtracker_db_pool_checked_out') or 0.0
+    with db.engine.connect():
+        assert REGISTRY.get_sample_value('jobtracker_db_pool_checked_out') == before + 1
+    assert REGISTRY.get_sample_value('jobtracker_db_pool_checked_out') == before
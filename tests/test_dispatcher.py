@@ -0,0 +1,65 @@
+"""
+Mail dispatcher (bounded worker pool) tests
+"""
+import pytest
+import threading
+from app.dispatcher import MailDispatcher
+
+
+@pytest.fixture
+def dispatcher():
+    """A small dispatcher that rejects immediately when full."""
+    d = MailDispatcher()
+    d.workers = 1
+    d.queue_size = 1
+    d.queue_timeout = 0
+    yield d
+    d.shutdown(timeout=1)
+
+
+def test_dispatcher_runs_jobs(dispatcher):
+    """Test queued jobs run and are counted."""
+    results = []
+    for i in range(2):
+        assert dispatcher.submit(results.append, i) is True
+    
+    assert dispatcher.drain(timeout=2)
+    assert sorted(results) == [0, 1]
+    stats = dispatcher.stats()
+    assert stats['completed'] == 2
+    assert stats['queue_depth'] == 0
+
+
+def test_dispatcher_rejects_when_full(dispatcher):
+    """Test backpressure: jobs beyond workers + queue size are rejected."""
+    release = threading.Event()
+    started = threading.Event()
+    
+    def blocker():
+        started.set()
+        release.wait(2)
+    
+    assert dispatcher.submit(blocker) is True
+    started.wait(2)
+    assert dispatcher.submit(lambda: None) is True   # Waits in the queue
+    assert dispatcher.submit(lambda: None) is False  # Queue is full
+    assert dispatcher.stats()['queue_depth'] == 1
+    assert dispatcher.stats()['rejected'] == 1
+    
+    release.set()
+    assert dispatcher.drain(timeout=2)
+
+
+def test_dispatcher_counts_failures(dispatcher):
+    """Test a failing job is counted and does not kill the worker."""
+    def boom():
+        raise RuntimeError('smtp down')
+    
+    dispatcher.submit(boom)
+    dispatcher.submit(lambda: None)
+    assert dispatcher.drain(timeout=2)
+    
+    stats = dispatcher.stats()
+    assert stats['failed'] == 1
+    assert stats['completed'] == 1
+    assert stats['latency_max_seconds'] >= 0
@@ -64,3 +64,28 @@ def test_email_with_none_user(application, app):
         
         # Test should pass (either handles gracefully or raises expected error)
         assert result is True
+
+
+def test_render_email_escapes_html(app, application):
+    """Test email HTML bodies escape user-supplied fields."""
+    from app.email_templates import render_email
+    application.notes = '<script>alert(1)</script>'
+    
+    text_body, html_body = render_email('application_reminder', name='Test', application=application)
+    
+    assert '<script>' in text_body
+    assert '<script>' not in html_body
+    assert '&lt;script&gt;' in html_body
+    assert 'Test Company' in html_body
+
+
+def test_render_email_batch(app, application):
+    """Test batch rendering returns one (text, html) pair per context."""
+    from app.email_templates import render_email_batch
+    contexts = [{'name': f'User {i}', 'application': application} for i in range(3)]
+    
+    rendered = render_email_batch('followup_reminder', contexts)
+    
+    assert len(rendered) == 3
+    assert rendered[2][0].startswith('Hi User 2,')
+    assert 'Follow-up Reminder' in rendered[2][1]
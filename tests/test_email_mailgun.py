@@ -0,0 +1,135 @@
+"""
+Mailgun batch API tests against a local HTTP stand-in
+"""
+import pytest
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from app import email_mailgun
+from app.models import User, JobApplication
+
+
+class MailgunStandIn(BaseHTTPRequestHandler):
+    """Records POSTed messages; fails the first `fail_first` requests with 503."""
+    
+    requests = []
+    fail_first = 0
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode()
+        if MailgunStandIn.fail_first:
+            MailgunStandIn.fail_first -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        MailgunStandIn.requests.append((self.path, parse_qs(body)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(b'{"message": "Queued"}')
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mailgun(monkeypatch):
+    """Run the stand-in and point the Mailgun client at it."""
+    MailgunStandIn.requests = []
+    MailgunStandIn.fail_first = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MailgunStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv('MAILGUN_API_BASE', f'http://127.0.0.1:{server.server_address[1]}/v3')
+    monkeypatch.setenv('MAILGUN_DOMAIN', 'mg.example.com')
+    monkeypatch.setenv('MAILGUN_API_KEY', 'key-test')
+    monkeypatch.setenv('MAILGUN_BACKOFF', '0')
+    email_mailgun.get_mailgun_session(refresh=True)
+    yield MailgunStandIn
+    server.shutdown()
+    server.server_close()
+
+
+def test_batch_packs_recipients(mailgun, monkeypatch):
+    """Test recipients are packed into as few API calls as the batch size allows."""
+    monkeypatch.setenv('MAILGUN_BATCH_SIZE', '2')
+    recipients = {f'user{i}@example.com': {'name': f'User {i}'} for i in range(5)}
+    
+    summary = email_mailgun.send_batch_mailgun('Hi %recipient.name%', recipients, 'Hello %recipient.name%')
+    
+    assert summary == {'sent': 5, 'failed': 0, 'requests': 3}
+    path, form = mailgun.requests[0]
+    assert path == '/v3/mg.example.com/messages'
+    assert form['to'] == ['user0@example.com', 'user1@example.com']
+    assert json.loads(form['recipient-variables'][0])['user1@example.com'] == {'name': 'User 1'}
+
+
+def test_batch_retries_with_backoff(mailgun):
+    """Test a 503 from Mailgun is retried on the pooled session."""
+    mailgun.fail_first = 2
+    summary = email_mailgun.send_batch_mailgun('Subject', {'a@example.com': {}}, 'Body')
+    
+    assert summary['sent'] == 1
+    assert len(mailgun.requests) == 1
+
+
+def test_reminders_one_message_per_user(mailgun, app):
+    """Test reminders are grouped per user and sent in one batched call."""
+    user1 = User(name='Ann', email='ann@example.com')
+    user2 = User(name=None, email='bob@example.com')
+    apps = [
+        (user1, JobApplication(company='Acme', position='Dev', status='Applied', follow_up_date=date(2025, 1, 2))),
+        (user1, JobApplication(company='Globex', position='QA', status='Interview')),
+        (user2, JobApplication(company='Initech', position='Ops', status='Applied')),
+    ]
+    
+    summary = email_mailgun.send_application_reminders_mailgun(apps)
+    
+    assert summary == {'sent': 2, 'failed': 0, 'requests': 1}
+    variables = json.loads(mailgun.requests[0][1]['recipient-variables'][0])
+    assert variables['ann@example.com']['count'] == 2
+    assert variables['ann@example.com']['companies'] == 'Acme, Globex'
+    assert variables['bob@example.com']['name'] == 'there'
+
+
+def test_batch_server_errors_are_not_resent(mailgun, monkeypatch):
+    """Test a 500 is not retried: Mailgun may already have accepted the batch."""
+    def fail_with_500(handler):
+        handler.rfile.read(int(handler.headers['Content-Length']))
+        MailgunStandIn.requests.append(None)
+        handler.send_response(500)
+        handler.end_headers()
+
+    monkeypatch.setattr(MailgunStandIn, 'do_POST', fail_with_500)
+    summary = email_mailgun.send_batch_mailgun('Subject', {'a@example.com': {}}, 'Body')
+
+    assert summary['failed'] == 1
+    assert len(mailgun.requests) == 1
+
+
+def test_reminder_html_escapes_names(mailgun, app):
+    """Test user names reach the HTML body escaped and the text body as-is."""
+    user = User(name='<b>Eve</b> & co', email='eve@example.com')
+    application = JobApplication(company='Acme', position='Dev', status='Applied')
+
+    email_mailgun.send_application_reminders_mailgun([(user, application)])
+
+    form = mailgun.requests[0][1]
+    variables = json.loads(form['recipient-variables'][0])['eve@example.com']
+    assert variables['name'] == '<b>Eve</b> & co'
+    assert variables['name_html'] == '&lt;b&gt;Eve&lt;/b&gt; &amp; co'
+    assert '%recipient.name_html%' in form['html'][0] and '%recipient.name%' not in form['html'][0]
+    assert '%recipient.name%' in form['text'][0]
+
+
+@pytest.mark.parametrize('batch_size, requests', [('0', 3), ('5000', 1)])
+def test_batch_size_is_clamped(mailgun, monkeypatch, batch_size, requests):
+    """Test MAILGUN_BATCH_SIZE is kept within 1..MAILGUN_MAX_RECIPIENTS."""
+    monkeypatch.setenv('MAILGUN_BATCH_SIZE', batch_size)
+    monkeypatch.setattr(email_mailgun, 'MAILGUN_MAX_RECIPIENTS', 3)
+    recipients = {f'user{i}@example.com': {} for i in range(3)}
+
+    summary = email_mailgun.send_batch_mailgun('Subject', recipients, 'Body')
+
+    assert summary == {'sent': 3, 'failed': 0, 'requests': requests}
@@ -0,0 +1,124 @@
+"""
+Embedded scheduler tests
+"""
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.embedded_scheduler import EmbeddedScheduler
+from app.models import SchedulerLease
+from app.schedules import CronSchedule
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the reminder jobs with recorders."""
+    log = []
+    monkeypatch.setattr('app.scheduler.send_daily_reminders', lambda: log.append('daily'))
+    monkeypatch.setattr('app.scheduler.send_upcoming_reminders', lambda: log.append('upcoming'))
+    return log
+
+
+def _scheduler(app):
+    scheduler = EmbeddedScheduler()
+    scheduler.init_app(app)
+    return scheduler
+
+
+def _run(scheduler, now):
+    threads = scheduler.run_pending(now)
+    for thread in threads.values():
+        thread.join(5)
+    return sorted(threads)
+
+
+def test_cron_previous():
+    """Test the latest scheduled time is found for daily and weekly crontabs."""
+    daily = CronSchedule(hour=9, minute=0)
+    assert daily.previous(datetime(2026, 10, 14, 9, 0, 30)) == datetime(2026, 10, 14, 9, 0)
+    assert daily.previous(datetime(2026, 10, 14, 8, 59)) == datetime(2026, 10, 13, 9, 0)
+
+    # 2026-10-19 is a Monday
+    monday = CronSchedule(hour=8, minute=0, day_of_week='monday')
+    assert monday.previous(datetime(2026, 10, 21, 12, 0)) == datetime(2026, 10, 19, 8, 0)
+    assert CronSchedule(minute='*/15', day_of_week='1-5').previous(
+        datetime(2026, 10, 18, 12, 7)) == datetime(2026, 10, 16, 23, 45)
+
+
+def test_cron_rejects_out_of_range():
+    """Test invalid crontab values fail at startup rather than never firing."""
+    with pytest.raises(ValueError):
+        CronSchedule(hour=24)
+
+
+def test_runs_due_job_once(app, calls):
+    """Test a due job runs once per scheduled time."""
+    scheduler = _scheduler(app)
+    now = datetime(2026, 10, 14, 9, 5)
+
+    assert _run(scheduler, now) == ['send-daily-reminders']
+    assert _run(scheduler, now + timedelta(minutes=1)) == []
+    assert calls == ['daily']
+
+    lease = db.session.get(SchedulerLease, 'send-daily-reminders')
+    assert lease.slot == datetime(2026, 10, 14, 9, 0)
+    assert lease.finished_at is not None
+
+    assert _run(scheduler, now + timedelta(days=1)) == ['send-daily-reminders']
+    assert calls == ['daily', 'daily']
+
+
+def test_only_one_worker_claims_a_run(app, calls):
+    """Test two workers sharing the database run the job once between them."""
+    app.config['SCHEDULER_MISFIRE_GRACE'] = 7200
+    first, second = _scheduler(app), _scheduler(app)
+    now = datetime(2026, 10, 19, 9, 1)
+
+    assert _run(first, now) == ['send-daily-reminders', 'send-upcoming-reminders']
+    assert _run(second, now) == []
+    assert sorted(calls) == ['daily', 'upcoming']
+
+
+def test_missed_runs_are_skipped(app, calls):
+    """Test runs later than the misfire grace period do not fire."""
+    app.config['SCHEDULER_MISFIRE_GRACE'] = 600
+    scheduler = _scheduler(app)
+
+    assert _run(scheduler, datetime(2026, 10, 14, 9, 11)) == []
+    assert calls == []
+
+
+def test_expired_lease_is_taken_over(app, calls):
+    """Test a run held by a worker that died is retried after the lease."""
+    db.session.add(SchedulerLease(
+        name='send-daily-reminders', slot=datetime(2026, 10, 14, 9, 0), owner='dead-worker',
+        leased_until=datetime(2026, 10, 14, 9, 30)
+    ))
+    db.session.commit()
+    scheduler = _scheduler(app)
+
+    assert _run(scheduler, datetime(2026, 10, 14, 9, 20)) == []
+    assert _run(scheduler, datetime(2026, 10, 14, 9, 31)) == ['send-daily-reminders']
+    assert calls == ['daily']
+
+
+def test_dead_workers_run_is_taken_over_with_default_settings(app, calls):
+    """Test takeover after the default lease, even though the run is past the misfire grace."""
+    assert app.config['SCHEDULER_LEASE'] >= app.config['SCHEDULER_MISFIRE_GRACE']
+    scheduler = _scheduler(app)
+    slot = datetime(2026, 10, 14, 9, 0)
+    db.session.add(SchedulerLease(
+        name='send-daily-reminders', slot=slot, owner='dead-worker',
+        leased_until=slot + timedelta(seconds=scheduler.lease)
+    ))
+    db.session.commit()
+
+    assert _run(scheduler, slot + timedelta(seconds=scheduler.lease + 60)) == ['send-daily-reminders']
+    assert calls == ['daily']
+
+
+def test_init_app_does_not_start_the_loop(app):
+    """Test creating the app (CLI, cron, Celery) never starts the scheduler thread."""
+    app.config['SCHEDULER_ENABLED'] = True
+    scheduler = _scheduler(app)
+    assert scheduler.enabled
+    assert scheduler._thread is None
@@ -0,0 +1,54 @@
+"""
+SQL instrumentation tests
+"""
+import logging
+
+from app.instrumentation import RequestStats
+
+
+def test_server_timing_header(client, auth, user, application):
+    """Test responses report statement count and DB time."""
+    auth.login()
+    response = client.get('/api/applications')
+    
+    timings = response.headers.getlist('Server-Timing')
+    assert timings[0].startswith('db;dur=')
+    assert 'queries"' in timings[0]
+    assert timings[1].startswith('app;dur=')
+
+
+def test_request_log_line(client, auth, user, application, caplog):
+    """Test each request logs one structured line with the SQL totals."""
+    auth.login()
+    with caplog.at_level(logging.INFO, logger='app.instrumentation'):
+        client.get('/api/stats')
+    
+    record = [r for r in caplog.records if r.name == 'app.instrumentation'][-1]
+    assert record.levelno == logging.INFO
+    assert 'path=/api/stats' in record.getMessage()
+    assert record.sql['queries'] >= 1
+    assert record.sql['db_ms'] >= 0
+
+
+def test_query_budget_warning(app, client, auth, user, application, caplog):
+    """Test exceeding the query budget logs a warning with the slowest statements."""
+    app.config['SQL_QUERY_BUDGET'] = 1
+    auth.login()
+    with caplog.at_level(logging.INFO, logger='app.instrumentation'):
+        client.get('/api/applications')
+    
+    record = [r for r in caplog.records if r.name == 'app.instrumentation'][-1]
+    assert record.levelno == logging.WARNING
+    assert 'exceeded' in record.getMessage()
+    assert record.sql['slowest'][0]['sql'].startswith('SELECT')
+
+
+def test_request_stats_keeps_slowest():
+    """Test only the N slowest statements are kept, slowest first."""
+    stats = RequestStats(keep_slowest=2)
+    for elapsed, sql in [(0.001, 'A'), (0.005, 'B'), (0.002, 'C'), (0.0001, 'D')]:
+        stats.record(sql, elapsed)
+    
+    summary = stats.as_dict()
+    assert summary['queries'] == 4
+    assert [entry['sql'] for entry in summary['slowest']] == ['B', 'C']
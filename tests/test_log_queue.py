@@ -0,0 +1,91 @@
+"""
+Queue-based logging tests
+"""
+import json
+import logging
+import queue
+
+from app.log_queue import DroppingQueueHandler, JsonFormatter, install_queue_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+    
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_json_formatter_includes_extra():
+    """Test JSON lines carry the message, level and extra fields."""
+    record = logging.makeLogRecord({
+        'name': 'app.test', 'levelno': logging.WARNING, 'levelname': 'WARNING',
+        'msg': 'queries=%s', 'args': (25,), 'sql': {'queries': 25}
+    })
+    entry = json.loads(JsonFormatter().format(record))
+    
+    assert entry['message'] == 'queries=25'
+    assert entry['level'] == 'WARNING'
+    assert entry['sql'] == {'queries': 25}
+
+
+def test_full_queue_drops_and_counts():
+    """Test a full queue drops records instead of blocking."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.getLogger('tests.log_queue.drops')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.warning('message %s', i)
+    finally:
+        logger.removeHandler(handler)
+    
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_prepare_merges_args_without_touching_original():
+    """Test queued records are pre-merged copies; the original keeps its args."""
+    handler = DroppingQueueHandler(queue.Queue())
+    record = logging.makeLogRecord({'msg': 'user %s', 'args': ('a@b.com',)})
+    prepared = handler.prepare(record)
+    
+    assert prepared.msg == 'user a@b.com' and prepared.args is None
+    assert record.args == ('a@b.com',)
+
+
+def test_install_queue_logging_delivers_and_filters():
+    """Test records reach the target handler; those below its level are never queued."""
+    logger = logging.getLogger('tests.log_queue.install')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    target = ListHandler(logging.WARNING)
+    installed = install_queue_logging(logger, [target])
+    
+    logger.info('not queued %s', 1)
+    logger.warning('queued %s', 2)
+    installed.stop()
+    
+    assert [r.getMessage() for r in target.records] == ['queued 2']
+    
+    # Reinstalling replaces the previous handler rather than adding another
+    second = install_queue_logging(logger, [ListHandler()])
+    assert logger.handlers == [second.handler]
+    second.stop()
+    logger.removeHandler(second.handler)
+
+
+def test_app_records_bypass_root_handlers(app):
+    """Test app.* records only go through the queue, never root's synchronous handlers."""
+    root_handler = ListHandler()
+    logging.getLogger().addHandler(root_handler)
+    try:
+        logging.getLogger('app.routes').warning('queued only')
+    finally:
+        logging.getLogger().removeHandler(root_handler)
+    
+    assert app.logger.propagate is False
+    assert any(isinstance(h, DroppingQueueHandler) for h in app.logger.handlers)
+    assert root_handler.records == []
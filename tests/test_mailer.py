@@ -0,0 +1,110 @@
+"""
+Batch SMTP sender tests
+"""
+import pytest
+import smtplib
+from flask_mail import Connection, Message
+from app.mailer import SMTPBatchSender, TokenBucket, send_messages
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP that records what it is asked to send."""
+    
+    def __init__(self, log, fail_on=None):
+        self.log = log
+        self.fail_on = fail_on or set()
+    
+    def sendmail(self, sender, recipients, body, *args):
+        self.log['attempts'] += 1
+        if self.log['attempts'] in self.fail_on:
+            raise smtplib.SMTPServerDisconnected('connection dropped')
+        self.log['sent'].append(recipients)
+    
+    def quit(self):
+        self.log['quit'] += 1
+    
+    def close(self):
+        self.log['closed'] += 1
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Replace SMTP host creation with FakeSMTP and record connections."""
+    log = {'connections': 0, 'attempts': 0, 'sent': [], 'quit': 0, 'closed': 0, 'fail_on': set()}
+    
+    def configure_host(self):
+        log['connections'] += 1
+        return FakeSMTP(log, log['fail_on'])
+    
+    monkeypatch.setattr(Connection, 'configure_host', configure_host)
+    return log
+
+
+def _messages(count):
+    return [Message(f'Message {i}', sender='tracker@example.com', recipients=[f'user{i}@example.com'])
+            for i in range(count)]
+
+
+def test_batch_reuses_one_connection(app, smtp):
+    """Test many messages share a single SMTP connection."""
+    result = send_messages(_messages(5))
+    
+    assert result == {'sent': 5, 'failed': 0, 'connections': 1}
+    assert smtp['connections'] == 1
+    assert smtp['quit'] == 1
+
+
+def test_batch_recycles_connection(app, smtp):
+    """Test the connection is recycled after the configured message count."""
+    with SMTPBatchSender(max_messages=2) as sender:
+        for msg in _messages(5):
+            sender.send(msg)
+    
+    assert sender.sent == 5
+    assert smtp['connections'] == 3
+
+
+def test_batch_reconnects_on_disconnect(app, smtp):
+    """Test a dropped connection is replaced and the message retried."""
+    smtp['fail_on'].add(2)
+    result = send_messages(_messages(3))
+    
+    assert result['sent'] == 3
+    assert result['connections'] == 2
+    assert len(smtp['sent']) == 3
+    assert smtp['closed'] == 1
+
+
+def test_batch_gives_up_after_retries(app, smtp):
+    """Test a message is reported failed once retries are exhausted."""
+    smtp['fail_on'].update({1, 2})
+    with SMTPBatchSender(retries=1) as sender:
+        assert sender.send(_messages(1)[0]) is False
+    
+    assert sender.failed == 1
+
+
+def test_token_bucket_spaces_out_events(monkeypatch):
+    """Test the bucket sleeps just long enough to hold the rate."""
+    clock = {'now': 100.0}
+    monkeypatch.setattr('app.mailer.time.monotonic', lambda: clock['now'])
+    monkeypatch.setattr('app.mailer.time.sleep', lambda seconds: clock.update(now=clock['now'] + seconds))
+    bucket = TokenBucket(rate=2.0)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.5, 0.5, 0.5, 0.5]
+    assert clock['now'] == 102.0
+
+
+def test_sender_rate_limit_throttles_every_message(app, smtp, monkeypatch):
+    """Test rate_limit (per minute) is applied per message sent."""
+    acquired = []
+    monkeypatch.setattr(TokenBucket, 'acquire', lambda self: acquired.append(self.rate) or 0.0)
+
+    with SMTPBatchSender(rate_limit=120) as sender:
+        for i in range(3):
+            sender.send(Message('Hi', sender='from@example.com', recipients=[f'u{i}@example.com'], body='x'))
+
+    assert acquired == [2.0, 2.0, 2.0]
+    assert len(smtp['sent']) == 3
@@ -0,0 +1,71 @@
+"""
+Prometheus metrics tests
+"""
+from app import db, mail_dispatcher
+from app.metrics import TimedQueuePool, record_reminder_run
+from prometheus_client import REGISTRY
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint(client):
+    """Test /metrics serves the Prometheus text format without login."""
+    client.get('/')
+    response = client.get('/metrics')
+    
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert b'jobtracker_http_request_duration_seconds_bucket' in response.data
+
+
+def test_metrics_token(app, client):
+    """Test METRICS_TOKEN requires a bearer token."""
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+def test_request_latency_per_endpoint(client):
+    """Test request latency is labelled with the endpoint name."""
+    labels = {'method': 'GET', 'endpoint': 'main.index', 'status': '200'}
+    before = _sample('jobtracker_http_request_duration_seconds_count', **labels)
+    client.get('/')
+    assert _sample('jobtracker_http_request_duration_seconds_count', **labels) == before + 1
+
+
+def test_pool_checkout_wait(app):
+    """Test the engine uses the timed pool and records checkouts."""
+    assert isinstance(db.engine.pool, TimedQueuePool)
+    db.engine.dispose()
+    before = _sample('jobtracker_db_pool_checkout_wait_seconds_count')
+    with db.engine.connect():
+        pass
+    assert _sample('jobtracker_db_pool_checkout_wait_seconds_count') == before + 1
+
+
+def test_mail_send_duration(app):
+    """Test dispatcher jobs are timed by outcome."""
+    before_ok = _sample('jobtracker_mail_send_duration_seconds_count', outcome='ok')
+    before_error = _sample('jobtracker_mail_send_duration_seconds_count', outcome='error')
+    
+    def fail():
+        raise RuntimeError('boom')
+    
+    mail_dispatcher.submit(lambda: None)
+    mail_dispatcher.submit(fail)
+    assert mail_dispatcher.drain(timeout=5)
+    
+    assert _sample('jobtracker_mail_send_duration_seconds_count', outcome='ok') == before_ok + 1
+    assert _sample('jobtracker_mail_send_duration_seconds_count', outcome='error') == before_error + 1
+    assert _sample('jobtracker_mail_queue_depth') == 0
+
+
+def test_record_reminder_run():
+    """Test reminder summaries feed the reminder counters."""
+    before = _sample('jobtracker_reminders_total', kind='daily', result='sent')
+    record_reminder_run('daily', {'sent': 3, 'failed': 1, 'emails': 2}, 1.5)
+    
+    assert _sample('jobtracker_reminders_total', kind='daily', result='sent') == before + 3
+    assert _sample('jobtracker_reminder_last_run_timestamp_seconds', kind='daily') > 0
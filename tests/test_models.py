@@ -136,3 +136,30 @@ def test_job_application_status_values(app, user):
             apps = JobApplication.query.filter_by(status=status).all()
             assert len(apps) == 1
             assert apps[0].status == status
+
+
+def test_job_application_indexes(app):
+    """Test composite indexes for the hot query shapes are created."""
+    with app.app_context():
+        from sqlalchemy import inspect
+        indexes = {
+            idx['name']: idx['column_names']
+            for idx in inspect(db.engine).get_indexes('job_application')
+        }
+        
+        assert indexes['ix_job_application_user_date_applied'][0] == 'user_id'
+        assert indexes['ix_job_application_user_status'] == ['user_id', 'status']
+        assert indexes['ix_job_application_follow_up_status'] == ['follow_up_date', 'status']
+
+
+def test_job_application_updated_at(app, user):
+    """Test updated_at is set on insert and moves forward on update."""
+    app_obj = JobApplication(company='Stamp Co', position='Dev', user_id=user.id)
+    db.session.add(app_obj)
+    db.session.commit()
+    created = app_obj.updated_at
+    assert created is not None
+    
+    app_obj.status = 'Interview'
+    db.session.commit()
+    assert app_obj.updated_at > created
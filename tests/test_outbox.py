@@ -0,0 +1,168 @@
+"""
+Status change outbox tests
+"""
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.mailer import SMTPBatchSender
+from app.models import JobApplication, StatusChangeOutbox
+from app.outbox import drain_all, drain_outbox, record_status_change
+
+
+@pytest.fixture
+def outgoing(monkeypatch):
+    """Capture messages handed to the SMTP batch sender."""
+    log = {'messages': [], 'fail': False}
+
+    def send(self, msg):
+        if log['fail']:
+            return False
+        log['messages'].append(msg)
+        return True
+
+    monkeypatch.setattr(SMTPBatchSender, 'send', send)
+    return log
+
+
+def _edit_status(client, application, status):
+    return client.post(f'/applications/{application.id}/edit', data={
+        'company': application.company,
+        'position': application.position,
+        'status': status,
+    })
+
+
+def test_edit_writes_outbox_row(client, auth, user, application, outgoing):
+    """Test a status change is queued, not sent, by the edit request."""
+    auth.login()
+    _edit_status(client, application, 'Interview')
+
+    rows = StatusChangeOutbox.query.all()
+    assert [(r.application_id, r.old_status, r.new_status) for r in rows] == [(application.id, 'Applied', 'Interview')]
+    assert outgoing['messages'] == []
+
+
+def test_edit_without_status_change_writes_nothing(client, auth, user, application):
+    """Test edits that keep the status queue no notification."""
+    auth.login()
+    _edit_status(client, application, 'Applied')
+    assert StatusChangeOutbox.query.count() == 0
+
+
+def test_outbox_row_rolls_back_with_update(app, application):
+    """Test the outbox row shares the application update's transaction."""
+    application.status = 'Offer'
+    record_status_change(application, 'Applied')
+    db.session.rollback()
+
+    assert StatusChangeOutbox.query.count() == 0
+    assert db.session.get(JobApplication, application.id).status == 'Applied'
+
+
+def test_drain_sends_and_deletes(app, application, outgoing):
+    """Test draining sends one email per application and empties the outbox."""
+    application.status = 'Interview'
+    record_status_change(application, 'Applied')
+    application.status = 'Offer'
+    record_status_change(application, 'Interview')
+    db.session.commit()
+
+    summary = drain_outbox()
+
+    assert summary == {'claimed': 2, 'sent': 1, 'failed': 0, 'skipped': 0}
+    assert [msg.subject for msg in outgoing['messages']] == ['Status Update: Test Company - Offer']
+    assert 'Applied' in outgoing['messages'][0].body
+    assert StatusChangeOutbox.query.count() == 0
+
+
+def test_drain_skips_changes_that_cancel_out(app, application, outgoing):
+    """Test Applied -> Interview -> Applied sends nothing."""
+    db.session.add_all([
+        StatusChangeOutbox(application_id=application.id, old_status='Applied', new_status='Interview'),
+        StatusChangeOutbox(application_id=application.id, old_status='Interview', new_status='Applied'),
+    ])
+    db.session.commit()
+
+    assert drain_outbox()['skipped'] == 2
+    assert outgoing['messages'] == []
+
+
+def test_failed_notifications_are_retried(app, application, outgoing):
+    """Test failed rows stay queued and are retried after the lease."""
+    application.status = 'Interview'
+    record_status_change(application, 'Applied')
+    db.session.commit()
+
+    outgoing['fail'] = True
+    assert drain_outbox(lease=60)['failed'] == 1
+    row = StatusChangeOutbox.query.one()
+    assert row.attempts == 1
+
+    # Not retried until the retry delay has passed
+    outgoing['fail'] = False
+    assert drain_outbox(lease=60)['claimed'] == 0
+
+    row.claimed_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert drain_outbox(lease=60)['sent'] == 1
+    assert StatusChangeOutbox.query.count() == 0
+
+
+def test_abandoned_batch_is_reclaimed(app, application, outgoing):
+    """Test rows leased by a worker that died are picked up after the lease."""
+    db.session.add(StatusChangeOutbox(
+        application_id=application.id, old_status='Applied', new_status='Offer',
+        claimed_by='dead-worker', claimed_until=datetime.utcnow() + timedelta(minutes=5)
+    ))
+    db.session.commit()
+    assert drain_outbox()['claimed'] == 0
+
+    StatusChangeOutbox.query.one().claimed_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert drain_outbox()['sent'] == 1
+
+
+def test_drain_all_batches(app, user, outgoing):
+    """Test drain_all keeps claiming batches until the outbox is empty."""
+    for i in range(5):
+        job = JobApplication(company=f'Company {i}', position='Dev', status='Interview', user_id=user.id)
+        db.session.add(job)
+        db.session.flush()
+        record_status_change(job, 'Applied')
+    db.session.commit()
+
+    summary = drain_all(batch_size=2)
+
+    assert summary['sent'] == 5
+    assert StatusChangeOutbox.query.count() == 0
+
+
+def test_bulk_status_change_writes_outbox_row(client, auth, user, application, outgoing):
+    """Test status changes made through the bulk API are queued too."""
+    auth.login()
+    client.post('/api/applications/bulk', json=[
+        {'id': application.id, 'status': 'Interview'},
+        {'company': 'New Co', 'position': 'Dev', 'status': 'Offer'},
+    ])
+
+    rows = StatusChangeOutbox.query.all()
+    assert [(r.application_id, r.old_status, r.new_status) for r in rows] == [(application.id, 'Applied', 'Interview')]
+
+    client.post('/api/applications/bulk', json=[{'id': application.id, 'notes': 'No status change'}])
+    assert StatusChangeOutbox.query.count() == 1
+
+
+def test_message_errors_count_as_failed_attempts(app, application, outgoing, monkeypatch):
+    """Test a notification that cannot be built gives up after max_attempts."""
+    def broken(*args):
+        raise RuntimeError('template error')
+
+    monkeypatch.setattr('app.email.status_change_message', broken)
+    application.status = 'Interview'
+    record_status_change(application, 'Applied')
+    db.session.commit()
+
+    for attempt in range(2):
+        assert drain_outbox(lease=0, max_attempts=2)['failed'] == 1
+    assert drain_outbox(lease=0, max_attempts=2)['claimed'] == 0
+    assert StatusChangeOutbox.query.one().attempts == 2
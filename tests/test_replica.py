@@ -0,0 +1,98 @@
+"""
+Read replica routing tests (two SQLite files stand in for primary and replica)
+"""
+import pytest
+
+from app import create_app, db, read_replica
+from app.models import JobApplication, User
+from config import Config
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    class ReplicaConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primary.db"}'
+        REPLICA_DATABASE_URI = f'sqlite:///{tmp_path / "replica.db"}'
+        WTF_CSRF_ENABLED = False
+        MAIL_SUPPRESS_SEND = True
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(read_replica.engine)
+        user = User(name='Test User', email='test@example.com')
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.metadata.drop_all(read_replica.engine)
+
+
+@pytest.fixture
+def replica_client(replica_app):
+    client = replica_app.test_client()
+    client.post('/auth/login', data={'email': 'test@example.com', 'password': 'password123'})
+    with client.session_transaction() as sess:
+        sess.pop('_primary_until', None)
+    return client
+
+
+def _replicate():
+    """Copy every table from the primary to the replica."""
+    with db.engines[None].connect() as primary, read_replica.engine.begin() as replica:
+        for table in db.metadata.sorted_tables:
+            replica.execute(table.delete())
+            rows = [row._asdict() for row in primary.execute(table.select())]
+            if rows:
+                replica.execute(table.insert(), rows)
+
+
+def _add_application(company):
+    user = User.query.filter_by(email='test@example.com').first()
+    db.session.add(JobApplication(company=company, position='Engineer', status='Applied', user_id=user.id))
+    db.session.commit()
+
+
+def test_get_views_read_from_replica(replica_app, replica_client):
+    """Test decorated GET views read from the replica bind."""
+    _replicate()
+    _add_application('Acme')
+
+    # Not replicated yet: the replica has no applications
+    assert replica_client.get('/api/applications').get_json()['applications'] == []
+    assert replica_client.get('/api/stats').get_json()['total'] == 0
+
+    _replicate()
+    applications = replica_client.get('/api/applications').get_json()['applications']
+    assert [a['company'] for a in applications] == ['Acme']
+
+
+def test_read_your_writes(replica_app, replica_client):
+    """Test a user reads from the primary right after committing a write."""
+    _replicate()
+    response = replica_client.post('/api/applications', json={'company': 'Acme', 'position': 'Engineer'})
+    assert response.status_code == 201
+
+    applications = replica_client.get('/api/applications').get_json()['applications']
+    assert [a['company'] for a in applications] == ['Acme']
+
+    # Once the sticky window has passed, reads go back to the (lagging) replica
+    with replica_client.session_transaction() as sess:
+        sess['_primary_until'] = 0
+    assert replica_client.get('/api/applications').get_json()['applications'] == []
+
+
+def test_undecorated_views_use_primary(replica_app, replica_client):
+    """Test views without use_replica keep reading from the primary."""
+    _replicate()
+    _add_application('Acme')
+    suggestions = replica_client.get('/api/companies/suggest?q=ac').get_json()['suggestions']
+    assert [s['name'] for s in suggestions] == ['Acme']
+
+
+def test_no_replica_configured(app):
+    """Test everything reads from the primary without REPLICA_DATABASE_URI."""
+    assert read_replica.engine is None
@@ -176,6 +176,11 @@ def test_search_applications(client, auth, user, app):
     assert response.status_code == 200
     assert b'Google' in response.data
     
+    # Search also covers the position
+    response = client.get('/applications?company=develop')
+    assert b'Microsoft' in response.data
+    assert b'Google' not in response.data
+    
     # Search by status
     response = client.get('/applications?status=Interview')
     assert response.status_code == 200
@@ -207,3 +212,68 @@ def test_pagination(client, auth, user, app):
     response = client.get('/applications?page=2')
     assert response.status_code == 200
     # Should have remaining applications
+
+
+def test_dashboard_stats_count_all_applications(client, auth, user, app):
+    """Test dashboard stats cover all applications, not just the recent five."""
+    with app.app_context():
+        for i in range(7):
+            db.session.add(JobApplication(
+                company=f'Company {i}',
+                position='Engineer',
+                status='Interview' if i < 3 else 'Applied',
+                user_id=user.id
+            ))
+        db.session.commit()
+    
+    auth.login()
+    response = client.get('/dashboard')
+    assert response.status_code == 200
+    assert b'<h3 class="mt-2">7</h3>' in response.data
+    assert b'Interview: 3' in response.data
+    assert b'View All Applications' in response.data
+
+
+def test_pagination_next_cursor(client, auth, user, app):
+    """Test the next link walks to the remaining applications."""
+    import re
+    with app.app_context():
+        for i in range(15):
+            db.session.add(JobApplication(company=f'Company {i}', position='Engineer', user_id=user.id))
+        db.session.commit()
+    
+    auth.login()
+    response = client.get('/applications')
+    next_url = re.search(rb'href="(/applications\?cursor=[^"]+)"', response.data).group(1)
+    
+    response = client.get(next_url.decode().replace('&amp;', '&'))
+    assert response.status_code == 200
+    assert b'Company 14' in response.data
+    assert b'Company 0' not in response.data
+
+
+def test_pagination_total_is_not_labelled_approximate_when_exact(client, auth, user, app):
+    """Test SQLite counts on the first page only, without the ~ of an estimate."""
+    import re
+    with app.app_context():
+        for i in range(15):
+            db.session.add(JobApplication(company=f'Company {i}', position='Engineer', user_id=user.id))
+        db.session.commit()
+    
+    auth.login()
+    response = client.get('/applications')
+    assert b'Showing 10 of 15 application(s)' in response.data
+    
+    next_url = re.search(rb'href="(/applications\?cursor=[^"]+)"', response.data).group(1)
+    response = client.get(next_url.decode().replace('&amp;', '&'))
+    assert b'Showing 5 application(s)' in response.data
+
+
+def test_applications_list_not_modified(client, auth, user, application):
+    """Test the applications page answers 304 when nothing changed."""
+    auth.login()
+    response = client.get('/applications')
+    etag = response.headers['ETag']
+    
+    response = client.get('/applications', headers={'If-None-Match': etag})
+    assert response.status_code == 304
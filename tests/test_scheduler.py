@@ -0,0 +1,227 @@
+"""
+Reminder scheduler tests
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+from app import db, scheduler
+from app.models import User, JobApplication, ReminderLog
+from app.reminder_log import claim_reminders
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Capture reminders instead of sending email."""
+    calls = []
+    monkeypatch.setattr(scheduler, 'send_followup_reminder',
+                        lambda user, appn, **kwargs: calls.append((user.email, appn.company)) or True)
+    monkeypatch.setattr(scheduler, 'send_reminder_digest',
+                        lambda user, apps, **kwargs: calls.append((user.email, [a.company for a in apps])) or True)
+    return calls
+
+
+def _add_users_with_reminders(count, follow_up_date, prefix='user'):
+    for i in range(count):
+        user = User(name=f'User {i}', email=f'{prefix}{i}@example.com')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all([
+            JobApplication(company=f'Due {i}', position='Dev', status='Applied',
+                           follow_up_date=follow_up_date, user_id=user.id),
+            JobApplication(company=f'Closed {i}', position='Dev', status='Rejected',
+                           follow_up_date=follow_up_date, user_id=user.id),
+        ])
+    db.session.commit()
+
+
+def test_daily_reminders_summary(app, sent):
+    """Test daily reminders only cover open applications due today."""
+    _add_users_with_reminders(3, date.today())
+    
+    summary = scheduler.send_daily_reminders()
+    
+    assert summary['total_applications'] == 3
+    assert summary['sent'] == 3
+    assert summary['failed'] == 0
+    assert sorted(company for _, company in sent) == ['Due 0', 'Due 1', 'Due 2']
+
+
+def test_daily_reminders_single_query(app, sent):
+    """Test reminder selection does not look up users per application."""
+    _add_users_with_reminders(5, date.today())
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(Engine, 'before_cursor_execute', count)
+    try:
+        scheduler.send_daily_reminders()
+    finally:
+        event.remove(Engine, 'before_cursor_execute', count)
+    
+    reminder_statements = [s for s in statements if 'reminder_log' not in s]
+    ledger_statements = [s for s in statements if 'reminder_log' in s and 'DELETE' not in s]
+    selects = [s for s in reminder_statements if s.lstrip().upper().startswith('SELECT')]
+    assert len(selects) == 1
+    # Claim (insert, take over, select) and record results once per batch, not per row
+    assert len(ledger_statements) == 4
+    assert len(sent) == 5
+
+
+def test_upcoming_reminders_range(app, sent):
+    """Test upcoming reminders include follow-ups within the window only."""
+    _add_users_with_reminders(1, date.today() + timedelta(days=2))
+    _add_users_with_reminders(1, date.today() + timedelta(days=10), prefix='later')
+    
+    summary = scheduler.send_upcoming_reminders(days_ahead=3)
+    
+    assert summary['total_applications'] == 1
+    assert summary['sent'] == 1
+
+
+def test_daily_reminders_digest_per_user(app, sent):
+    """Test users with several due applications get a single digest email."""
+    digest_user = User(name='Digest', email='digest@example.com')
+    single_user = User(name='Single', email='single@example.com', reminder_digest=False)
+    db.session.add_all([digest_user, single_user])
+    db.session.flush()
+    for i in range(3):
+        db.session.add(JobApplication(company=f'Digest {i}', position='Dev', status='Applied',
+                                      follow_up_date=date.today(), user_id=digest_user.id))
+        db.session.add(JobApplication(company=f'Single {i}', position='Dev', status='Interview',
+                                      follow_up_date=date.today(), user_id=single_user.id))
+    db.session.commit()
+    
+    summary = scheduler.send_daily_reminders()
+    
+    assert summary['total_applications'] == 6
+    assert summary['sent'] == 6
+    assert summary['emails'] == 4
+    assert ('digest@example.com', ['Digest 0', 'Digest 1', 'Digest 2']) in sent
+    assert len([email for email, _ in sent if email == 'single@example.com']) == 3
+
+
+def test_parse_shard():
+    """Test N/M shard specs are 1-based on the command line."""
+    assert scheduler.parse_shard('1/1') == (0, 1)
+    assert scheduler.parse_shard('3/4') == (2, 4)
+    for bad in ('0/4', '5/4', '4', 'a/b', '1/0'):
+        with pytest.raises(ValueError):
+            scheduler.parse_shard(bad)
+
+
+def test_shards_partition_users(app, sent):
+    """Test every due user is covered by exactly one shard."""
+    _add_users_with_reminders(7, date.today())
+    
+    summaries = []
+    for index in range(3):
+        summaries.append(scheduler.send_daily_reminders(shard=(index, 3)))
+    
+    assert sorted(summary['total_applications'] for summary in summaries) == [2, 2, 3]
+    assert sorted(company for _, company in sent) == [f'Due {i}' for i in range(7)]
+    
+    merged = scheduler.merge_summaries(summaries)
+    assert merged['date'] == summaries[0]['date']
+    assert merged['total_applications'] == 7
+    assert merged['sent'] == 7
+    assert merged['emails'] == 7
+
+
+def test_sub_shards_stay_inside_shard(app):
+    """Test fanning a shard out over processes covers only that shard's users."""
+    _add_users_with_reminders(12, date.today())
+    shard_users = {user.id for user in User.query.all() if user.id % 3 == 1}
+    
+    covered = []
+    for k in range(2):
+        # The sub-shards send_daily_reminders_sharded((1, 3), processes=2) runs
+        covered.extend(user.id for user, _ in scheduler.due_reminders(date.today(), shard=(1 + 3 * k, 6)))
+    
+    assert sorted(covered) == sorted(shard_users)
+
+
+def test_rerun_skips_sent_reminders(app, sent):
+    """Test a second run the same day sends nothing again."""
+    _add_users_with_reminders(3, date.today())
+    
+    first = scheduler.send_daily_reminders()
+    second = scheduler.send_daily_reminders()
+    
+    assert first['sent'] == 3
+    assert second['total_applications'] == 0
+    assert second['sent'] == 0
+    assert second['skipped'] == 3
+    assert len(sent) == 3
+    assert ReminderLog.query.filter_by(status='sent', kind='daily').count() == 3
+
+
+def test_rerun_retries_failed_reminders(app, monkeypatch):
+    """Test reminders that failed are sent by the next run."""
+    _add_users_with_reminders(2, date.today())
+    monkeypatch.setattr(scheduler, 'send_followup_reminder', lambda user, appn, **kwargs: False)
+    assert scheduler.send_daily_reminders()['failed'] == 2
+    
+    monkeypatch.setattr(scheduler, 'send_followup_reminder', lambda user, appn, **kwargs: True)
+    summary = scheduler.send_daily_reminders()
+    
+    assert summary['sent'] == 2
+    assert summary['skipped'] == 0
+
+
+def test_claims_are_exclusive(app):
+    """Test a reminder claimed by one run is skipped by another until the claim expires."""
+    _add_users_with_reminders(2, date.today())
+    ids = [a.id for a in JobApplication.query.filter_by(status='Applied')]
+    
+    assert claim_reminders(ids, date.today(), 'daily', 'run-a') == set(ids)
+    assert claim_reminders(ids, date.today(), 'daily', 'run-b') == set()
+    # Another kind or date is a different reminder
+    assert claim_reminders(ids, date.today(), 'upcoming', 'run-b') == set(ids)
+    
+    # run-a crashed: its claims can be taken over once they time out
+    db.session.execute(update(ReminderLog).values(claimed_at=datetime.utcnow() - timedelta(hours=1)))
+    db.session.commit()
+    assert claim_reminders(ids, date.today(), 'daily', 'run-b', claim_timeout=900) == set(ids)
+
+
+def test_due_reminders_pages_end_on_user_boundary(app):
+    """Test keyset pages never split one user's applications."""
+    _add_users_with_reminders(3, date.today())
+    user = User.query.filter_by(email='user0@example.com').first()
+    db.session.add_all([
+        JobApplication(company=f'Extra {i}', position='Dev', status='Applied',
+                       follow_up_date=date.today(), user_id=user.id)
+        for i in range(4)
+    ])
+    db.session.commit()
+    
+    pairs = list(scheduler.due_reminders(date.today(), batch_size=2))
+    
+    assert len(pairs) == 7
+    assert len({appn.id for _, appn in pairs}) == 7
+    user_order = [u.id for u, _ in pairs]
+    assert user_order == sorted(user_order)
+
+
+def test_due_user_ids_pages(app):
+    """Test due user IDs are paged in ascending order without duplicates."""
+    _add_users_with_reminders(5, date.today())
+    expected = sorted(user.id for user in User.query.all())
+    
+    assert list(scheduler.due_user_ids(date.today(), page_size=2)) == expected
+    assert list(scheduler.due_user_ids(date.today() + timedelta(days=1))) == []
+
+
+def test_send_reminders_for_users(app, sent):
+    """Test a chunk only covers its own users and returns a daily summary."""
+    _add_users_with_reminders(4, date.today())
+    user_ids = list(scheduler.due_user_ids(date.today()))
+    
+    summary = scheduler.send_reminders_for_users(user_ids[:2], 'daily', date.today())
+    
+    assert summary['date'] == date.today().strftime('%Y-%m-%d')
+    assert summary['total_applications'] == 2
+    assert sorted(company for _, company in sent) == ['Due 0', 'Due 1']
@@ -0,0 +1,129 @@
+"""
+Full-text search tests
+"""
+from sqlalchemy.dialects import mysql
+from app import db
+from app.bulk import apply_bulk_operations
+from app.models import JobApplication
+from app.search import apply_search, search_applications, search_terms
+
+
+def _companies(results):
+    return [app_obj.company for app_obj, _ in results]
+
+
+def test_search_terms_strip_query_syntax():
+    """Test user input cannot inject FTS query syntax."""
+    assert search_terms('acme" OR * NEAR(') == ['acme', 'OR', 'NEAR']
+    assert search_terms('  ') == []
+
+
+def test_search_ranks_company_above_notes(app, user):
+    """Test company matches outrank position and notes matches."""
+    db.session.add_all([
+        JobApplication(company='Globex', position='Dev', notes='Referred by someone at Acme', user_id=user.id),
+        JobApplication(company='Acme', position='Dev', user_id=user.id),
+        JobApplication(company='Initech', position='Acme Tools Engineer', user_id=user.id),
+        JobApplication(company='Hooli', position='Dev', user_id=user.id),
+    ])
+    db.session.commit()
+    
+    assert _companies(search_applications(user.id, 'acme')) == ['Acme', 'Initech', 'Globex']
+
+
+def test_search_prefix_and_all_words(app, user):
+    """Test every word must match, each as a prefix."""
+    db.session.add_all([
+        JobApplication(company='Acme', position='Software Engineer', user_id=user.id),
+        JobApplication(company='Acme', position='Designer', user_id=user.id),
+    ])
+    db.session.commit()
+    
+    results = search_applications(user.id, 'acme eng')
+    assert [a.position for a, _ in results] == ['Software Engineer']
+
+
+def test_search_index_follows_writes(app, user):
+    """Test ORM and bulk inserts, updates and deletes keep the index in sync."""
+    app_obj = JobApplication(company='Umbrella', position='Dev', user_id=user.id)
+    db.session.add(app_obj)
+    db.session.commit()
+    assert _companies(search_applications(user.id, 'umbrella')) == ['Umbrella']
+    
+    app_obj.company = 'Cyberdyne'
+    db.session.commit()
+    assert search_applications(user.id, 'umbrella') == []
+    assert _companies(search_applications(user.id, 'cyberdyne')) == ['Cyberdyne']
+    
+    results = apply_bulk_operations(user.id, [
+        {'company': 'Tyrell', 'position': 'Dev'},
+        {'id': app_obj.id, 'notes': 'Met the Tyrell recruiter'},
+    ])
+    assert len(search_applications(user.id, 'tyrell')) == 2
+    
+    apply_bulk_operations(user.id, [{'op': 'delete', 'id': results[0]['id']}])
+    db.session.delete(db.session.get(JobApplication, app_obj.id))
+    db.session.commit()
+    assert search_applications(user.id, 'tyrell') == []
+
+
+def test_search_user_isolation(app, user):
+    """Test search only returns the user's own applications."""
+    from app.models import User
+    other = User(name='Other', email='other@example.com')
+    other.set_password('password')
+    db.session.add(other)
+    db.session.commit()
+    db.session.add(JobApplication(company='Acme', position='Dev', user_id=other.id))
+    db.session.commit()
+    
+    assert search_applications(user.id, 'acme') == []
+    query = apply_search(JobApplication.query.filter_by(user_id=user.id), 'acme', user.id)
+    assert query.count() == 0
+
+
+def test_search_two_letter_company(app, user):
+    """Test short company names like HP are still found by the list filter."""
+    db.session.add_all([
+        JobApplication(company='HP', position='Dev', user_id=user.id),
+        JobApplication(company='Acme', position='Dev', user_id=user.id),
+    ])
+    db.session.commit()
+
+    query = apply_search(JobApplication.query.filter_by(user_id=user.id), 'hp', user.id)
+    assert [a.company for a in query] == ['HP']
+    assert _companies(search_applications(user.id, 'HP')) == ['HP']
+
+
+def test_mysql_search_uses_like_for_short_words(app, monkeypatch):
+    """Test words below InnoDB's minimum token size are not sent to MATCH."""
+    monkeypatch.setattr('app.search._backend', lambda: 'mysql')
+
+    def compiled(q):
+        statement = apply_search(JobApplication.query, q, 12).statement
+        return str(statement.compile(dialect=mysql.dialect(), compile_kwargs={'literal_binds': True}))
+
+    sql = compiled('hp')
+    assert 'MATCH' not in sql and "LIKE lower('%%hp%%')" in sql
+    sql = compiled('hp printers')
+    assert "AGAINST ('+uid12 +printers*' IN BOOLEAN MODE)" in sql and "LIKE lower('%%hp%%')" in sql
+    assert 'search_owner' in sql
+
+
+def test_mysql_search_keeps_owner_token_out_of_terms(app, monkeypatch):
+    """Test a word prefixing the owner token is not matched against search_owner."""
+    monkeypatch.setattr('app.search._backend', lambda: 'mysql')
+    statement = apply_search(JobApplication.query, 'UID1 printers', 12).statement
+    sql = str(statement.compile(dialect=mysql.dialect(), compile_kwargs={'literal_binds': True}))
+    assert "AGAINST ('+uid12 +printers*' IN BOOLEAN MODE)" in sql and "LIKE lower('%%UID1%%')" in sql
+
+
+def test_search_words_do_not_match_the_owner_column(app, user):
+    """Test searching for the user's id does not match every row through the index's user_id column."""
+    db.session.add_all([
+        JobApplication(company='Acme', position='Dev', user_id=user.id),
+        JobApplication(company=f'Studio {user.id}', position='Dev', user_id=user.id),
+    ])
+    db.session.commit()
+
+    assert _companies(search_applications(user.id, str(user.id))) == [f'Studio {user.id}']
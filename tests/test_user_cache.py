@@ -0,0 +1,70 @@
+"""
+User loader cache tests
+"""
+import pytest
+import time
+from sqlalchemy import event
+from app import db, user_cache
+from app.models import User
+from app.user_cache import MemoryUserCache
+
+
+def test_memory_cache_lru_eviction():
+    """Test the least recently used entry is evicted first."""
+    cache = MemoryUserCache(maxsize=2)
+    cache.set('1', 'a', ttl=60)
+    cache.set('2', 'b', ttl=60)
+    cache.get('1')
+    cache.set('3', 'c', ttl=60)
+    
+    assert cache.get('1') == 'a'
+    assert cache.get('2') is None
+    assert cache.get('3') == 'c'
+
+
+def test_memory_cache_ttl_expiry():
+    """Test entries expire after their TTL."""
+    cache = MemoryUserCache()
+    cache.set('1', 'a', ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('1') is None
+
+
+def test_loader_skips_query_when_cached(app, user):
+    """Test a cached user is loaded without any SQL."""
+    user_id = user.id
+    user_cache.load(db.session, user_id)
+    db.session.expunge_all()
+    
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        cached = user_cache.load(db.session, user_id)
+        assert cached.email == 'test@example.com'
+        assert cached.reminder_digest is True
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    
+    assert statements == []
+
+
+def test_loader_invalidated_on_update(app, user):
+    """Test updating a user evicts the cached copy."""
+    user_id = user.id
+    user_cache.load(db.session, user_id)
+    user.name = 'Renamed'
+    db.session.commit()
+    db.session.expunge_all()
+    
+    assert user_cache.load(db.session, user_id).name == 'Renamed'
+
+
+def test_cached_user_can_be_modified(client, auth, user, app):
+    """Test changes made to a cached current_user are persisted."""
+    auth.login()
+    client.get('/api/preferences')  # Populates the cache
+    client.put('/api/preferences', json={'reminder_digest': False})
+    
+    with app.app_context():
+        assert db.session.get(User, user.id).reminder_digest is False